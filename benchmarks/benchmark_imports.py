@@ -0,0 +1,80 @@
+"""
+PyFibre
+Benchmark of module import times
+
+Measures the time taken to import PyFibre modules in a fresh Python
+process, alongside the heavy third party packages that each import
+pulls in. Process pool workers and CLI invocations pay this cost
+before any analysis starts.
+
+Usage: python benchmarks/benchmark_imports.py [--repeat N]
+    [--modules MODULE [MODULE ...]]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+#: Modules imported in benchmark
+MODULES = (
+    'pyfibre.api',
+    'pyfibre.model.tools.fire_algorithm',
+    'pyfibre.model.tools.base_kmeans_filter',
+    'pyfibre.model.tools.metrics',
+    'pyfibre.pyfibre_runner',
+)
+
+#: Third party packages reported if loaded by an import
+HEAVY_PACKAGES = (
+    'networkx', 'pandas', 'sklearn', 'skimage.feature',
+    'skimage.measure', 'skimage.restoration', 'chaco',
+)
+
+#: Script run in each process, printing the import time in
+#: seconds and loaded heavy packages as JSON
+SCRIPT = (
+    "import importlib, json, sys, time\n"
+    "start = time.perf_counter()\n"
+    "importlib.import_module({module!r})\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(json.dumps([elapsed, [\n"
+    "    name for name in {packages!r} if name in sys.modules]]))\n"
+)
+
+
+def import_time(module, repeat):
+    """Return the minimum time taken to import module in a fresh
+    process over repeat launches, alongside the heavy packages
+    loaded by the import"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [os.getcwd(), env.get('PYTHONPATH')]))
+    script = SCRIPT.format(module=module, packages=HEAVY_PACKAGES)
+
+    results = [
+        json.loads(subprocess.check_output(
+            [sys.executable, '-c', script], env=env,
+            universal_newlines=True))
+        for _ in range(repeat)]
+
+    return min(elapsed for elapsed, _ in results), results[-1][1]
+
+
+def main(modules=MODULES, repeat=5):
+
+    print(f"{'module':<42}{'import (ms)':>12}  packages")
+
+    for module in modules:
+        elapsed, packages = import_time(module, repeat)
+        print(f"{module:<42}{1E3 * elapsed:>12.0f}  "
+              f"{', '.join(packages)}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--modules', nargs='+', default=MODULES)
+    args = parser.parse_args()
+    main(modules=args.modules, repeat=args.repeat)
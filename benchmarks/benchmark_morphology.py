@@ -0,0 +1,93 @@
+"""
+PyFibre
+Benchmark of binary mask clean-up stages
+
+Compares the combined clean_binary stage against the chain of
+scipy and scikit-image operations it replaces, using synthetic
+SHG-like masks of increasing size.
+
+Usage: python benchmarks/benchmark_morphology.py [--repeat N]
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+from scipy.ndimage import gaussian_filter, binary_fill_holes
+from skimage.morphology import remove_small_objects, remove_small_holes
+
+from pyfibre.model.tools.utilities import clean_binary
+
+#: Image sizes used in benchmark
+SIZES = (256, 512, 1024, 2048)
+
+#: Minimum object and hole size used in clean-up
+MIN_SIZE = 20
+
+
+def generate_mask(size, seed=0):
+    """Generate a binary mask of blob-like regions with holes,
+    resembling k-means cellular masks of SHG images"""
+    random_state = np.random.RandomState(seed)
+    noise = random_state.random_sample((size, size))
+    smoothed = gaussian_filter(noise, sigma=2)
+    return smoothed > smoothed.mean()
+
+
+def kmeans_chain(binary):
+    """Clean-up chain previously used in BaseKmeansFilter"""
+    binary = binary_fill_holes(binary)
+    for _ in range(2):
+        binary = remove_small_objects(~binary, min_size=MIN_SIZE)
+    return binary
+
+
+def kmeans_clean(binary):
+    return clean_binary(
+        binary, min_size=MIN_SIZE, hole_size=MIN_SIZE, fill_holes=True)
+
+
+def mean_binary_chain(binary):
+    """Clean-up chain previously used in mean_binary"""
+    binary = remove_small_holes(binary, area_threshold=MIN_SIZE)
+    return remove_small_objects(binary, min_size=MIN_SIZE)
+
+
+def mean_binary_clean(binary):
+    return clean_binary(binary, min_size=MIN_SIZE, hole_size=MIN_SIZE)
+
+
+BENCHMARKS = {
+    'k-means filter': (kmeans_chain, kmeans_clean),
+    'mean binary': (mean_binary_chain, mean_binary_clean),
+}
+
+
+def main(repeat=5):
+
+    print(f"{'stage':<16}{'size':>6}{'chain (ms)':>12}"
+          f"{'combined (ms)':>15}{'speed up':>10}")
+
+    for name, (chain, combined) in BENCHMARKS.items():
+        for size in SIZES:
+            binary = generate_mask(size)
+
+            if not np.array_equal(chain(binary), combined(binary)):
+                raise RuntimeError(
+                    f'Clean-up stages for {name} do not agree')
+
+            chain_time = min(timeit.repeat(
+                lambda: chain(binary), number=1, repeat=repeat))
+            combined_time = min(timeit.repeat(
+                lambda: combined(binary), number=1, repeat=repeat))
+
+            print(f"{name:<16}{size:>6}{1E3 * chain_time:>12.2f}"
+                  f"{1E3 * combined_time:>15.2f}"
+                  f"{chain_time / combined_time:>10.1f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    main(repeat=args.repeat)
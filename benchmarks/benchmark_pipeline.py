@@ -0,0 +1,170 @@
+"""
+PyFibre
+Benchmark of the FIRE, segmentation and metric pipeline
+
+Times each stage of the SHG-PL-Trans analysis on synthetic fibrous
+images of increasing size, reporting the scaling exponent of each
+stage with respect to the number of pixels. Only the CPU is used,
+so that regressions and speed ups can be compared between runs on
+the same machine.
+
+Usage: python benchmarks/benchmark_pipeline.py [--sizes N [N ...]]
+    [--density D] [--noise S] [--repeat N] [--output FILE]
+"""
+
+import argparse
+import csv
+import logging
+from tempfile import TemporaryDirectory
+import timeit
+
+import networkx as nx
+import numpy as np
+
+from pyfibre.addons.shg_pl_trans.shg_pl_trans_analyser import (
+    SHGPLTransAnalyser)
+from pyfibre.addons.shg_pl_trans.tools.segmentation import (
+    shg_pl_trans_segmentation)
+from pyfibre.model.tools.fibre_assigner import FibreAssigner
+from pyfibre.model.tools.fibre_utilities import simplify_network
+from pyfibre.model.tools.metrics import segment_metrics
+from pyfibre.model.tools.network_extraction import (
+    build_network, fibre_network_assignment)
+from pyfibre.profiling import StageProfiler, profile_stages
+from pyfibre.pyfibre_runner import PyFibreRunner
+
+from synthetic_images import (
+    FIBRE_DENSITY, NOISE, generate_multi_image)
+
+#: Image sizes used in benchmark
+SIZES = (128, 256, 512)
+
+#: Stages timed for each image size
+STAGES = (
+    'build_network',
+    'FIREAlgorithm.create_network',
+    'FibreAssigner.assign_fibres',
+    'simplify_network',
+    'shg_pl_trans_segmentation',
+    'segment_metrics',
+    'SHGAnalyser.image_analysis',
+)
+
+
+def best_time(function, repeat):
+    """Return minimum elapsed time of function over repeat calls,
+    alongside the result of the final call"""
+    results = []
+
+    def call():
+        results.append(function())
+
+    elapsed = min(timeit.repeat(call, number=1, repeat=repeat))
+    return elapsed, results[-1]
+
+
+def benchmark_size(size, density, noise, repeat):
+    """Time each pipeline stage on a synthetic image of the given
+    size, returning a dictionary of elapsed times in seconds"""
+
+    runner = PyFibreRunner()
+    analyser = SHGPLTransAnalyser()
+    multi_image = generate_multi_image(
+        size, density=density, noise=noise, name='benchmark')
+    timings = {}
+
+    def run_build_network():
+        profiler = StageProfiler()
+        with profile_stages(profiler):
+            network = build_network(
+                multi_image.shg_image, scale=runner.scale,
+                sigma=runner.sigma, alpha=runner.alpha,
+                **analyser.fire_parameters)
+        return network, profiler
+
+    # FIRE iterations are timed as a stage of build_network, since
+    # they require the preprocessed distance image
+    timings['build_network'], (network, profiler) = best_time(
+        run_build_network, repeat)
+    timings['FIREAlgorithm.create_network'] = (
+        profiler.stages['fire']['time'])
+
+    subgraphs = [
+        network.subgraph(component)
+        for component in nx.connected_components(network)]
+
+    timings['FibreAssigner.assign_fibres'], _ = best_time(
+        lambda: [FibreAssigner().assign_fibres(subgraph)
+                 for subgraph in subgraphs], repeat)
+    timings['simplify_network'], _ = best_time(
+        lambda: [simplify_network(subgraph)
+                 for subgraph in subgraphs], repeat)
+
+    fibre_networks = fibre_network_assignment(network)
+
+    timings['shg_pl_trans_segmentation'], segments = best_time(
+        lambda: shg_pl_trans_segmentation(
+            multi_image, fibre_networks, scale=runner.scale,
+            **analyser.segment_parameters), repeat)
+
+    timings['segment_metrics'], _ = best_time(
+        lambda: segment_metrics(
+            segments[0], multi_image.shg_image, 'SHG',
+            sigma=runner.sigma), repeat)
+
+    with TemporaryDirectory() as directory:
+        multi_image.path = directory
+        analyser.multi_image = multi_image
+        runner.ow_network = True
+        timings['SHGAnalyser.image_analysis'], _ = best_time(
+            lambda: analyser.image_analysis(runner), repeat)
+
+    return timings
+
+
+def scaling_exponent(sizes, times):
+    """Fit the exponent k of time ~ (number of pixels) ** k"""
+    if len(sizes) < 2:
+        return np.nan
+    n_pixels = np.asarray(sizes, dtype=float) ** 2
+    return np.polyfit(np.log(n_pixels), np.log(times), 1)[0]
+
+
+def main(sizes=SIZES, density=FIBRE_DENSITY, noise=NOISE,
+         repeat=1, output=None):
+
+    results = {size: benchmark_size(size, density, noise, repeat)
+               for size in sizes}
+
+    print(f"{'stage':<32}"
+          + ''.join(f"{size:>10}" for size in sizes)
+          + f"{'exponent':>10}")
+
+    for stage in STAGES:
+        times = [results[size][stage] for size in sizes]
+        print(f"{stage:<32}"
+              + ''.join(f"{1E3 * time:>10.1f}" for time in times)
+              + f"{scaling_exponent(sizes, times):>10.2f}")
+    print('Times in ms for each image size (pixels per side)')
+
+    if output is not None:
+        with open(output, 'w', newline='') as outfile:
+            writer = csv.writer(outfile)
+            writer.writerow(['stage', 'size', 'time'])
+            for size in sizes:
+                for stage in STAGES:
+                    writer.writerow([stage, size, results[size][stage]])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--density', type=float, default=FIBRE_DENSITY)
+    parser.add_argument('--noise', type=float, default=NOISE)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    main(sizes=args.sizes, density=args.density, noise=args.noise,
+         repeat=args.repeat, output=args.output)
@@ -0,0 +1,79 @@
+"""
+PyFibre
+Benchmark of batch startup time
+
+Compares the time taken for a fresh Python process to become ready
+to analyse SHG-PL-Trans images, either by starting the envisage
+PyFibreApplication used by the CLI, or through the headless batch
+routine. Each measurement includes interpreter start up, imports and
+creation of parsers, readers and analysers.
+
+Usage: python benchmarks/benchmark_startup.py [--repeat N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import timeit
+
+#: Scripts that prepare each entry point for analysis
+ENTRY_POINTS = {
+    'interpreter': "pass",
+    'application': (
+        "from pyfibre.cli.pyfibre_cli import PyFibreApplication\n"
+        "from pyfibre.core.core_pyfibre_plugin import CorePyFibrePlugin\n"
+        "from pyfibre.addons.shg_pl_trans.shg_pl_trans_plugin import (\n"
+        "    SHGPLTransPlugin)\n"
+        "app = PyFibreApplication(\n"
+        "    plugins=[CorePyFibrePlugin(), SHGPLTransPlugin()])\n"
+        "app.start()\n"
+        "app.stop()\n"),
+    'batch (plugins)': (
+        "from pyfibre.cli.pyfibre_batch import (\n"
+        "    create_components, load_multi_image_factories)\n"
+        "from pyfibre.addons.shg_pl_trans.shg_pl_trans_plugin import (\n"
+        "    SHGPLTransPlugin)\n"
+        "create_components(\n"
+        "    load_multi_image_factories([SHGPLTransPlugin()]))\n"),
+    'batch (factories)': (
+        "from pyfibre.cli.pyfibre_batch import create_components\n"
+        "from pyfibre.addons.shg_pl_trans.shg_pl_trans_factory import (\n"
+        "    SHGPLTransFactory)\n"
+        "create_components([SHGPLTransFactory()])\n"),
+}
+
+
+def startup_time(script, repeat):
+    """Return the minimum wall time of a Python process running
+    script over repeat launches"""
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [os.getcwd(), env.get('PYTHONPATH')]))
+
+    return min(timeit.repeat(
+        lambda: subprocess.run(
+            [sys.executable, '-c', script], env=env, check=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL),
+        number=1, repeat=repeat))
+
+
+def main(repeat=5):
+
+    print(f"{'entry point':<20}{'startup (ms)':>14}")
+
+    for name, script in ENTRY_POINTS.items():
+        try:
+            elapsed = startup_time(script, repeat)
+        except subprocess.CalledProcessError:
+            print(f"{name:<20}{'failed':>14}")
+        else:
+            print(f"{name:<20}{1E3 * elapsed:>14.0f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    main(repeat=args.repeat)
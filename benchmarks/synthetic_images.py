@@ -0,0 +1,114 @@
+"""
+PyFibre
+Synthetic image generator for benchmarks
+
+Creates SHG, PL and transmission images containing smoothly
+curving fibres and blob-like cells, with parametrised size, fibre
+density and noise level.
+"""
+
+import numpy as np
+from scipy.ndimage import gaussian_filter
+
+from pyfibre.addons.shg_pl_trans.shg_pl_trans_image import (
+    SHGPLTransImage)
+
+#: Default number of fibres per 10^4 pixels
+FIBRE_DENSITY = 1.0
+
+#: Default standard deviation of Gaussian noise added to images
+NOISE = 0.05
+
+#: Standard deviation of Gaussian profile across each fibre
+FIBRE_WIDTH = 1.5
+
+
+def _normalise(image):
+    return image / max(image.max(), 1E-12)
+
+
+def _add_noise(image, noise, random_state):
+    image = image + noise * random_state.standard_normal(image.shape)
+    return np.clip(image, 0, 1)
+
+
+def generate_fibre_image(size, density=FIBRE_DENSITY, noise=NOISE,
+                         seed=0):
+    """Generate a square SHG-like image of curved fibres
+
+    Parameters
+    ----------
+    size: int
+        Number of pixels along each side of the image
+    density: float, optional
+        Number of fibres per 10^4 pixels
+    noise: float, optional
+        Standard deviation of Gaussian noise
+    seed: int, optional
+        Seed of random number generator
+
+    Returns
+    -------
+    image: array_like of float, shape=(size, size)
+        Normalised fibre image
+    """
+    random_state = np.random.RandomState(seed)
+    n_fibres = max(1, int(density * size ** 2 / 1E4))
+
+    image = np.zeros((size, size))
+
+    for _ in range(n_fibres):
+        length = random_state.uniform(0.2, 0.6) * size
+        n_points = int(2 * length)
+
+        # Fibre trajectory follows a slowly varying direction
+        angle = random_state.uniform(0, 2 * np.pi)
+        angles = angle + np.cumsum(
+            random_state.normal(0, 0.02, n_points))
+        steps = 0.5 * np.stack([np.sin(angles), np.cos(angles)])
+        coords = (
+            random_state.uniform(0, size, (2, 1))
+            + np.cumsum(steps, axis=1))
+
+        coords = np.round(coords).astype(int)
+        inside = np.all((coords >= 0) & (coords < size), axis=0)
+        np.add.at(
+            image, tuple(coords[:, inside]),
+            random_state.uniform(0.5, 1.0))
+
+    image = gaussian_filter(image, FIBRE_WIDTH)
+
+    return _add_noise(_normalise(image), noise, random_state)
+
+
+def generate_cell_image(size, fibre_image, noise=NOISE, seed=0):
+    """Generate a square PL-like image of cells, that mostly
+    occupy regions of fibre_image without fibres"""
+    random_state = np.random.RandomState(seed + 1)
+
+    blobs = gaussian_filter(
+        random_state.random_sample((size, size)), size / 50)
+    blobs = _normalise(np.clip(blobs - blobs.mean(), 0, None))
+    image = blobs * (1 - gaussian_filter(fibre_image, 4))
+
+    return _add_noise(_normalise(image), noise, random_state)
+
+
+def generate_multi_image(size, density=FIBRE_DENSITY, noise=NOISE,
+                         seed=0, **kwargs):
+    """Generate a SHGPLTransImage containing synthetic SHG, PL and
+    transmission images. Additional keyword arguments are passed to
+    the SHGPLTransImage constructor"""
+
+    shg_image = generate_fibre_image(
+        size, density=density, noise=noise, seed=seed)
+    pl_image = generate_cell_image(
+        size, shg_image, noise=noise, seed=seed)
+    trans_image = _normalise(
+        gaussian_filter(1 - 0.5 * (shg_image + pl_image), 1))
+
+    multi_image = SHGPLTransImage(
+        image_stack=[shg_image, pl_image, trans_image], **kwargs)
+    multi_image.preprocess_images()
+
+    return multi_image
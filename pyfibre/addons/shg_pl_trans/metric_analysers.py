@@ -2,6 +2,7 @@ import pandas as pd
 
 from pyfibre.model.analysers.metric_analyser import MetricAnalyser
 from pyfibre.model.tools.metrics import angle_analysis
+from pyfibre.profiling import profile_stage
 from pyfibre.utilities import flatten_list
 
 
@@ -10,11 +11,13 @@ class SHGMetricAnalyser(MetricAnalyser):
     def analyse(self):
 
         # Analyse fibre networks
-        network_metrics = self._get_network_metrics()
+        with profile_stage('network metrics'):
+            network_metrics = self._get_network_metrics()
 
         # Analyse fibre segments
-        segment_metrics = self._get_segment_metrics(
-            'SHG', 'fibre_segments.npy')
+        with profile_stage('segment metrics'):
+            segment_metrics = self._get_segment_metrics(
+                'SHG', 'fibre_segments.npy')
 
         # Average linear properties over all regions
         global_segment_metrics = self._global_averaging(
@@ -47,8 +50,9 @@ class PLMetricAnalyser(MetricAnalyser):
 
     def analyse(self):
         # Analyse individual cell regions
-        segment_metrics = self._get_segment_metrics(
-            'PL', 'cell_segment.npy')
+        with profile_stage('segment metrics'):
+            segment_metrics = self._get_segment_metrics(
+                'PL', 'cell_segment.npy')
 
         # Average linear properties over all regions
         global_metrics = self._global_averaging(
@@ -22,6 +22,7 @@ from pyfibre.model.tools.network_extraction import (
     build_network, fibre_network_assignment
 )
 from pyfibre.model.tools.preprocessing import nl_means
+from pyfibre.profiling import profile_stage
 from pyfibre.utilities import flatten_list, log_time
 
 from .metric_analysers import SHGMetricAnalyser
@@ -236,13 +237,15 @@ class SHGAnalyser(BaseMultiImageAnalyser):
         """
 
         logger.debug("Applying AHE to SHG image")
-        image_equal = equalize_adapthist(self.multi_image.shg_image)
+        with profile_stage('equalise'):
+            image_equal = equalize_adapthist(self.multi_image.shg_image)
 
         logger.debug(
             "Performing NL Denoise using local windows {} {}".format(
                 *p_denoise)
         )
-        image_nl = nl_means(image_equal, p_denoise=p_denoise)
+        with profile_stage('denoise'):
+            image_nl = nl_means(image_equal, p_denoise=p_denoise)
 
         # Call FIRE algorithm to extract full image network
         logger.debug(
@@ -257,7 +260,9 @@ class SHGAnalyser(BaseMultiImageAnalyser):
             alpha=alpha,
             **self.fire_parameters)
 
-        self._fibre_networks = fibre_network_assignment(self._network)
+        with profile_stage('assignment'):
+            self._fibre_networks = fibre_network_assignment(
+                self._network)
 
     @log_time(message='SEGMENTATION')
     def segmentation_analysis(self, scale):
@@ -297,6 +302,8 @@ class SHGAnalyser(BaseMultiImageAnalyser):
             filename=self.multi_image.name,
             image=self.multi_image.shg_image,
             sigma=sigma,
+            structure_tensor=self.multi_image.structure_tensor(
+                'SHG', sigma),
             networks=self._fibre_networks,
             segments=self._fibre_segments
         )
@@ -53,6 +53,8 @@ class SHGPLTransAnalyser(SHGAnalyser):
             filename=self.multi_image.name,
             image=self.multi_image.pl_image,
             sigma=sigma,
+            structure_tensor=self.multi_image.structure_tensor(
+                'PL', sigma),
             segments=self._cell_segments
         )
         segment_metrics, global_metrics = metric_analyser.analyse()
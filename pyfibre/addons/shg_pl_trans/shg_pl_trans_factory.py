@@ -4,7 +4,6 @@ from .shg_pl_trans_image import SHGPLTransImage
 from .shg_pl_trans_analyser import SHGPLTransAnalyser
 from .shg_pl_trans_reader import SHGPLTransReader
 from .shg_pl_trans_parser import SHGPLTransParser
-from .shg_pl_trans_viewer import SHGPLTransViewer
 
 
 class SHGPLTransFactory(BaseMultiImageFactory):
@@ -33,4 +32,6 @@ class SHGPLTransFactory(BaseMultiImageFactory):
     def get_viewer(self):
         """Returns BaseMultiImageViewer class able to display
         the BaseMultiImage class created by this factory"""
+        # Imported here, since the viewer requires the GUI toolkit
+        from .shg_pl_trans_viewer import SHGPLTransViewer
         return SHGPLTransViewer
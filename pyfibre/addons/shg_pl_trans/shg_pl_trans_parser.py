@@ -1,10 +1,8 @@
-import copy
-
 from traits.api import Dict, Str, File
 
 from pyfibre.core.base_file_parser import BaseFileParser, FileSet
 
-from .utils import filter_input_files, get_files_prefixes
+from .utils import filter_input_files, group_files_by_type
 
 
 class SHGPLTransFileSet(FileSet):
@@ -20,28 +18,21 @@ class SHGPLTransParser(BaseFileParser):
 
     _image_types = ('SHG-PL-Trans', 'SHG', 'PL-Trans')
 
-    def _cache_file_sets(self, input_files, image_type):
-        """Populate image_dictionary argument using prefixes and filenames
-        of input_files list"""
-
-        files, prefixes = get_files_prefixes(
-            input_files, image_type)
-
-        for filename, prefix in zip(files, prefixes):
-            if prefix in self._file_set_cache:
-                file_set = self._file_set_cache[prefix]
-            else:
-                file_set = SHGPLTransFileSet(prefix=prefix)
-                self._file_set_cache[prefix] = file_set
-            file_set.registry[image_type] = filename
-            input_files.remove(filename)
-
     def get_file_sets(self, input_files):
 
-        self._file_set_cache = {}
-        input_files = filter_input_files(copy.copy(input_files))
+        # Remove duplicate and unsupported files, then group the
+        # remainder by image type and prefix in a single pass
+        input_files = filter_input_files(list(dict.fromkeys(input_files)))
+        groups = group_files_by_type(input_files)
 
+        registries = {}
         for image_type in self._image_types:
-            self._cache_file_sets(input_files, image_type)
+            for filename, prefix in groups[image_type]:
+                registries.setdefault(prefix, {})[image_type] = filename
+
+        self._file_set_cache = {
+            prefix: SHGPLTransFileSet(prefix=prefix, registry=registry)
+            for prefix, registry in registries.items()
+        }
 
         return list(self._file_set_cache.values())
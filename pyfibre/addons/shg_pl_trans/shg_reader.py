@@ -6,13 +6,17 @@ from skimage.util import img_as_float
 from skimage.external.tifffile import TiffFile
 
 from pyfibre.core.base_multi_image_reader import (
-    BaseMultiImageReader)
+    BaseMultiImageReader, WrongFileTypeError)
 
 from .shg_image import SHGImage
 from .shg_pl_trans_parser import SHGPLTransFileSet
 
 logger = logging.getLogger(__name__)
 
+#: Number of slices along the averaged axis of a stack read from
+#: disk at a time
+STACK_CHUNK_SIZE = 16
+
 
 def lookup_page(tiff_page):
     """Obtain relevant information from a TiffPage object"""
@@ -23,6 +27,60 @@ def lookup_page(tiff_page):
     return xy_dim, description
 
 
+def get_tiff_shape(tiff_file):
+    """Obtain shape of image data in TiffFile object from series
+    metadata, without decoding any pages"""
+
+    return tuple(tiff_file.series[0].shape)
+
+
+def read_tiff_array(tiff_file):
+    """Return image data of TiffFile object. Uncompressed images
+    stored contiguously are memory-mapped rather than read into
+    memory"""
+
+    if tiff_file.series[0].offset is not None:
+        return tiff_file.asarray(memmap=True)
+    return tiff_file.asarray()
+
+
+def stack_mean(image, axis, chunk_size=STACK_CHUNK_SIZE):
+    """Average image over a stack axis, reading chunk_size slices of
+    that axis at a time. Memory-mapped images are therefore streamed
+    from disk in a single pass, holding at most chunk_size slices
+    in memory
+
+    Parameters
+    ----------
+    image: array_like
+        Image stack, possibly memory-mapped
+    axis: int
+        Axis of stack to average over
+    chunk_size: int, optional
+        Number of slices along axis to read at a time
+
+    Returns
+    -------
+    mean: array_like
+        Image averaged over axis, using the same dtype as np.mean
+    """
+    axis = int(axis) % image.ndim
+    if np.issubdtype(image.dtype, np.floating):
+        dtype = image.dtype
+    else:
+        dtype = np.float64
+    n_slices = image.shape[axis]
+
+    total = np.zeros(
+        image.shape[:axis] + image.shape[axis + 1:], dtype=np.float64)
+    index = [slice(None)] * image.ndim
+    for start in range(0, n_slices, chunk_size):
+        index[axis] = slice(start, start + chunk_size)
+        total += image[tuple(index)].sum(axis=axis, dtype=np.float64)
+
+    return (total / n_slices).astype(dtype, copy=False)
+
+
 def get_fluoview_param(description, xy_dim, shape):
 
     desc_list = description.split('\n')
@@ -110,7 +168,7 @@ def get_tiff_param(tiff_file):
     """Obtain relevant parameters of TiffFile object"""
 
     xy_dim, description = lookup_page(tiff_file.pages[0])
-    shape = tiff_file.asarray().shape
+    shape = get_tiff_shape(tiff_file)
 
     if tiff_file.is_fluoview:
         return get_fluoview_param(description, xy_dim, shape)
@@ -129,6 +187,28 @@ def get_tiff_param(tiff_file):
         return minor_axis, n_modes, xy_dim
 
 
+def get_tiff_metadata(tiff_file):
+    """Obtain format, shape and stack parameters of TiffFile
+    object, without decoding any image data"""
+
+    if tiff_file.is_fluoview:
+        tiff_format = 'fluoview'
+    elif tiff_file.is_imagej:
+        tiff_format = 'imagej'
+    else:
+        tiff_format = 'pyfibre'
+
+    minor_axis, n_modes, xy_dim = get_tiff_param(tiff_file)
+
+    return {
+        'format': tiff_format,
+        'shape': get_tiff_shape(tiff_file),
+        'n_modes': n_modes,
+        'minor_axis': minor_axis,
+        'xy_dim': xy_dim
+    }
+
+
 class SHGReader(BaseMultiImageReader):
     """Reader class for a combined SHG file"""
 
@@ -146,9 +226,12 @@ class SHGReader(BaseMultiImageReader):
         """Transform image to normalised float array and average
         over any stack"""
 
-        # Average over minor axis if needed
+        # Average over minor axis if needed, otherwise make sure any
+        # memory-mapped data is loaded into a writable array
         if minor_axis is not None:
-            image = np.mean(image, axis=minor_axis)
+            image = stack_mean(image, minor_axis)
+        elif isinstance(image, np.memmap):
+            image = np.array(image)
 
         # If 2D array, simply normalise and return as float
         if image.ndim == 2:
@@ -159,44 +242,74 @@ class SHGReader(BaseMultiImageReader):
 
         return img_as_float(image)
 
+    def _read_tiff_metadata(self, tiff_file):
+        """Return metadata of an open TiffFile object, or None if
+        the file is not formatted correctly to be loaded"""
+        try:
+            return get_tiff_metadata(tiff_file)
+        except Exception as e:
+            logger.info(
+                f'File type not supported: {e}')
+            return None
+
+    def read_image(self, filename):
+        """Load image data, which also checks that the file can
+        be loaded from a single open of the file"""
+        return self.load_image(filename)
+
     def load_image(self, filename):
+        """Load image data from filename. Any metadata not already
+        cached is read from the same open of the file as the image
+        data, and then stored in the cache"""
 
-        with TiffFile(filename) as tiff_file:
-            image = tiff_file.asarray()
-            minor_axis, n_modes, xy_dim = get_tiff_param(tiff_file)
+        found, metadata = self.cached_metadata(filename)
+        if found and metadata is None:
+            raise WrongFileTypeError
 
-        logger.debug(f"Number of image modes = {n_modes}")
-        logger.debug(f"Size of image = {xy_dim}")
-        if minor_axis is not None:
-            n_stacks = image.shape[minor_axis]
-            logger.debug(f"Number of stacks = {n_stacks}")
+        try:
+            tiff_file = TiffFile(filename)
+        except Exception as e:
+            logger.info(
+                f'File type not supported: {e}')
+            self.cache_metadata(filename, None)
+            raise WrongFileTypeError
+
+        with tiff_file:
+            if not found:
+                metadata = self._read_tiff_metadata(tiff_file)
+                self.cache_metadata(filename, metadata)
+                if metadata is None:
+                    raise WrongFileTypeError
+
+            minor_axis = metadata['minor_axis']
 
-        image = self._format_image(image, minor_axis)
+            logger.debug(f"Number of image modes = {metadata['n_modes']}")
+            logger.debug(f"Size of image = {metadata['xy_dim']}")
+            if minor_axis is not None:
+                n_stacks = metadata['shape'][minor_axis]
+                logger.debug(f"Number of stacks = {n_stacks}")
+
+            image = read_tiff_array(tiff_file)
+            image = self._format_image(image, minor_axis)
 
         return image
 
-    def can_load(self, filename):
-        """Perform check to see whether file is formatted
+    def read_metadata(self, filename):
+        """Read format, shape and stack parameters from the TIFF
+        file header, returning None if the file is not formatted
         correctly to be loaded"""
 
         try:
-            with TiffFile(filename) as tiff_file:
-                # Check is this is Olympus FluoView formatted
-                if tiff_file.is_fluoview:
-                    return True
-
-                # Check is this is ImageJ formatted
-                if tiff_file.is_imagej:
-                    return True
-
-                # Check if this is test data
-                _, description = lookup_page(tiff_file.pages[0])
-                desc_dict = json.loads(description)
-                for key in ['minor_axis', 'n_modes', 'xy_dim']:
-                    _ = desc_dict[key]
+            tiff_file = TiffFile(filename)
         except Exception as e:
             logger.info(
                 f'File type not supported: {e}')
-            return False
+            return None
+
+        with tiff_file:
+            return self._read_tiff_metadata(tiff_file)
 
-        return True
+    def can_load(self, filename):
+        """Perform check to see whether file is formatted
+        correctly to be loaded"""
+        return self.file_metadata(filename) is not None
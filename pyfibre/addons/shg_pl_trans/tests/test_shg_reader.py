@@ -1,13 +1,20 @@
+from unittest import mock
+
 import numpy as np
 from skimage.external.tifffile import TiffFile
 
+from pyfibre.core.base_multi_image_reader import WrongFileTypeError
 from pyfibre.tests.pyfibre_test_case import PyFibreTestCase
 from pyfibre.addons.shg_pl_trans.shg_pl_trans_parser import (
     SHGPLTransFileSet)
 from pyfibre.addons.shg_pl_trans.shg_reader import (
     get_fluoview_param,
     get_imagej_param,
+    get_tiff_metadata,
     get_tiff_param,
+    get_tiff_shape,
+    read_tiff_array,
+    stack_mean,
     SHGReader
 )
 
@@ -71,6 +78,67 @@ class TestTiffReader(PyFibreTestCase):
             self.assertEqual(3, n_modes)
             self.assertEqual((200, 200), xy_dim)
 
+    def test_get_tiff_metadata(self):
+
+        with TiffFile(test_shg_pl_trans_image_path) as tiff_file:
+            metadata = get_tiff_metadata(tiff_file)
+
+        self.assertDictEqual(
+            {'format': 'pyfibre',
+             'shape': (3, 3, 200, 200),
+             'n_modes': 3,
+             'minor_axis': 1,
+             'xy_dim': (200, 200)},
+            metadata)
+
+    def test_get_tiff_shape(self):
+
+        for path in [test_shg_image_path, test_shg_pl_trans_image_path]:
+            with TiffFile(path) as tiff_file:
+                self.assertEqual(
+                    tiff_file.asarray().shape,
+                    get_tiff_shape(tiff_file))
+
+    def test_read_tiff_array(self):
+
+        with TiffFile(test_shg_pl_trans_image_path) as tiff_file:
+            image = read_tiff_array(tiff_file)
+            self.assertIsInstance(image, np.memmap)
+            self.assertArrayAlmostEqual(
+                tiff_file.asarray(), image)
+
+    def test_stack_mean(self):
+
+        image = np.arange(5 * 4 * 3 * 2).reshape((5, 4, 3, 2))
+
+        for axis in range(4):
+            mean = stack_mean(image, axis, chunk_size=2)
+            self.assertEqual(np.float64, mean.dtype)
+            self.assertArrayAlmostEqual(
+                np.mean(image, axis=axis), mean)
+
+        mean = stack_mean(image.astype(np.float32), 1, chunk_size=3)
+        self.assertEqual(np.float32, mean.dtype)
+
+    def test_stack_mean_chunks(self):
+
+        image = np.arange(5 * 4 * 3).reshape((5, 4, 3))
+        chunks = []
+
+        class ChunkRecorder:
+            shape = image.shape
+            ndim = image.ndim
+            dtype = image.dtype
+
+            def __getitem__(self, index):
+                chunks.append(image[index].shape)
+                return image[index]
+
+        # Only chunk_size slices of the averaged axis are read at once
+        mean = stack_mean(ChunkRecorder(), 1, chunk_size=3)
+        self.assertArrayAlmostEqual(np.mean(image, axis=1), mean)
+        self.assertListEqual([(5, 3, 3), (5, 1, 3)], chunks)
+
 
 class TestSHGReader(PyFibreTestCase):
 
@@ -87,6 +155,40 @@ class TestSHGReader(PyFibreTestCase):
         self.assertTrue(self.reader.can_load(test_shg_image_path))
         self.assertFalse(self.reader.can_load('not_an_image'))
 
+    def test_read_metadata(self):
+
+        metadata = self.reader.read_metadata(test_shg_image_path)
+        self.assertEqual((200, 200, 3), metadata['shape'])
+        self.assertEqual(2, metadata['minor_axis'])
+        self.assertIsNone(self.reader.read_metadata('not_an_image'))
+
+    def test_metadata_cache(self):
+
+        with mock.patch.object(
+                SHGReader, 'read_metadata',
+                wraps=self.reader.read_metadata) as mock_read:
+            self.assertTrue(self.reader.can_load(test_shg_image_path))
+            self.reader.create_image_stack([test_shg_image_path])
+            self.assertEqual(1, mock_read.call_count)
+
+    def test_single_open(self):
+
+        with mock.patch(
+                'pyfibre.addons.shg_pl_trans.shg_reader.TiffFile',
+                wraps=TiffFile) as mock_open:
+            image_stack = self.reader.create_image_stack(
+                [test_shg_image_path])
+            self.assertEqual(1, mock_open.call_count)
+
+            # Metadata is cached from the same read as the image
+            self.assertTrue(self.reader.can_load(test_shg_image_path))
+            self.assertEqual(1, mock_open.call_count)
+
+        self.assertEqual((200, 200), image_stack[0].shape)
+
+        with self.assertRaises(WrongFileTypeError):
+            self.reader.create_image_stack(['not_an_image'])
+
     def test__format_image(self):
 
         image = self.reader._format_image(
@@ -5,7 +5,8 @@ from ..utils import (
     extract_prefix,
     get_files_prefixes,
     filter_input_files,
-    get_image_type)
+    get_image_type,
+    group_files_by_type)
 
 
 class TestReader(TestCase):
@@ -78,3 +79,19 @@ class TestReader(TestCase):
             [os.path.join('directory', 'prefix2-pl-shg-test.tif'),
              os.path.join('directory', 'prefix-shg-asterisco.tif')],
             filtered_files)
+
+    def test_group_files_by_type(self):
+        groups = group_files_by_type(self.input_files)
+
+        self.assertListEqual(
+            [(self.input_files[0], f'{self.prefix}1'),
+             (self.input_files[1], f'{self.prefix}2')],
+            groups['SHG-PL-Trans'])
+        self.assertListEqual(
+            [(self.input_files[2], self.prefix)],
+            groups['PL-Trans'])
+        self.assertListEqual(
+            [(self.input_files[3], self.prefix),
+             (self.input_files[5], self.prefix),
+             (self.input_files[6], self.prefix)],
+            groups['SHG'])
@@ -1,4 +1,5 @@
 from pyfibre.model.tools.figures import (
+    TENSOR_IMAGE_SIGMA,
     create_figure,
     create_tensor_image,
     create_network_image,
@@ -12,7 +13,9 @@ def create_shg_figures(multi_image, figname, network_graphs=None,
     image = multi_image.shg_image
 
     create_figure(image, figname + '_SHG', cmap='binary_r')
-    tensor_image = create_tensor_image(image)
+    tensor_image = create_tensor_image(
+        image, structure_tensor=multi_image.structure_tensor(
+            'SHG', TENSOR_IMAGE_SIGMA))
     create_figure(tensor_image, figname + '_tensor')
 
     if network_graphs is not None:
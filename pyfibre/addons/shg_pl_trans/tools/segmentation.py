@@ -2,13 +2,13 @@ import numpy as np
 from scipy.ndimage import binary_dilation, binary_closing
 from skimage.exposure import equalize_adapthist
 from skimage.filters import threshold_mean
-from skimage.morphology import remove_small_holes
 
 from pyfibre.model.objects.segments import FibreSegment, CellSegment
 from pyfibre.model.tools.convertors import binary_to_segments
 from pyfibre.model.tools.segmentation import (
     create_fibre_filter, rgb_segmentation)
-from pyfibre.model.tools.utilities import mean_binary, region_swap
+from pyfibre.model.tools.utilities import (
+    mean_binary, region_swap, clean_binary)
 
 from .shg_pl_trans_kmeans_filter import SHGPLTransKmeansFilter
 
@@ -22,8 +22,8 @@ def fibre_cell_region_swap(multi_image, fibre_mask, cell_mask):
         [multi_image.pl_image, multi_image.shg_image],
         [250, 150], [0.01, 0.1])
 
-    fibre_mask = remove_small_holes(fibre_mask)
-    cell_mask = remove_small_holes(cell_mask)
+    fibre_mask = clean_binary(fibre_mask, hole_size=64)
+    cell_mask = clean_binary(cell_mask, hole_size=64)
 
     return fibre_mask, cell_mask
 
@@ -61,7 +61,8 @@ def shg_pl_trans_segmentation(
         multi_image, fibre_networks,
         min_fibre_size=100, min_cell_size=200,
         min_fibre_frac=100, min_cell_frac=0.001,
-        scale=1.0, **kwargs):
+        scale=1.0, refine=False,
+        kmeans_samples=None, n_jobs=1, **kwargs):
 
     # Create an image stack for the rgb_segmentation from SHG and PL
     # images
@@ -73,13 +74,23 @@ def shg_pl_trans_segmentation(
         1, 0)
 
     # Create composite RGB image from SHG, PL and transmission
-    stack = (multi_image.shg_image * fibre_filter,
-             np.sqrt(multi_image.pl_image * multi_image.trans_image),
-             equalize_adapthist(multi_image.trans_image))
-
-    # Segment the PL image using k-means clustering
+    stack = np.stack(
+        [multi_image.shg_image * fibre_filter,
+         np.sqrt(multi_image.pl_image * multi_image.trans_image),
+         equalize_adapthist(multi_image.trans_image)], axis=-1)
+
+    # The fibre filter is only needed to build the composite image
+    del fibre_filter
+
+    # Segment the PL image using k-means clustering. Clustering
+    # runs can be fitted on a subsample of kmeans_samples pixels
+    # in up to n_jobs threads, although by default every pixel is
+    # used in series
     fibre_mask, cell_mask = rgb_segmentation(
-        stack, SHGPLTransKmeansFilter(), scale=scale)
+        stack,
+        SHGPLTransKmeansFilter(n_jobs=n_jobs, n_samples=kmeans_samples),
+        scale=scale, refine=refine)
+    del stack
 
     # Swap over any pixel areas that may have been wrongly assigned
     fibre_mask, cell_mask = fibre_cell_region_swap(
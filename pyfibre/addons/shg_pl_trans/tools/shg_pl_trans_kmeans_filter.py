@@ -8,6 +8,20 @@ def nonzero_mean(array):
     return array.sum() / np.count_nonzero(array)
 
 
+def cluster_nonzero_mean(label_image, image, n_clusters):
+    """Return mean of non-zero image values for each cluster
+    label in label_image"""
+    labels = np.asarray(label_image, dtype=np.intp).ravel()
+    values = image.ravel()
+
+    sums = np.bincount(labels, weights=values, minlength=n_clusters)
+    counts = np.bincount(
+        labels, weights=values != 0, minlength=n_clusters)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return sums[:n_clusters] / counts[:n_clusters]
+
+
 def spherical_coords(coords):
     """Transform cartesian coordinates to spherical
 
@@ -91,12 +105,10 @@ class SHGPLTransKmeansFilter(BaseKmeansFilter):
 
         n_clusters = len(centres)
 
-        # Calculate average intensity of each labelled region
-        intensities = np.zeros(n_clusters)
-        for index in range(n_clusters):
-            indices = np.where(label_image == index)
-            cluster_values = self._greyscale[indices]
-            intensities[index] += nonzero_mean(cluster_values)
+        # Calculate average non-zero intensity of each labelled
+        # region in a single pass over the label image
+        intensities = cluster_nonzero_mean(
+            label_image, self._greyscale, n_clusters)
 
         # Normalise centroids
         magnitudes = np.sqrt(np.sum(centres ** 2, axis=-1))
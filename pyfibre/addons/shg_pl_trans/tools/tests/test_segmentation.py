@@ -1,3 +1,5 @@
+from unittest import mock
+
 from skimage.io import imread
 
 from pyfibre.tests.probe_classes.utilities import (
@@ -11,6 +13,7 @@ from pyfibre.addons.shg_pl_trans.tests.fixtures import (
 
 from ..segmentation import (
     shg_segmentation, shg_pl_trans_segmentation)
+from .. import segmentation
 
 
 class TestSegmentation(PyFibreTestCase):
@@ -41,3 +44,21 @@ class TestSegmentation(PyFibreTestCase):
         shg_pl_trans_segmentation(
             self.multi_image, self.fibre_networks
         )
+
+    def test_shg_pl_trans_kmeans_options(self):
+
+        with mock.patch.object(
+                segmentation, 'rgb_segmentation',
+                wraps=segmentation.rgb_segmentation) as mock_segment:
+            shg_pl_trans_segmentation(
+                self.multi_image, self.fibre_networks)
+            kmeans_filter = mock_segment.call_args[0][1]
+            self.assertEqual(1, kmeans_filter.n_jobs)
+            self.assertIsNone(kmeans_filter.n_samples)
+
+            shg_pl_trans_segmentation(
+                self.multi_image, self.fibre_networks,
+                kmeans_samples=500, n_jobs=2)
+            kmeans_filter = mock_segment.call_args[0][1]
+            self.assertEqual(2, kmeans_filter.n_jobs)
+            self.assertEqual(500, kmeans_filter.n_samples)
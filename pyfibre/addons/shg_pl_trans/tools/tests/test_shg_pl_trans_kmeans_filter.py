@@ -2,7 +2,7 @@ import numpy as np
 from skimage.io import imread
 
 from pyfibre.addons.shg_pl_trans.tools.shg_pl_trans_kmeans_filter import (
-    nonzero_mean, spherical_coords,
+    nonzero_mean, cluster_nonzero_mean, spherical_coords,
     binary_classifier_spherical,
     distance_sum,
     SHGPLTransKmeansFilter
@@ -32,6 +32,17 @@ class TestSHGPLTransKmeansFilter(PyFibreTestCase):
 
         self.assertEqual(3, nonzero_mean(array))
 
+    def test_cluster_nonzero_mean(self):
+
+        label_image = np.array([[0, 0, 1], [1, 2, 0]])
+        image = np.array([[2., 0., 1.], [3., 5., 4.]])
+
+        intensities = cluster_nonzero_mean(label_image, image, 4)
+
+        self.assertArrayAlmostEqual(
+            np.array([3, 2, 5]), intensities[:3])
+        self.assertTrue(np.isnan(intensities[3]))
+
     def test_distance_sum(self):
 
         vector = np.ones((4, 4))
@@ -6,20 +6,19 @@ IMAGE_TYPES = {'SHG': '-shg',
                'SHG-PL-Trans': '-pl-shg'}
 
 
-def filter_input_files(input_files):
+#: Keywords in file names that exclude files from analysis
+EXCLUDED_KEYWORDS = ('display', 'virada')
 
-    removed_files = []
 
-    for filename in input_files:
-        if not filename.endswith('.tif'):
-            removed_files.append(filename)
-        elif 'display' in filename:
-            removed_files.append(filename)
-        elif 'virada' in filename != -1:
-            removed_files.append(filename)
+def filter_input_files(input_files):
+    """Remove any files from input_files that are not TIFF images
+    or contain an excluded keyword in their names"""
 
-    for filename in removed_files:
-        input_files.remove(filename)
+    input_files[:] = [
+        filename for filename in input_files
+        if filename.endswith('.tif')
+        and not any(keyword in filename for keyword in EXCLUDED_KEYWORDS)
+    ]
 
     return input_files
 
@@ -49,6 +48,22 @@ def get_files_prefixes(input_files, image_type):
     return files, prefixes
 
 
+def group_files_by_type(input_files):
+    """Group input_files by image type in a single pass, returning
+    a dictionary containing lists of (filename, prefix) tuples for
+    each supported image type"""
+
+    groups = {image_type: [] for image_type in IMAGE_TYPES}
+
+    for filename in input_files:
+        image_type = get_image_type(filename)
+        if image_type in groups:
+            prefix = extract_prefix(filename, IMAGE_TYPES[image_type])
+            groups[image_type].append((filename, prefix))
+
+    return groups
+
+
 def get_image_type(image_path):
     """Get type of image (PL, SHG or SHG-PL-Trans) from file name"""
 
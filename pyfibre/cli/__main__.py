@@ -31,6 +31,11 @@ from .pyfibre_cli import PyFibreApplication
     help="Run GUI under cProfile, creating .prof and .pstats "
          "files in the current directory."
 )
+@click.option(
+    '--profile_stages', is_flag=True, default=False,
+    help="Record time and peak memory of each analysis stage, "
+         "saved for each image and summarised in a CSV file"
+)
 @click.option(
     '--ow_metric', is_flag=True, default=False,
     help='Toggles overwrite analytic metrics'
@@ -55,6 +60,10 @@ from .pyfibre_cli import PyFibreApplication
     '--key', help='Keywords to filter file names',
     default=''
 )
+@click.option(
+    '--recursive', is_flag=True, default=False,
+    help='Include images in sub-directories of file paths'
+)
 @click.option(
     '--sigma', help='Gaussian smoothing standard deviation',
     default=0.5
@@ -77,18 +86,21 @@ from .pyfibre_cli import PyFibreApplication
 )
 def pyfibre(file_paths, key, sigma, alpha, log_name,
             database_name, debug, profile, ow_metric, ow_segment,
-            ow_network, save_figures, test):
+            ow_network, save_figures, test, recursive,
+            profile_stages):
     """Launches the PyFibre command line app"""
 
     run(list(file_paths), key, sigma, alpha, log_name,
         database_name, debug, profile, ow_metric, ow_segment,
-        ow_network, save_figures, test)
+        ow_network, save_figures, test, recursive=recursive,
+        profile_stages=profile_stages)
 
 
 def run(file_paths, key, sigma, alpha, log_name,
         database_name, debug, profile,
         ow_metric, ow_segment,
-        ow_network, save_figures, test):
+        ow_network, save_figures, test, recursive=False,
+        profile_stages=False):
 
     if test:
         debug = True
@@ -123,12 +135,12 @@ def run(file_paths, key, sigma, alpha, log_name,
                 file_paths += plugin.get_test_files()
 
     pyfibre_app = PyFibreApplication(
-        file_paths=file_paths,
+        file_paths=file_paths, recursive=recursive,
         sigma=sigma, alpha=alpha, key=key,
         database_name=database_name,
         ow_metric=ow_metric, ow_segment=ow_segment,
         ow_network=ow_network, save_figures=save_figures,
-        plugins=plugins
+        profile_stages=profile_stages, plugins=plugins
     )
 
     pyfibre_app.run()
@@ -0,0 +1,175 @@
+"""
+PyFibre
+Headless batch routine
+
+Analyses a batch of images without starting an envisage Application
+or GUI toolkit, for use in scripts, short jobs and worker processes.
+Multi image factories are resolved directly from plugins, and pandas
+is only imported once metric databases are collated.
+"""
+import logging
+import time
+
+from pyfibre.io.utilities import parse_file_path
+from pyfibre.profiling import save_profile_summary
+from pyfibre.pyfibre_runner import PyFibreRunner
+from pyfibre.utilities import load_plugins
+
+logger = logging.getLogger(__name__)
+
+
+def load_multi_image_factories(plugins=None):
+    """Return the IMultiImageFactory instances contributed by
+    PyFibre plugins, without registering them as extensions of
+    an envisage Application
+
+    Parameters
+    ----------
+    plugins: list of BasePyFibrePlugin, optional
+        Plugins contributing factories. If not provided, installed
+        plugins are loaded using load_plugins
+
+    Returns
+    -------
+    factories: list of IMultiImageFactory
+        Factories contributed by each plugin
+    """
+    if plugins is None:
+        plugins = load_plugins()
+
+    return [
+        factory
+        for plugin in plugins
+        for factory in plugin.multi_image_factories
+    ]
+
+
+def create_components(factories):
+    """Create the parser, reader and analyser of each factory
+
+    Parameters
+    ----------
+    factories: list of IMultiImageFactory
+        Factories used to create each component
+
+    Returns
+    -------
+    parsers, readers, analysers: dict
+        Components of each factory, keyed by factory label
+    """
+    parsers = {}
+    readers = {}
+    analysers = {}
+
+    for factory in factories:
+        parsers[factory.label] = factory.create_parser()
+        readers[factory.label] = factory.create_reader()
+        analysers[factory.label] = factory.create_analyser()
+
+    return parsers, readers, analysers
+
+
+def collect_file_sets(file_paths, parsers, key=None, recursive=False):
+    """Collate files found in file_paths into file sets, using
+    each parser in the dictionary parsers"""
+
+    input_files = []
+    for file_path in file_paths:
+        input_files += parse_file_path(
+            file_path, key, recursive=recursive)
+
+    file_sets = []
+    for parser in parsers.values():
+        file_sets += parser.get_file_sets(input_files)
+
+    return file_sets
+
+
+def collate_databases(runner, file_sets, analyser, reader):
+    """Analyse each file set using runner, returning a list
+    containing a pd.DataFrame for each of analyser.database_names"""
+    import pandas as pd
+
+    image_databases = [
+        pd.DataFrame() for _ in analyser.database_names]
+
+    for databases in runner.run(file_sets, analyser, reader):
+        for index, database in enumerate(databases):
+            if isinstance(database, pd.Series):
+                image_databases[index] = image_databases[index].append(
+                    database, ignore_index=True)
+            elif isinstance(database, pd.DataFrame):
+                image_databases[index] = pd.concat(
+                    [image_databases[index], database])
+
+    return image_databases
+
+
+def run_batch(file_paths, key='', recursive=False, database_name=None,
+              factories=None, **runner_traits):
+    """Analyse all images found in file_paths, without starting
+    an envisage Application
+
+    Parameters
+    ----------
+    file_paths: list of str
+        Paths of image files or directories containing images
+    key: str, optional
+        Keywords used to filter file names
+    recursive: bool, optional
+        Whether to include files in sub-directories of file_paths
+    database_name: str, optional
+        If provided, metric databases of each image type are saved
+        using this file name
+    factories: list of IMultiImageFactory, optional
+        Factories used to parse, load and analyse images. If not
+        provided, factories are loaded from installed plugins
+    runner_traits:
+        Additional keyword arguments passed to PyFibreRunner
+
+    Returns
+    -------
+    results: dict
+        Dictionary of metric databases for each factory label,
+        keyed by database name
+    """
+    start = time.perf_counter()
+
+    if factories is None:
+        factories = load_multi_image_factories()
+
+    parsers, readers, analysers = create_components(factories)
+    runner = PyFibreRunner(**runner_traits)
+    file_sets = collect_file_sets(
+        file_paths, parsers, key=key, recursive=recursive)
+
+    logger.info(
+        f"TOTAL STARTUP TIME = "
+        f"{round(time.perf_counter() - start, 3)} s")
+
+    results = {}
+    profilers = []
+
+    for label, reader in readers.items():
+
+        logger.info(f"Analysing {label} images")
+        analyser = analysers[label]
+
+        image_databases = collate_databases(
+            runner, file_sets, analyser, reader)
+        profilers += runner.profilers
+
+        results[label] = dict(
+            zip(analyser.database_names, image_databases))
+
+        if database_name:
+            from pyfibre.io.database_io import save_database
+
+            for name, database in results[label].items():
+                save_database(database, database_name, name)
+
+    if runner.profile_stages and database_name:
+        save_profile_summary(
+            profilers, f'{database_name}_profile.csv')
+
+    return results
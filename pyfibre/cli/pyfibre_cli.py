@@ -7,15 +7,16 @@ Created on: 16/08/2018
 """
 import logging
 
-import pandas as pd
-
 from envisage.api import Application
-from traits.api import Instance, Str, List, File
+from traits.api import Bool, Instance, Str, List, File
 
+from pyfibre.cli.pyfibre_batch import (
+    collate_databases, collect_file_sets, create_components)
 from pyfibre.io.database_io import save_database
-from pyfibre.io.utilities import parse_file_path
+from pyfibre.profiling import save_profile_summary
 from pyfibre.ids import MULTI_IMAGE_FACTORIES
 from pyfibre.pyfibre_runner import PyFibreRunner
+from pyfibre.runner_events import ProgressLogger
 
 logger = logging.getLogger(__name__)
 
@@ -34,15 +35,20 @@ class PyFibreApplication(Application):
 
     file_paths = List(File)
 
+    #: Whether to include files in sub-directories of file_paths
+    recursive = Bool(False)
+
     def __init__(self, sigma=0.5, alpha=0.5,
                  ow_metric=False, ow_segment=False,
                  ow_network=False, save_figures=False,
-                 **traits):
+                 profile_stages=False, **traits):
 
         runner = PyFibreRunner(
             sigma=sigma, alpha=alpha,
             ow_metric=ow_metric, ow_segment=ow_segment,
-            ow_network=ow_network, save_figures=save_figures
+            ow_network=ow_network, save_figures=save_figures,
+            profile_stages=profile_stages,
+            callbacks=[ProgressLogger()]
         )
 
         super(PyFibreApplication, self).__init__(
@@ -50,44 +56,27 @@ class PyFibreApplication(Application):
             **traits)
 
         factories = self.get_extensions(MULTI_IMAGE_FACTORIES)
-        self.supported_parsers = {}
-        self.supported_readers = {}
-        self.supported_analysers = {}
-
-        for factory in factories:
-            self.supported_parsers[factory.label] = factory.create_parser()
-            self.supported_readers[factory.label] = factory.create_reader()
-            self.supported_analysers[factory.label] = factory.create_analyser()
+        (self.supported_parsers,
+         self.supported_readers,
+         self.supported_analysers) = create_components(factories)
 
     def _run_pyfibre(self):
 
-        input_files = []
-        for file_path in self.file_paths:
-            input_files += parse_file_path(file_path, self.key)
+        file_sets = collect_file_sets(
+            self.file_paths, self.supported_parsers,
+            key=self.key, recursive=self.recursive)
 
-        file_sets = []
-        for label, parser in self.supported_parsers.items():
-            file_sets += parser.get_file_sets(input_files)
+        profilers = []
 
         for label, reader in self.supported_readers.items():
 
             logger.info(f"Analysing {label} images")
             analyser = self.supported_analysers[label]
 
-            image_databases = [
-                pd.DataFrame() for _ in analyser.database_names]
+            image_databases = collate_databases(
+                self.runner, file_sets, analyser, reader)
 
-            generator = self.runner.run(
-                file_sets, analyser, reader)
-
-            for databases in generator:
-                for index, database in enumerate(databases):
-                    if isinstance(database, pd.Series):
-                        image_databases[index] = image_databases[index].append(
-                            database, ignore_index=True)
-                    elif isinstance(database, pd.DataFrame):
-                        image_databases[index] = pd.concat(
-                            [image_databases[index], database])
+            profilers += self.runner.profilers
 
             if self.database_name:
                 for index, name in enumerate(analyser.database_names):
@@ -96,6 +85,10 @@ class PyFibreApplication(Application):
                         self.database_name,
                         name)
 
+        if self.runner.profile_stages and self.database_name:
+            save_profile_summary(
+                profilers, f'{self.database_name}_profile.csv')
+
     def run(self):
 
         if self.start():
@@ -0,0 +1,99 @@
+import subprocess
+import sys
+from unittest import TestCase, mock
+
+import pandas as pd
+
+from pyfibre.cli.pyfibre_batch import (
+    collate_databases, collect_file_sets, create_components,
+    load_multi_image_factories, run_batch)
+from pyfibre.pyfibre_runner import PyFibreRunner
+from pyfibre.tests.fixtures import test_image_path
+from pyfibre.tests.probe_classes.analyser import ProbeAnalyser
+from pyfibre.tests.probe_classes.factories import ProbeMultiImageFactory
+from pyfibre.tests.probe_classes.parsers import ProbeParser
+from pyfibre.tests.probe_classes.readers import ProbeMultiImageReader
+
+
+ITERATOR_PATH = 'pyfibre.cli.pyfibre_batch.PyFibreRunner.run'
+
+
+def dummy_iterate_images(file_sets, analyser, reader):
+    for file_set in file_sets:
+        yield [pd.Series({'File': file_set.prefix})] * len(
+            analyser.database_names)
+
+
+class TestPyFibreBatch(TestCase):
+
+    def setUp(self):
+        self.factories = [ProbeMultiImageFactory()]
+
+    def test_load_multi_image_factories(self):
+        plugin = mock.Mock(multi_image_factories=self.factories)
+
+        factories = load_multi_image_factories([plugin])
+        self.assertListEqual(self.factories, factories)
+
+        with mock.patch(
+                'pyfibre.cli.pyfibre_batch.load_plugins',
+                return_value=[plugin]) as mock_load:
+            factories = load_multi_image_factories()
+
+        mock_load.assert_called_once_with()
+        self.assertListEqual(self.factories, factories)
+
+    def test_create_components(self):
+        parsers, readers, analysers = create_components(self.factories)
+
+        self.assertIsInstance(parsers['Probe'], ProbeParser)
+        self.assertIsInstance(readers['Probe'], ProbeMultiImageReader)
+        self.assertIsInstance(analysers['Probe'], ProbeAnalyser)
+
+    def test_collect_file_sets(self):
+        parsers = {'Probe': ProbeParser()}
+
+        file_sets = collect_file_sets([test_image_path], parsers)
+        self.assertEqual(1, len(file_sets))
+
+        file_sets = collect_file_sets(
+            [test_image_path], parsers, key='WRONG')
+        self.assertEqual(0, len(file_sets))
+
+    def test_collate_databases(self):
+        parsers, readers, analysers = create_components(self.factories)
+        file_sets = collect_file_sets([test_image_path], parsers)
+
+        with mock.patch(ITERATOR_PATH) as mock_iterate:
+            mock_iterate.side_effect = dummy_iterate_images
+            databases = collate_databases(
+                PyFibreRunner(), file_sets * 2,
+                analysers['Probe'], readers['Probe'])
+
+        self.assertEqual(1, len(databases))
+        self.assertEqual(2, len(databases[0]))
+
+    def test_run_batch(self):
+
+        with mock.patch(ITERATOR_PATH) as mock_iterate:
+            mock_iterate.side_effect = dummy_iterate_images
+            results = run_batch(
+                [test_image_path], factories=self.factories,
+                sigma=0.25)
+
+        self.assertEqual(['Probe'], list(results))
+        self.assertEqual(['probe'], list(results['Probe']))
+        self.assertEqual(1, len(results['Probe']['probe']))
+
+    def test_headless_imports(self):
+        # Importing the batch routine must not start the GUI toolkit
+        # or the envisage Application framework
+        code = (
+            "import sys; import pyfibre.cli.pyfibre_batch; "
+            "print([module for module in "
+            "('envisage.api', 'pandas', 'pyface.qt', 'chaco') "
+            "if module in sys.modules])")
+        output = subprocess.check_output(
+            [sys.executable, '-c', code], universal_newlines=True)
+
+        self.assertEqual('[]', output.strip())
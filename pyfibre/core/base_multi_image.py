@@ -4,9 +4,10 @@ import numpy as np
 
 from traits.api import (
     ABCHasTraits, ArrayOrNone, List, Dict, Str, Directory,
-    provides
+    provides, on_trait_change
 )
 
+from pyfibre.model.tools.filters import structure_tensor_components
 from pyfibre.utilities import NotSupportedError
 
 from .i_multi_image import IMultiImage
@@ -30,6 +31,10 @@ class BaseMultiImage(ABCHasTraits):
     #: image_stack
     image_dict = Dict(Str, ArrayOrNone)
 
+    #: Cache of structure tensor components for entries in
+    #: image_dict, keyed by image label and Gaussian sigma
+    _structure_tensors = Dict()
+
     def __init__(self, *args, **kwargs):
 
         if 'image_stack' in kwargs:
@@ -85,6 +90,35 @@ class BaseMultiImage(ABCHasTraits):
                 f"image not found in {self.__class__}.image_stack"
             )
 
+    @on_trait_change('image_stack,image_stack_items,'
+                     'image_dict,image_dict_items')
+    def _clear_structure_tensors(self):
+        """Invalidate cached structure tensors when images change"""
+        self._structure_tensors = {}
+
+    def structure_tensor(self, label, sigma=0.0001):
+        """Return structure tensor components of an image in
+        image_dict. These are calculated once for each label and sigma
+        and shared between all callers
+
+        Parameters
+        ----------
+        label: str
+            Key of image in image_dict
+        sigma: float, optional
+            Gaussian smoothing standard deviation
+
+        Returns
+        -------
+        j_components: array_like of float32; shape=(3,) + image.shape
+            j_xx, j_xy and j_yy structure tensor components
+        """
+        key = (label, sigma)
+        if key not in self._structure_tensors:
+            self._structure_tensors[key] = structure_tensor_components(
+                self.image_dict[label], sigma=sigma)
+        return self._structure_tensors[key]
+
     @classmethod
     def from_array(cls, array):
         """Create instance from either a 2D or 3D numpy array"""
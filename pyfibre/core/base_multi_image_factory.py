@@ -7,7 +7,10 @@ from .i_multi_image import IMultiImage
 from .i_multi_image_analyser import IMultiImageAnalyser
 from .i_multi_image_factory import IMultiImageFactory
 from .i_multi_image_reader import IMultiImageReader
-from .i_multi_image_viewer import IMultiImageViewer
+
+#: Viewer classes depend on chaco, and so are only resolved when
+#: first required by the GUI
+VIEWER_INTERFACE = 'pyfibre.core.i_multi_image_viewer.IMultiImageViewer'
 
 
 @provides(IMultiImageFactory)
@@ -34,8 +37,9 @@ class BaseMultiImageFactory(ABCHasStrictTraits):
     #: Parser class, used to collate files into sets
     parser_class = Type(IFileParser)
 
-    #: Viewer class, used to display an image type
-    viewer_class = Type(IMultiImageViewer)
+    #: Viewer class, used to display an image type. Only
+    #: obtained from get_viewer when first accessed
+    viewer_class = Type(klass=VIEWER_INTERFACE)
 
     def __init__(self, **traits):
 
@@ -44,7 +48,6 @@ class BaseMultiImageFactory(ABCHasStrictTraits):
         reader = self.get_reader()
         analyser = self.get_analyser()
         parser = self.get_parser()
-        viewer = self.get_viewer()
 
         super(BaseMultiImageFactory, self).__init__(
             label=label,
@@ -52,10 +55,12 @@ class BaseMultiImageFactory(ABCHasStrictTraits):
             reader_class=reader,
             analyser_class=analyser,
             parser_class=parser,
-            viewer_class=viewer,
             **traits
         )
 
+    def _viewer_class_default(self):
+        return self.get_viewer()
+
     @abstractmethod
     def get_label(self):
         """Returns key associated with this factory"""
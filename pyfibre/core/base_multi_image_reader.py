@@ -1,7 +1,11 @@
 from abc import abstractmethod
+from collections import OrderedDict
 import logging
+import os
+import threading
 
-from traits.api import ABCHasTraits, List, Type, provides
+from traits.api import (
+    ABCHasTraits, Any, Instance, Int, List, Type, provides)
 
 from pyfibre.io.utilities import get_file_names
 
@@ -11,6 +15,9 @@ from .i_multi_image_reader import IMultiImageReader
 
 logger = logging.getLogger(__name__)
 
+#: Default maximum number of files held in a reader metadata cache
+METADATA_CACHE_SIZE = 4096
+
 
 class WrongFileSetError(Exception):
     pass
@@ -30,11 +37,25 @@ class BaseMultiImageReader(ABCHasTraits):
     #: Reference to the IMultiImage class associated with this reader
     _multi_image_class = Type(IMultiImage)
 
+    #: Maximum number of files held in the metadata cache, beyond
+    #: which the least recently used entries are discarded
+    metadata_cache_size = Int(METADATA_CACHE_SIZE)
+
+    #: Cache of file metadata, keyed by absolute file path and ordered
+    #: by least recent use. Each entry also holds the file modification
+    #: time and size that the metadata was read from
+    _metadata_cache = Instance(OrderedDict, ())
+
+    #: Lock guarding the metadata cache, which may be accessed by
+    #: image prefetching threads
+    _metadata_lock = Any()
+
     def __init__(self, *args, **kwargs):
         """Overloads the super class to set private traits"""
         super(BaseMultiImageReader, self).__init__(*args, **kwargs)
         self._multi_image_class = self.get_multi_image_class()
         self._supported_file_sets = self.get_supported_file_sets()
+        self._metadata_lock = threading.Lock()
 
     def create_image_stack(self, filenames):
         """From a list of file names, return a list of numpy arrays
@@ -47,20 +68,100 @@ class BaseMultiImageReader(ABCHasTraits):
 
             logger.info(f'Loading {filename}')
 
-            if not self.can_load(filename):
-                raise WrongFileTypeError
-
-            image = self.load_image(filename)
+            image = self.read_image(filename)
 
             # Add file image to stack
             image_stack.append(image)
 
         return image_stack
 
+    def read_image(self, filename):
+        """Check that filename can be loaded and return its image
+        data, raising a WrongFileTypeError otherwise. Subclasses that
+        can obtain file metadata from the same read as the image data
+        can override this method, so that each file is only opened
+        once"""
+        if self.file_metadata(filename) is None:
+            raise WrongFileTypeError
+        return self.load_image(filename)
+
+    def file_metadata(self, filename):
+        """Return metadata required to load filename, or None if the
+        file cannot be loaded. Results are cached against the path,
+        modification time and size of each file, so that repeated
+        probing does not need to open the file again"""
+
+        found, metadata = self.cached_metadata(filename)
+        if not found:
+            metadata = self.read_metadata(filename)
+            self.cache_metadata(filename, metadata)
+
+        return metadata
+
+    def _file_signature(self, filename):
+        """Return the absolute path of filename, alongside its
+        modification time and size, or None if it cannot be found"""
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        return os.path.abspath(filename), (stat.st_mtime_ns, stat.st_size)
+
+    def cached_metadata(self, filename):
+        """Return a tuple (found, metadata), where found indicates
+        whether valid metadata for filename is held in the cache"""
+        key = self._file_signature(filename)
+        if key is None:
+            return False, None
+        path, signature = key
+
+        with self._metadata_lock:
+            cached = self._metadata_cache.get(path)
+            if cached is None or cached[0] != signature:
+                return False, None
+            self._metadata_cache.move_to_end(path)
+
+        return True, cached[1]
+
+    def cache_metadata(self, filename, metadata):
+        """Store metadata for filename in the cache, discarding the
+        least recently used entries beyond metadata_cache_size.
+        Files that cannot be found are not cached"""
+        key = self._file_signature(filename)
+        if key is None:
+            return
+        path, signature = key
+
+        with self._metadata_lock:
+            self._metadata_cache[path] = (signature, metadata)
+            self._metadata_cache.move_to_end(path)
+            while len(self._metadata_cache) > self.metadata_cache_size:
+                self._metadata_cache.popitem(last=False)
+
+    def read_metadata(self, filename):
+        """Read metadata required to load filename, returning None
+        if the file is not formatted correctly. By default, only the
+        can_load check is performed. Subclasses can override this
+        method to return information such as image format and shape
+        from a single read of the file header"""
+        if self.can_load(filename):
+            return {}
+        return None
+
+    def clear_metadata_cache(self):
+        """Remove all cached file metadata"""
+        with self._metadata_lock:
+            self._metadata_cache.clear()
+
+    def supports(self, file_set):
+        """Return whether file_set is of a type that can be loaded
+        by the reader"""
+        return type(file_set) in self._supported_file_sets
+
     def load_multi_image(self, file_set):
         """Image loader for MultiImage classes"""
 
-        if type(file_set) not in self._supported_file_sets:
+        if not self.supports(file_set):
             raise WrongFileSetError
 
         filenames = self.get_filenames(file_set)
@@ -4,7 +4,6 @@ from .i_file_parser import IFileParser
 from .i_multi_image import IMultiImage
 from .i_multi_image_analyser import IMultiImageAnalyser
 from .i_multi_image_reader import IMultiImageReader
-from .i_multi_image_viewer import IMultiImageViewer
 
 
 class IMultiImageFactory(Interface):
@@ -19,7 +18,8 @@ class IMultiImageFactory(Interface):
 
     parser_class = Type(IFileParser)
 
-    viewer_class = Type(IMultiImageViewer)
+    viewer_class = Type(
+        klass='pyfibre.core.i_multi_image_viewer.IMultiImageViewer')
 
     def get_label(self):
         """Returns key associated with this factory"""
@@ -12,6 +12,10 @@ class IMultiImageReader(Interface):
 
     _multi_image_class = Type(IMultiImage)
 
+    def supports(self, file_set):
+        """Return whether file_set is of a type that can be loaded
+        by the reader"""
+
     def load_multi_image(self, file_set):
         """Image loader for MultiImage classes"""
 
@@ -27,6 +31,10 @@ class IMultiImageReader(Interface):
         """Return a list of numpy arrays suitable for the
         loader's IMultiImage type"""
 
+    def file_metadata(self, filename):
+        """Return cached metadata required to load filename, or None
+        if the file cannot be loaded"""
+
     def load_image(self, filename):
         """Load a single image from a file"""
 
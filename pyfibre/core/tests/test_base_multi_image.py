@@ -53,3 +53,25 @@ class TestBaseMultiImage(TestCase):
         multi_image = DummyMultiImage.from_array(image_array)
         self.assertEqual(1, len(multi_image))
         self.assertEqual((10, 10), multi_image.shape)
+
+    def test_structure_tensor(self):
+
+        structure_tensor = self.multi_image.structure_tensor(
+            'Test 0', sigma=1.0)
+
+        self.assertEqual((3, 10, 10), structure_tensor.shape)
+        self.assertEqual(np.float32, structure_tensor.dtype)
+        self.assertIs(
+            structure_tensor,
+            self.multi_image.structure_tensor('Test 0', sigma=1.0))
+        self.assertIsNot(
+            structure_tensor,
+            self.multi_image.structure_tensor('Test 1', sigma=1.0))
+        self.assertIsNot(
+            structure_tensor,
+            self.multi_image.structure_tensor('Test 0', sigma=2.0))
+
+        self.multi_image.image_stack[0] = self.image
+        self.assertIsNot(
+            structure_tensor,
+            self.multi_image.structure_tensor('Test 0', sigma=1.0))
@@ -6,6 +6,8 @@ from pyfibre.tests.probe_classes.analyser import (
     ProbeAnalyser)
 from pyfibre.tests.probe_classes.readers import (
     ProbeMultiImageReader)
+from pyfibre.tests.probe_classes.viewers import (
+    ProbeMultiImageViewer)
 
 
 class TestBaseMultiImageFactory(TestCase):
@@ -23,3 +25,7 @@ class TestBaseMultiImageFactory(TestCase):
     def test_create_analyser(self):
         analyser = self.factory.create_analyser()
         self.assertIsInstance(analyser, ProbeAnalyser)
+
+    def test_create_viewer(self):
+        viewer = self.factory.create_viewer()
+        self.assertIsInstance(viewer, ProbeMultiImageViewer)
@@ -1,4 +1,9 @@
-from pyfibre.core.base_multi_image_reader import WrongFileTypeError
+import os
+from unittest import mock
+
+from pyfibre.core.base_file_parser import FileSet
+from pyfibre.core.base_multi_image_reader import (
+    WrongFileSetError, WrongFileTypeError)
 from pyfibre.tests.fixtures import test_image_path
 from pyfibre.tests.probe_classes.parsers import ProbeFileSet
 from pyfibre.tests.probe_classes.readers import ProbeMultiImageReader
@@ -20,6 +25,13 @@ class TestBaseMultiImageReader(PyFibreTestCase):
         with self.assertRaises(WrongFileTypeError):
             self.reader.create_image_stack(['WRONG'])
 
+    def test_supports(self):
+        self.assertTrue(self.reader.supports(self.file_set))
+        self.assertFalse(self.reader.supports(FileSet(prefix='file')))
+
+        with self.assertRaises(WrongFileSetError):
+            self.reader.load_multi_image(FileSet(prefix='file'))
+
     def test_load_multi_image(self):
 
         multi_image = self.reader.load_multi_image(self.file_set)
@@ -28,3 +40,55 @@ class TestBaseMultiImageReader(PyFibreTestCase):
         self.assertEqual(1, len(multi_image))
         self.assertEqual('file', multi_image.name)
         self.assertEqual('/path/to/some', multi_image.path)
+
+    def test_file_metadata(self):
+
+        with mock.patch.object(
+                ProbeMultiImageReader, 'can_load',
+                return_value=True) as mock_can_load:
+            self.assertEqual({}, self.reader.file_metadata(test_image_path))
+            self.assertEqual({}, self.reader.file_metadata(test_image_path))
+            self.assertEqual(1, mock_can_load.call_count)
+
+            self.assertIn(
+                os.path.abspath(test_image_path),
+                self.reader._metadata_cache)
+
+            # Files that cannot be found are never cached
+            self.reader.file_metadata('not_a_file')
+            self.reader.file_metadata('not_a_file')
+            self.assertEqual(3, mock_can_load.call_count)
+
+        self.assertIsNone(self.reader.file_metadata('WRONG'))
+
+        self.reader.clear_metadata_cache()
+        self.assertDictEqual({}, self.reader._metadata_cache)
+
+    def test_file_metadata_modified(self):
+
+        path = os.path.abspath(test_image_path)
+        signature, metadata = (0, 0), None
+        self.reader._metadata_cache[path] = (signature, metadata)
+
+        # Stale entries are replaced when file has changed
+        self.assertEqual({}, self.reader.file_metadata(test_image_path))
+        self.assertNotEqual(
+            signature, self.reader._metadata_cache[path][0])
+
+    def test_metadata_cache_size(self):
+        self.reader.metadata_cache_size = 1
+        other_path = os.path.abspath(__file__)
+
+        self.reader.file_metadata(test_image_path)
+        self.reader.file_metadata(other_path)
+
+        self.assertListEqual(
+            [other_path], list(self.reader._metadata_cache))
+
+        # Cache hits are moved to the end of the eviction order
+        self.reader.metadata_cache_size = 2
+        self.reader.file_metadata(test_image_path)
+        self.reader.file_metadata(other_path)
+        self.assertListEqual(
+            [os.path.abspath(test_image_path), other_path],
+            list(self.reader._metadata_cache))
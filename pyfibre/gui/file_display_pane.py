@@ -11,6 +11,7 @@ from traitsui.api import (
     TextEditor
 )
 
+from pyfibre.io.directory_index import DirectoryIndex
 from pyfibre.io.utilities import parse_file_path
 from pyfibre.core.base_multi_image_reader import BaseMultiImageReader
 from pyfibre.core.base_file_parser import BaseFileParser
@@ -69,6 +70,10 @@ class FileDisplayPane(TraitsDockPane):
 
     supported_parsers = Dict(Str, BaseFileParser)
 
+    #: Cached listings of directories that have been added, so that
+    #: adding the same directory again only reads changed contents
+    directory_index = Instance(DirectoryIndex, ())
+
     #: The PyFibre logo. Stored at images/icon.ico
     image = ImageResource('icon.ico')
 
@@ -171,7 +176,8 @@ class FileDisplayPane(TraitsDockPane):
         """
 
         input_prefixes = [row.name for row in self.file_table]
-        input_files = parse_file_path(file_path)
+        input_files = parse_file_path(
+            file_path, index=self.directory_index)
 
         for tag, parser in self.supported_parsers.items():
             file_sets = parser.get_file_sets(input_files)
@@ -13,7 +13,7 @@ from traitsui.api import Item, View, EnumEditor
 from pyfibre.core.base_multi_image import BaseMultiImage
 from pyfibre.core.base_multi_image_viewer import BaseDisplayTab
 from pyfibre.model.tools.figures import (
-    create_tensor_image, create_network_image)
+    TENSOR_IMAGE_SIGMA, create_tensor_image, create_network_image)
 
 
 class ImageTab(BaseDisplayTab):
@@ -100,13 +100,16 @@ class ImageTab(BaseDisplayTab):
 
 class TensorImageTab(ImageTab):
 
-    def _tensor_image(self, image):
-        return create_tensor_image(image) * 255.999
+    def _tensor_image(self, label, image):
+        structure_tensor = self.multi_image.structure_tensor(
+            label, TENSOR_IMAGE_SIGMA)
+        return create_tensor_image(
+            image, structure_tensor=structure_tensor) * 255.999
 
     def _get_plot_data(self):
         """Convert each image into a tensor image"""
         image_dict = {
-            label: self._tensor_image(image).astype('uint8')
+            label: self._tensor_image(label, image).astype('uint8')
             for label, image in self._image_dict.items()}
         return ArrayPlotData(**image_dict)
 
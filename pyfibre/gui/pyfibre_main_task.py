@@ -1,4 +1,6 @@
 import logging
+import queue
+import threading
 
 import numpy as np
 import pandas as pd
@@ -26,15 +28,49 @@ from pyfibre.io.database_io import save_database
 from pyfibre.core.i_multi_image_factory import IMultiImageFactory
 from pyfibre.pyfibre_runner import (
     PyFibreRunner)
+from pyfibre.runner_events import (
+    FINISHED_EVENTS, ImageCompletedEvent, ImageFailedEvent)
 
 logger = logging.getLogger(__name__)
 
 
 def run_analysis(file_sets, runner, analysers, readers):
+    """Generator that runs the analysis of each file set in a
+    worker thread, yielding each RunnerEvent emitted by runner as
+    soon as it arrives, so that progress can be reported in the GUI.
+    Closing the generator stops the analysis once the current image
+    is finished"""
 
-    for image_type, reader in readers.items():
-        analyser = analysers[image_type]
-        list(runner.run(file_sets, analyser, reader))
+    events = queue.Queue()
+    stop = threading.Event()
+    errors = []
+
+    def analyse():
+        try:
+            for image_type, reader in readers.items():
+                analyser = analysers[image_type]
+                for _ in runner.run(file_sets, analyser, reader):
+                    if stop.is_set():
+                        return
+        except Exception as error:
+            errors.append(error)
+        finally:
+            events.put(None)
+
+    runner.callbacks.append(events.put)
+    worker = threading.Thread(target=analyse)
+    worker.start()
+
+    try:
+        for event in iter(events.get, None):
+            yield event
+    finally:
+        stop.set()
+        worker.join()
+        runner.callbacks.remove(events.put)
+
+    if errors:
+        raise errors[0]
 
 
 class PyFibreMainTask(Task):
@@ -88,6 +124,12 @@ class PyFibreMainTask(Task):
 
     _progress_bar = Any()
 
+    #: Number of images finished during the current run
+    _n_finished = Int()
+
+    #: Number of images to be analysed during the current run
+    _n_total = Int()
+
     def __init__(self, *args, **kwargs):
 
         super(PyFibreMainTask, self).__init__(*args, **kwargs)
@@ -221,9 +263,21 @@ class PyFibreMainTask(Task):
             self.viewer_pane.update()
 
     @on_trait_change('current_futures:result_event')
-    def _report_result(self, result):
-        database = result[0]
-        logger.info(f"Image analysis complete for {database['File']}")
+    def _report_result(self, event):
+        if isinstance(event, ImageCompletedEvent):
+            logger.info(
+                f"Image analysis complete for {event.name} "
+                f"in {round(event.elapsed, 3)} s")
+        elif isinstance(event, ImageFailedEvent):
+            logger.info(
+                f"Image analysis failed for {event.name}: "
+                f"{event.error}")
+            if event.traceback:
+                logger.debug(event.traceback)
+
+        if isinstance(event, FINISHED_EVENTS):
+            self._n_finished += 1
+            self._update_progress_bar()
 
     @on_trait_change('current_futures:done')
     def _future_done(self, future, name, new):
@@ -240,8 +294,16 @@ class PyFibreMainTask(Task):
 
     def _create_progress_bar(self, dialog):
         self._progress_bar = QtGui.QProgressBar(dialog)
+        self._update_progress_bar()
         return self._progress_bar
 
+    def _update_progress_bar(self):
+        """Show the number of images finished in the current run"""
+        if self._progress_bar is not None:
+            self._progress_bar.setMaximum(max(self._n_total, 1))
+            self._progress_bar.setValue(
+                min(self._n_finished, self._n_total))
+
     def _cancel_all_fired(self):
         for future in self.current_futures:
             if future.cancellable:
@@ -255,6 +317,10 @@ class PyFibreMainTask(Task):
 
         file_table = self.file_display_pane.file_table
 
+        self._n_finished = 0
+        self._n_total = self.file_display_pane.n_images
+        self._update_progress_bar()
+
         proc_count = np.min(
             (self.n_proc, self.file_display_pane.n_images))
         index_split = np.array_split(
@@ -10,6 +10,7 @@ from pyface.tasks.api import TaskWindow
 from traits_futures.toolkit_support import toolkit
 
 from pyfibre.pyfibre_runner import PyFibreRunner
+from pyfibre.runner_events import ImageFailedEvent
 from pyfibre.gui.pyfibre_main_task import PyFibreMainTask, run_analysis
 from pyfibre.gui.options_pane import OptionsPane
 from pyfibre.gui.file_display_pane import FileDisplayPane
@@ -123,13 +124,39 @@ class TestPyFibreMainTask(GuiTestAssistant, TestCase):
         with mock.patch(ITERATOR_PATH) as mock_iterate:
             mock_iterate.side_effect = dummy_iterate_images
 
-            run_analysis(
+            runner = PyFibreRunner()
+            list(run_analysis(
                 self.file_sets,
-                PyFibreRunner(),
+                runner,
                 self.main_task.supported_analysers,
-                self.main_task.supported_readers)
+                self.main_task.supported_readers))
 
             mock_iterate.assert_called_once()
+            self.assertListEqual([], runner.callbacks)
+
+    def test_run_analysis_failed_events(self):
+        runner = PyFibreRunner()
+
+        def failing_images(file_sets, analyser, reader):
+            # Events must reach the caller even when no image
+            # produces any databases
+            for file_set in file_sets:
+                runner._emit(ImageFailedEvent, name=file_set.prefix)
+            return
+            yield
+
+        with mock.patch(ITERATOR_PATH) as mock_iterate:
+            mock_iterate.side_effect = failing_images
+            events = list(run_analysis(
+                self.file_sets,
+                runner,
+                self.main_task.supported_analysers,
+                self.main_task.supported_readers))
+
+        self.assertEqual(len(self.file_sets), len(events))
+        self.assertTrue(all(
+            isinstance(event, ImageFailedEvent) for event in events))
+        self.assertListEqual([], runner.callbacks)
 
     def test_run_pyfibre(self):
 
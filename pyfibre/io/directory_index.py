@@ -0,0 +1,56 @@
+import os
+
+from traits.api import HasStrictTraits, Dict, Str, Tuple
+
+from .utilities import list_directory, scan_directory
+
+
+class DirectoryIndex(HasStrictTraits):
+    """Cached index of scanned directory trees. The listing of each
+    directory is stored against its modification time, so that only
+    directories whose contents have changed since the previous scan
+    are read again"""
+
+    #: Listings of each scanned directory, keyed by path. Each entry
+    #: holds the directory modification time, files and sub-directories
+    _listings = Dict(Str, Tuple)
+
+    def __len__(self):
+        return len(self._listings)
+
+    def list_directory(self, directory):
+        """List the contents of a single directory, using the cached
+        listing if the directory has not been modified
+
+        Parameters
+        ----------
+        directory: str
+            Path to directory
+
+        Returns
+        -------
+        files: list of str
+            Paths of files in directory
+        sub_directories: list of str
+            Paths of sub-directories in directory
+        """
+
+        mtime = os.stat(directory).st_mtime_ns
+
+        cached = self._listings.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached[1], cached[2]
+
+        files, sub_directories = list_directory(directory)
+        self._listings[directory] = (mtime, files, sub_directories)
+
+        return files, sub_directories
+
+    def scan(self, directory, recursive=False):
+        """Extract all files in a directory, optionally including
+        those in any sub-directories"""
+        return scan_directory(directory, recursive=recursive, index=self)
+
+    def clear(self):
+        """Remove all cached directory listings"""
+        self._listings = {}
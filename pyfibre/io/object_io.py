@@ -1,8 +1,7 @@
 from functools import partial
 
-import numpy as np
-
 from pyfibre.model.core.base_pyfibre_object import BasePyFibreObject
+from pyfibre.model.tools.convertors import regions_to_stack
 from pyfibre.model.objects.segments import CellSegment, FibreSegment
 from pyfibre.model.objects.fibre import Fibre
 from pyfibre.model.objects.fibre_network import FibreNetwork
@@ -84,13 +83,11 @@ def save_pyfibre_objects(pyfibre_objects, file_name, mode,
         except KeyError:
             shape = pyfibre_objects[0].region.image.shape
 
-        stack = np.zeros(
-            (len(pyfibre_objects),) + shape, dtype=np.int)
-
-        for index, pyfibre_object in enumerate(pyfibre_objects):
-            array = pyfibre_object.to_array(shape=shape)
-            stack[index] += array
-        stack = np.where(stack, 1, 0)
+        # Fill each binary within its region bounding box, rather
+        # than summing full size arrays for every object
+        stack = regions_to_stack(
+            [pyfibre_object.region for pyfibre_object in pyfibre_objects],
+            shape)
 
         save_numpy(file_name, stack)
 
@@ -0,0 +1,64 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from ..directory_index import DirectoryIndex
+
+LIST_DIRECTORY_PATH = 'pyfibre.io.directory_index.list_directory'
+
+
+class TestDirectoryIndex(TestCase):
+
+    def setUp(self):
+        self.index = DirectoryIndex()
+        self.temp_dir = TemporaryDirectory()
+        self.directory = self.temp_dir.name
+        self.sub_directory = os.path.join(self.directory, 'sub')
+        os.mkdir(self.sub_directory)
+        self.file_names = [
+            os.path.join(self.directory, 'image.tif'),
+            os.path.join(self.sub_directory, 'sub-image.tif')]
+        for file_name in self.file_names:
+            open(file_name, 'w').close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_scan(self):
+
+        self.assertListEqual(
+            [self.file_names[0]], self.index.scan(self.directory))
+        self.assertEqual(1, len(self.index))
+
+        self.assertListEqual(
+            self.file_names,
+            self.index.scan(self.directory, recursive=True))
+        self.assertEqual(2, len(self.index))
+
+        self.index.clear()
+        self.assertEqual(0, len(self.index))
+
+    def test_cached_listing(self):
+
+        self.index.scan(self.directory, recursive=True)
+
+        with mock.patch(LIST_DIRECTORY_PATH) as mock_list:
+            self.assertListEqual(
+                self.file_names,
+                self.index.scan(self.directory, recursive=True))
+            self.assertFalse(mock_list.called)
+
+    def test_modified_directory(self):
+
+        self.index.scan(self.directory, recursive=True)
+
+        new_file = os.path.join(self.sub_directory, 'new-image.tif')
+        open(new_file, 'w').close()
+        stat = os.stat(self.sub_directory)
+        os.utime(
+            self.sub_directory,
+            ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+        files = self.index.scan(self.directory, recursive=True)
+        self.assertEqual(3, len(files))
+        self.assertIn(new_file, files)
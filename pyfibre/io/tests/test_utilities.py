@@ -1,6 +1,6 @@
 from unittest import TestCase
 import os
-from tempfile import NamedTemporaryFile
+from tempfile import NamedTemporaryFile, TemporaryDirectory
 
 import networkx as nx
 import numpy as np
@@ -14,7 +14,8 @@ from .. utilities import (
     pop_dunder_recursive, numpy_to_python_recursive,
     python_to_numpy_recursive, replace_ext, save_json,
     load_json, serialize_networkx_graph, deserialize_networkx_graph,
-    check_file_name, check_string, get_file_names
+    check_file_name, check_string, get_file_names, list_directory,
+    scan_directory
 )
 
 
@@ -54,6 +55,29 @@ class TestUtilities(TestCase):
             self.directory, key='not-there')
         self.assertListEqual([], input_files)
 
+    def test_scan_directory(self):
+
+        with TemporaryDirectory() as directory:
+            sub_directory = os.path.join(directory, 'sub')
+            os.mkdir(sub_directory)
+            file_names = [
+                os.path.join(directory, 'image.tif'),
+                os.path.join(sub_directory, 'sub-image.tif')]
+            for file_name in file_names:
+                open(file_name, 'w').close()
+
+            files, sub_directories = list_directory(directory)
+            self.assertListEqual([file_names[0]], files)
+            self.assertListEqual([sub_directory], sub_directories)
+
+            self.assertListEqual(
+                [file_names[0]], scan_directory(directory))
+            self.assertListEqual(
+                file_names, scan_directory(directory, recursive=True))
+            self.assertListEqual(
+                [file_names[1]],
+                parse_file_path(directory, key='sub-', recursive=True))
+
     def test_under_recursive(self):
 
         expected = {
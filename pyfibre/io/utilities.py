@@ -2,10 +2,78 @@ import json
 import os
 
 import numpy as np
-from networkx import node_link_graph, node_link_data
 
 
-def parse_file_path(file_path, key=None):
+def list_directory(directory):
+    """List the contents of a single directory using os.scandir
+
+    Parameters
+    ----------
+    directory: str
+        Path to directory
+
+    Returns
+    -------
+    files: list of str
+        Paths of files in directory
+    sub_directories: list of str
+        Paths of sub-directories in directory. Symbolic links
+        to directories are not included
+    """
+
+    files = []
+    sub_directories = []
+
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    sub_directories.append(entry.path)
+                elif entry.is_file():
+                    files.append(entry.path)
+            except OSError:
+                continue
+
+    return files, sub_directories
+
+
+def scan_directory(directory, recursive=False, index=None):
+    """Extract all files in a directory, optionally including
+    those in any sub-directories
+
+    Parameters
+    ----------
+    directory: str
+        Path to directory
+    recursive: bool, optional
+        Whether to also scan all sub-directories
+    index: DirectoryIndex, optional
+        Cached index of directory listings to use
+
+    Returns
+    -------
+    input_files: list of str
+        Paths of files found
+    """
+
+    if index is None:
+        list_func = list_directory
+    else:
+        list_func = index.list_directory
+
+    input_files = []
+    directories = [directory]
+
+    while directories:
+        files, sub_directories = list_func(directories.pop())
+        input_files += files
+        if recursive:
+            directories += reversed(sub_directories)
+
+    return input_files
+
+
+def parse_file_path(file_path, key=None, recursive=False, index=None):
     """Parse input path in order to extract all files
 
     Parameters
@@ -14,6 +82,10 @@ def parse_file_path(file_path, key=None):
         Path to either a file or directory
     key: str, optional
         Section of file name to filter
+    recursive: bool, optional
+        Whether to include files in sub-directories
+    index: DirectoryIndex, optional
+        Cached index of directory listings to use
 
     Returns
     -------
@@ -27,9 +99,8 @@ def parse_file_path(file_path, key=None):
         input_files.append(file_path)
 
     elif os.path.isdir(file_path):
-        for file_name in os.listdir(file_path):
-            input_files.append(
-                os.path.join(file_path, file_name))
+        input_files = scan_directory(
+            file_path, recursive=recursive, index=index)
 
     if key is not None:
         input_files = [
@@ -106,6 +177,7 @@ def pop_dunder_recursive(dictionary):
 def deserialize_networkx_graph(data):
     """Transform JSON serialised data into a
     networkx Graph object"""
+    from networkx import node_link_graph
 
     data = python_to_numpy_recursive(data)
     graph = node_link_graph(data)
@@ -116,6 +188,7 @@ def deserialize_networkx_graph(data):
 def serialize_networkx_graph(graph):
     """Transform a networkx Graph object into
     a JSON serialised dictionary"""
+    from networkx import node_link_data
 
     data = node_link_data(graph)
     data = numpy_to_python_recursive(data)
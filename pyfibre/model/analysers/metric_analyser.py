@@ -39,13 +39,16 @@ class MetricAnalyser(ABC):
 
     def __init__(
             self, image=None, filename=None, networks=None,
-            segments=None, sigma=0.0001):
+            segments=None, sigma=0.0001, glcm=False,
+            structure_tensor=None):
 
         self.filename = filename
         self.image = image
         self.networks = networks
         self.segments = segments
         self.sigma = sigma
+        self.glcm = glcm
+        self.structure_tensor = structure_tensor
 
         self.local_metrics = None
         self.global_metrics = None
@@ -103,7 +106,8 @@ class MetricAnalyser(ABC):
         metric_func = partial(
             segment_metrics,
             image=self.image, image_tag=image_tag,
-            sigma=self.sigma)
+            sigma=self.sigma, glcm=self.glcm,
+            structure_tensor=self.structure_tensor)
         return self._get_metrics(
             self.segments, metric_func, tag)
 
@@ -23,25 +23,57 @@ class BaseGraphSegment(BaseGraph):
         self._iterations = 2
         self._sigma = 0.5
 
+        self._region_cache = None
+
     @property
     def shape(self):
         if self.image is not None:
             return self.image.shape
         return self._shape
 
+    def _region_parameters(self):
+        """Values that the region depends upon, other than the
+        graph and image objects themselves. These include the node
+        coordinates and edges of the graph, so that the region is
+        recalculated whenever the graph is modified in place"""
+        if self.graph.number_of_nodes():
+            node_coord = self.node_coord.tobytes()
+        else:
+            node_coord = b''
+
+        return (tuple(self.graph.nodes), node_coord,
+                tuple(self.graph.edges),
+                self.shape, self._area_threshold,
+                self._iterations, self._sigma)
+
     @property
     def region(self):
-        """Scikit-image segment"""
+        """Scikit-image segment. Calculated lazily within a window
+        around the graph, and cached until the graph, image or
+        segmentation parameters are changed"""
+        parameters = self._region_parameters()
+
+        if self._region_cache is not None:
+            graph, image, cached_parameters, region = self._region_cache
+            if (graph is self.graph and image is self.image
+                    and cached_parameters == parameters):
+                return region
+
         if self.image is None:
             regions = networks_to_regions(
                 [self.graph], shape=self.shape,
                 area_threshold=self._area_threshold,
-                iterations=self._iterations, sigma=self._sigma)
+                iterations=self._iterations, sigma=self._sigma,
+                local=True)
         else:
             regions = networks_to_regions(
                 [self.graph], image=self.image,
                 area_threshold=self._area_threshold,
-                iterations=self._iterations, sigma=self._sigma)
+                iterations=self._iterations, sigma=self._sigma,
+                local=True)
+
+        self._region_cache = (
+            self.graph, self.image, parameters, regions[0])
 
         return regions[0]
 
@@ -1,11 +1,7 @@
 from abc import abstractmethod
 
-import pandas as pd
 import numpy as np
-from skimage.measure import label, regionprops
 
-from pyfibre.model.tools.metrics import (
-    region_shape_metrics, region_texture_metrics)
 from pyfibre.utilities import NotSupportedError
 from pyfibre.model.tools.utilities import bbox_indices
 
@@ -48,6 +44,8 @@ class BaseSegment(BasePyFibreObject):
     def from_array(cls, array, intensity_image=None):
         """Deserialises numpy array to return an instance
         of the class"""
+        from skimage.measure import label, regionprops
+
         labels = label(array.astype(np.int))
         region = regionprops(
             labels, intensity_image=intensity_image)[0]
@@ -67,6 +65,10 @@ class BaseSegment(BasePyFibreObject):
     def generate_database(self, image_tag=None):
         """Generates a Pandas database with all graph and segment metrics
         for assigned image"""
+        import pandas as pd
+
+        from pyfibre.model.tools.metrics import (
+            region_shape_metrics, region_texture_metrics)
 
         if self.region is None:
             raise AttributeError(
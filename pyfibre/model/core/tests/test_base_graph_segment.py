@@ -102,6 +102,37 @@ class TestBaseGraphSegment(TestCase):
         self.assertEqual((3, 4), segment.image.shape)
         self.assertEqual((3, 4), segment.intensity_image.shape)
 
+    def test_region_cache(self):
+
+        segment = self.graph_segment.region
+        self.assertIs(segment, self.graph_segment.region)
+
+        self.graph_segment._sigma = None
+        self.assertIsNot(segment, self.graph_segment.region)
+
+        segment = self.graph_segment.region
+        self.graph_segment.image = np.ones((5, 5))
+        self.assertIsNot(segment, self.graph_segment.region)
+
+        segment = self.graph_segment.region
+        self.graph_segment.add_edge(2, 5)
+        self.assertIsNot(segment, self.graph_segment.region)
+
+        segment = self.graph_segment.region
+        self.graph_segment.graph = generate_probe_graph()
+        self.assertIsNot(segment, self.graph_segment.region)
+
+        # Modifying the graph in place without changing the number
+        # of nodes or edges also invalidates the cache
+        segment = self.graph_segment.region
+        self.graph_segment.graph.nodes[5]['xy'] = np.array([3, 3])
+        self.assertIsNot(segment, self.graph_segment.region)
+
+        segment = self.graph_segment.region
+        self.graph_segment.graph.remove_edge(4, 5)
+        self.graph_segment.add_edge(2, 5)
+        self.assertIsNot(segment, self.graph_segment.region)
+
     def test_add_node_edge(self):
 
         self.graph_segment.add_node(6)
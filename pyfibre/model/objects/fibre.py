@@ -1,4 +1,3 @@
-import pandas as pd
 import numpy as np
 
 from pyfibre.model.tools.fibre_utilities import branch_angles
@@ -68,6 +67,7 @@ class Fibre(BaseGraph):
 
     def generate_database(self, image=None):
         """Generates a Pandas database with fibre metrics"""
+        import pandas as pd
 
         database = pd.Series(dtype=object)
 
@@ -6,8 +6,6 @@ from pyfibre.io.utilities import (
     serialize_networkx_graph
 )
 from pyfibre.model.tools.analysis import angle_analysis
-from pyfibre.model.tools.metrics import (
-    network_metrics, fibre_metrics, FIBRE_METRICS)
 from pyfibre.model.tools.fibre_assigner import FibreAssigner
 from pyfibre.model.tools.fibre_utilities import simplify_network
 
@@ -79,6 +77,8 @@ class FibreNetwork(BaseGraph):
     def generate_database(self):
         """Generates a Pandas database with all graph and segment metrics
         for assigned image"""
+        from pyfibre.model.tools.metrics import (
+            network_metrics, fibre_metrics, FIBRE_METRICS)
 
         database = network_metrics(
             self.graph, self.red_graph, len(self.fibres), 'Fibre')
@@ -78,7 +78,58 @@ def fourier_transform_analysis(image, n_split=1, sigma=None):
     return angles, fourier_spec, sdi
 
 
-def tensor_analysis(tensor):
+def tensor_component_analysis(t_xx, t_xy, t_yy, out=None):
+    """
+    Calculates anisotropy, angle and energy of symmetric 2x2 tensors
+    from their independent components, using closed form expressions
+    for the eigenvalues of each tensor
+
+    Parameters
+    ----------
+    t_xx, t_xy, t_yy :  array_like of floats
+        Diagonal and off-diagonal components of each tensor. Must
+        be broadcastable to the same shape
+    out : tuple of array_like, optional
+        Arrays to store the anisotropy, angle and energy values in.
+        Must each have the broadcast shape of the tensor components
+
+    Returns
+    -------
+    tot_anis, tot_angle, tot_energy : array_like of floats
+        Anisotropy, angle and energy values of input tensor
+    """
+
+    t_xx = np.asarray(t_xx)
+    t_xy = np.asarray(t_xy)
+    t_yy = np.asarray(t_yy)
+
+    if out is None:
+        shape = np.broadcast(t_xx, t_xy, t_yy).shape
+        dtype = np.result_type(t_xx, t_xy, t_yy, np.float32)
+        out = tuple(np.empty(shape, dtype=dtype) for _ in range(3))
+    tot_anis, tot_angle, tot_energy = out
+
+    # Use angle and energy arrays as buffers for the components
+    # of the eigenvalue difference: sqrt((t_yy - t_xx)^2 + 4 t_xy^2)
+    np.subtract(t_yy, t_xx, out=tot_angle)
+    np.multiply(t_xy, 2, out=tot_energy)
+    np.hypot(tot_angle, tot_energy, out=tot_anis)
+    np.arctan2(tot_energy, tot_angle, out=tot_angle)
+    tot_angle *= 90 / np.pi
+
+    # Anisotropy is ratio of eigenvalue difference to trace
+    np.add(t_xx, t_yy, out=tot_energy)
+    indices = tot_energy != 0
+    np.divide(tot_anis, tot_energy, out=tot_anis, where=indices)
+    tot_anis[~indices] = 0
+
+    np.abs(t_xx, out=tot_energy)
+    tot_energy += np.abs(t_yy)
+
+    return tot_anis, tot_angle, tot_energy
+
+
+def tensor_analysis(tensor, out=None):
     """
     Calculates eigenvalues and eigenvectors of average tensor over
     area^2 pixels for n_samples
@@ -89,6 +140,8 @@ def tensor_analysis(tensor):
         Average tensor over area under examination. Can either
         refer to a single image or stack of images; in which case outer
         dimension must represent a different image in the stack
+    out : tuple of array_like, optional
+        Arrays to store the anisotropy, angle and energy values in
 
     Returns
     -------
@@ -99,21 +152,9 @@ def tensor_analysis(tensor):
     if tensor.ndim == 2:
         tensor = tensor.reshape((1,) + tensor.shape)
 
-    eig_val, eig_vec = np.linalg.eigh(tensor)
-
-    eig_diff = np.diff(eig_val, axis=-1).max(axis=-1)
-    eig_sum = eig_val.sum(axis=-1)
-    indicies = np.nonzero(eig_sum)
-
-    tot_anis = np.zeros(tensor.shape[:-2])
-    tot_anis[indicies] += eig_diff[indicies] / eig_sum[indicies]
-
-    tot_angle = 0.5 * np.arctan2(
-        2 * tensor[..., 1, 0],
-        (tensor[..., 1, 1] - tensor[..., 0, 0])) / np.pi * 180
-    tot_energy = np.trace(np.abs(tensor), axis1=-2, axis2=-1)
-
-    return tot_anis, tot_angle, tot_energy
+    return tensor_component_analysis(
+        tensor[..., 0, 0], tensor[..., 1, 0], tensor[..., 1, 1],
+        out=out)
 
 
 def angle_analysis(angles, weights=None, n_bin=200):
@@ -7,24 +7,80 @@ Created on: 20/10/2019
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import logging
 import numpy as np
 
 from scipy.ndimage.filters import median_filter
-from scipy.ndimage.morphology import (
-    binary_fill_holes, binary_opening)
+from scipy.ndimage.morphology import binary_opening
 
 from skimage.color import rgb2grey
 from skimage.util import pad
-from skimage.morphology import remove_small_objects
 from skimage.exposure import equalize_hist
 
-from sklearn.cluster import MiniBatchKMeans
-
 from .preprocessing import clip_intensities
+from .utilities import clean_binary
 
 logger = logging.getLogger(__name__)
 
+#: Size of square image tiles that are smoothed in parallel
+TILE_SIZE = 256
+
+
+def stratified_sample(n_values, n_samples, random_state=None):
+    """Return sorted indices of a stratified random sample, drawing
+    one index from each of n_samples equally sized strata of
+    range(n_values)"""
+
+    if n_samples is None or n_samples >= n_values:
+        return np.arange(n_values)
+
+    random_state = np.random.RandomState(random_state)
+
+    edges = (np.arange(n_samples + 1) * n_values) // n_samples
+    widths = np.diff(edges)
+
+    return edges[:-1] + (random_state.random_sample(n_samples)
+                         * widths).astype(int)
+
+
+def image_tiles(shape, tile_size=TILE_SIZE):
+    """Generate slices of square tiles covering an image"""
+
+    for row in range(0, shape[0], tile_size):
+        for col in range(0, shape[1], tile_size):
+            yield (slice(row, min(row + tile_size, shape[0])),
+                   slice(col, min(col + tile_size, shape[1])))
+
+
+def double_median_filter(image, size, separable=False):
+    """Apply a square median filter of width size to an image twice.
+    If separable, each median is approximated by consecutive row and
+    column medians, reducing the cost per pixel from size ** 2 to
+    2 * size"""
+
+    if separable:
+        sizes = [(1, size), (size, 1)] * 2
+    else:
+        sizes = [(size, size)] * 2
+
+    for filter_size in sizes:
+        image = median_filter(image, size=filter_size)
+
+    return image
+
+
+def nearest_centroid(values, centres):
+    """Assign each row of values to the index of its nearest
+    centre by Euclidean distance"""
+
+    # Squared distances without the constant |values|^2 term
+    distances = values @ (-2 * centres.T)
+    distances += (centres ** 2).sum(axis=-1)
+
+    return np.argmin(distances, axis=-1)
+
 
 class BaseKmeansFilter(ABC):
     """Performs segmentation filtering using k-means clustering
@@ -32,12 +88,25 @@ class BaseKmeansFilter(ABC):
     Adapted from CurveAlign BDcreationHE routine.
 
     Developers need to implement a cellular_classifier method
-    that processes raw Kmeans clusters"""
+    that processes raw Kmeans clusters.
+
+    Image scaling and clustering runs can be performed in parallel
+    threads by setting n_jobs. Clustering can be fitted on a stratified
+    subsample of n_samples pixels, with every pixel then assigned to
+    its nearest centroid. For large images, setting separable_median
+    approximates each median filter by row and column medians.
+
+    Once an image has been filtered, the centroids and cluster
+    classification of the lowest cost run are kept as centres and
+    label_mask, so that further pixels can be classified in the
+    same feature space using classify_pixels"""
 
     def __init__(self, n_runs=2, n_clusters=10, p_intensity=(2, 98),
                  sm_size=5, min_size=20,
                  init_size=10000, reassignment_ratio=0.99,
-                 max_no_improvement=15):
+                 max_no_improvement=15, n_jobs=1, n_samples=None,
+                 random_state=None, tile_size=TILE_SIZE,
+                 separable_median=False):
 
         self.n_runs = n_runs
         self.n_clusters = n_clusters
@@ -47,73 +116,192 @@ class BaseKmeansFilter(ABC):
         self.init_size = init_size
         self.reassignment_ratio = reassignment_ratio
         self.max_no_improvement = max_no_improvement
+        self.n_jobs = n_jobs
+        self.n_samples = n_samples
+        self.random_state = random_state
+        self.tile_size = tile_size
+        self.separable_median = separable_median
+
+        #: Centroids of the lowest cost clustering run
+        self.centres = None
+        #: Whether each of centres is assigned to cellular regions
+        self.label_mask = None
 
         self._greyscale = None
 
+    def _map(self, function, items):
+        """Return a list of function applied to each item, evaluated
+        in up to n_jobs threads"""
+
+        if self.n_jobs is not None and self.n_jobs <= 1:
+            return list(map(function, items))
+
+        with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+            return list(executor.map(function, items))
+
+    def _equalise_channel(self, channel, pad_size):
+        """Contrast stretch, pad and equalise a single image channel"""
+
+        # Mimic contrast stretching decorrstrech routine in MatLab
+        scaled = (255 * clip_intensities(
+            channel, p_intensity=self.p_intensity)).astype(int)
+
+        padded = pad(scaled, [pad_size, pad_size], 'symmetric')
+
+        return 255 * equalize_hist(padded)
+
+    def _smooth_tile(self, equalised, tile, pad_size):
+        """Return double median filtered values of a padded, equalised
+        channel within a tile of the original image. Tiles are
+        filtered with a halo of neighbouring pixels wide enough for
+        both median passes, so results are identical to filtering
+        the whole channel"""
+
+        halo = 2 * self.sm_size
+        window = tuple(
+            slice(item.start + pad_size - halo,
+                  item.stop + pad_size + halo)
+            for item in tile)
+
+        smoothed = double_median_filter(
+            equalised[window], self.sm_size,
+            separable=self.separable_median)
+
+        return smoothed[halo:-halo, halo:-halo]
+
     def _scale_image(self, image):
         """Create a scaled image with enhanced and smoothed RGB
         balance"""
 
+        image_scaled = self._smooth_image(image)
+
+        # Generate greyscale image of RGB
+        self._greyscale = rgb2grey(image_scaled.astype(np.float64))
+        self._greyscale /= self._greyscale.max()
+
+        return image_scaled
+
+    def _smooth_image(self, image, mask=None):
+        """Equalise and smooth each channel of an RGB image. If a
+        mask is provided, only tiles overlapping the mask are
+        smoothed, with the remaining pixels set to zero"""
+
         image_channels = image.shape[-1]
         image_scaled = np.zeros(image.shape, dtype=int)
         pad_size = 10 * self.sm_size
 
-        # Mimic contrast stretching decorrstrech routine in MatLab
-        for i in range(image_channels):
-            image_scaled[:, :, i] = 255 * clip_intensities(
-                image[:, :, i], p_intensity=self.p_intensity)
+        # Pad each channel and equalise
+        equalised = self._map(
+            partial(self._equalise_channel, pad_size=pad_size),
+            [image[:, :, i] for i in range(image_channels)])
 
-        # Pad each channel, equalise and smooth to remove
+        # Smooth each tile of every channel to remove
         # salt and pepper noise
-        for i in range(image_channels):
-            padded = pad(
-                image_scaled[:, :, i],
-                [pad_size, pad_size],
-                'symmetric')
-            equalised = 255 * equalize_hist(padded)
-
-            # Double median filter
-            for j in range(2):
-                equalised = median_filter(
-                    equalised, size=(self.sm_size, self.sm_size))
-
-            # Transfer original image from padded back
-            image_scaled[:, :, i] = (
-                equalised[pad_size: pad_size + image.shape[0],
-                          pad_size: pad_size + image.shape[1]])
-
-        # Generate greyscale image of RGB
-        self._greyscale = rgb2grey(image_scaled.astype(np.float64))
-        self._greyscale /= self._greyscale.max()
+        tiles = [
+            tile for tile in image_tiles(image.shape[:2], self.tile_size)
+            if mask is None or mask[tile].any()
+        ]
+        tasks = [
+            (i, tile)
+            for i in range(image_channels)
+            for tile in tiles
+        ]
+        smoothed = self._map(
+            lambda task: self._smooth_tile(
+                equalised[task[0]], task[1], pad_size),
+            tasks)
+
+        # Transfer smoothed tiles back to original image
+        for (i, tile), values in zip(tasks, smoothed):
+            image_scaled[tile + (i,)] = values
 
         return image_scaled
 
-    def _kmeans_cluster_colours(self, image):
+    def _pixel_values(self, image):
+        """Return a read-only (N * M, channels) float array of pixel
+        values that can be shared between clustering runs"""
+
+        values = np.array(
+            image.reshape((-1, image.shape[-1])), dtype=float)
+        values.setflags(write=False)
+
+        return values
+
+    def _kmeans_cluster_colours(self, image, values=None,
+                                random_state=None):
         """Cluster pixels in an RGB image by their colour using
         Batch KMeans clusterer"""
+        from sklearn.cluster import MiniBatchKMeans
 
-        image_size = image.shape[0] * image.shape[1]
         image_shape = (image.shape[0], image.shape[1])
-        image_channels = image.shape[-1]
 
-        # Perform k-means clustering on PL image
-        values = np.array(
-            image.reshape((image_size, image_channels)),
-            dtype=float)
+        if values is None:
+            values = self._pixel_values(image)
+
+        # Perform k-means clustering on PL image, fitting on a
+        # stratified sample of pixels if requested. The shared pixel
+        # buffer is only copied when a subsample is drawn
+        subsample = (
+            self.n_samples is not None
+            and self.n_samples < values.shape[0])
+        if subsample:
+            indices = stratified_sample(
+                values.shape[0], self.n_samples,
+                random_state=random_state)
+            samples = values[indices]
+        else:
+            samples = values
+
         clusterer = MiniBatchKMeans(
             n_clusters=self.n_clusters,
             init_size=self.init_size,
             reassignment_ratio=self.reassignment_ratio,
-            max_no_improvement=self.max_no_improvement)
-        clusterer.fit(values)
+            max_no_improvement=self.max_no_improvement,
+            random_state=random_state)
+        clusterer.fit(samples)
 
         # Extract cluster labels for each pixel and centroids
         # corresponding to each cluster
-        labels = clusterer.labels_.reshape(image_shape)
         centres = clusterer.cluster_centers_
+        if subsample:
+            labels = nearest_centroid(values, centres)
+        else:
+            labels = clusterer.labels_
+        labels = labels.reshape(image_shape)
 
         return labels, centres
 
+    def _kmeans_runs(self, image):
+        """Return label images and centroids for each of n_runs
+        k-means clustering runs, performed in up to n_jobs threads
+        on a shared pixel buffer"""
+
+        values = self._pixel_values(image)
+
+        # Draw a separate seed for each run, so that restarts
+        # remain independent but reproducible
+        seeds = np.random.RandomState(self.random_state).randint(
+            np.iinfo(np.int32).max, size=self.n_runs)
+
+        def cluster(seed):
+            return self._kmeans_cluster_colours(
+                image, values=values, random_state=seed)
+
+        return self._map(cluster, seeds)
+
+    def _classified_runs(self, image, **kwargs):
+        """Generate the label image, centroids, cluster
+        classification and cost of each clustering run"""
+
+        for label_image, centres in self._kmeans_runs(image):
+
+            label_mask, cost = self.cellular_classifier(
+                label_image, centres,
+                **kwargs
+            )
+
+            yield label_image, centres, label_mask, cost
+
     def _cluster_generator(self, image, **kwargs):
         """Identify pixel clusters in RGB image that correspond
         to cellular regions
@@ -131,21 +319,12 @@ class BaseKmeansFilter(ABC):
             Objective function that determines cost of separation
         """
 
-        for run in range(self.n_runs):
-
-            label_image, centres = self._kmeans_cluster_colours(
-                image)
+        for label_image, _, label_mask, cost in self._classified_runs(
+                image, **kwargs):
 
-            label_mask, cost = self.cellular_classifier(
-                label_image, centres,
-                **kwargs
-            )
-
-            # Create binary stack corresponding to each cluster region
-            binary_mask = np.zeros(label_image.shape, dtype=bool)
-            for label in np.argwhere(label_mask):
-                indices = np.where(label_image == label)
-                binary_mask[indices] = True
+            # Create binary mask of all selected cluster regions
+            # using label_mask as a lookup table
+            binary_mask = np.asarray(label_mask, dtype=bool)[label_image]
 
             yield binary_mask, cost
 
@@ -164,20 +343,50 @@ class BaseKmeansFilter(ABC):
             Binary array representing mask for each pixel
         """
 
-        tot_masks = []
-        cost_func = []
-
-        # Perform multiple runs of K-means clustering algorithm
-        for mask, cost in self._cluster_generator(image, **kwargs):
-            tot_masks.append(mask)
-            cost_func.append(cost)
+        runs = list(self._classified_runs(image, **kwargs))
 
         # Identify segmentation with lowest cost (best separation)
-        min_cost = np.argmin(cost_func)
-        binary_mask = tot_masks[min_cost]
+        min_cost = np.argmin([run[-1] for run in runs])
+        label_image, centres, label_mask, _ = runs[min_cost]
+
+        self.centres = centres
+        self.label_mask = np.asarray(label_mask, dtype=bool)
+
+        # Create binary mask of all selected cluster regions
+        binary_mask = self.label_mask[label_image]
 
         return binary_mask
 
+    def classify_pixels(self, image, mask):
+        """Assign pixels of an RGB image within mask to cellular
+        regions, using the centroids and cluster classification of
+        the last filtered image. Pixels are scaled into the same
+        feature space as the filtered image, although only image
+        tiles overlapping mask are smoothed.
+
+        Parameters
+        ----------
+        image: array-like, shape=(N, M, 3)
+            RGB image containing pixels to classify
+        mask: array-like of bool, shape=(N, M)
+            Pixels of image to classify
+
+        Returns
+        -------
+        cellular: array-like of bool, shape=(K,)
+            Whether each of the K pixels in mask is cellular
+        """
+
+        if self.centres is None:
+            raise ValueError(
+                'An image must be filtered before pixels are classified')
+
+        image_scaled = self._smooth_image(image, mask=mask)
+        values = image_scaled[mask].astype(float)
+        labels = nearest_centroid(values, self.centres)
+
+        return self.label_mask[labels]
+
     def filter_image(self, image, **kwargs):
         """Performs BD filtering on image"""
 
@@ -189,10 +398,9 @@ class BaseKmeansFilter(ABC):
         # Dilate binary image to smooth regions and remove
         # small holes / objects
         binary_mask = binary_opening(binary_mask, iterations=2)
-        binary_mask = binary_fill_holes(binary_mask)
-        for _ in range(2):
-            binary_mask = remove_small_objects(
-                ~binary_mask, min_size=self.min_size)
+        binary_mask = clean_binary(
+            binary_mask, min_size=self.min_size,
+            hole_size=self.min_size, fill_holes=True)
 
         self._greyscale = None
 
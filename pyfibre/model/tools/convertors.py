@@ -11,17 +11,12 @@ Last Modified: 26/11/2019
 import logging
 import numpy as np
 
+from scipy.ndimage import find_objects, label
 from scipy.ndimage.filters import gaussian_filter
-from scipy.ndimage.morphology import binary_dilation
 
-from skimage import measure
-from skimage.morphology import remove_small_holes
-from skimage.measure import regionprops
+from pyfibre.model.tools.fibre_utilities import get_node_coord_array
 
-from pyfibre.model.tools.figures import draw_network
-from pyfibre.utilities import label_set
-
-from .utilities import region_check, bbox_indices
+from .utilities import region_check, distance_dilation, clean_binary
 
 logger = logging.getLogger(__name__)
 
@@ -37,17 +32,45 @@ def sort_by_area(segments):
     return sorted_segments
 
 
+def label_image_to_stack(label_image):
+    """Create a segment stack from a label image, containing a
+    binary for each non-zero label in ascending order. Each binary
+    is only filled within the bounding box of its label, so that
+    the label image is only scanned once"""
+    objects = [
+        (index, slices)
+        for index, slices in enumerate(find_objects(label_image), 1)
+        if slices is not None
+    ]
+
+    stack = np.zeros((len(objects),) + label_image.shape, dtype=int)
+
+    for index, (label_index, slices) in enumerate(objects):
+        stack[(index,) + slices] = label_image[slices] == label_index
+
+    return stack
+
+
+def regions_to_label_image(regions, shape):
+    """Convert a list of scikit-image segments to a single int32
+    label image, where segment k is labelled k + 1. Overlapping
+    segments are labelled by the last segment in the list"""
+    label_image = np.zeros(shape, dtype=np.int32)
+
+    for index, region in enumerate(regions, 1):
+        window = label_image[region.slice]
+        window[region.image] = index
+
+    return label_image
+
+
 def binary_to_stack(binary):
     """Create a segment stack from a global binary"""
-    label_image = measure.label(binary.astype(int))
-    labels = label_set(label_image)
-
-    binary_stack = np.zeros((labels.size,) + binary.shape, dtype=int)
+    from skimage import measure
 
-    for index, label in enumerate(labels):
-        binary_stack[index] += np.where(label_image == label, 1, 0)
+    label_image = measure.label(binary.astype(int))
 
-    return np.where(binary_stack, 1, 0)
+    return label_image_to_stack(label_image)
 
 
 def stack_to_binary(stack):
@@ -60,34 +83,53 @@ def stack_to_binary(stack):
 
 
 def regions_to_stack(regions, shape):
-    """Convert a list of scikit-image segments to a single binary mask"""
+    """Convert a list of scikit-image segments to a stack of
+    binary masks"""
     stack = np.zeros(
         (len(regions),) + shape, dtype=int)
 
     for index, region in enumerate(regions):
-        binary_image = np.zeros(shape, dtype=int)
-        indices = bbox_indices(region)
+        window = stack[(index,) + region.slice]
+        window[region.image] = 1
 
-        binary_image[indices] += region.image
-        stack[index] += binary_image
+    return stack
 
-    stack = np.where(stack, 1, 0)
 
-    return stack
+def stack_to_label_image(stack):
+    """Label connected regions in every binary of a stack at once,
+    returning a (len(stack),) + shape label image with unique labels
+    across all binaries"""
+    # Use full connectivity within each binary, but none between
+    # neighbouring binaries in the stack
+    structure = np.zeros((3, 3, 3), dtype=int)
+    structure[1] = 1
+
+    label_stack, _ = label(np.asarray(stack) != 0, structure=structure)
+
+    return label_stack
 
 
 def stack_to_regions(stack, intensity_image=None, min_size=0, min_frac=0):
     """Convert a binary mask image to a set of scikit-image
     regionprops objects"""
+    from skimage.measure import regionprops
+
+    label_stack = stack_to_label_image(stack)
+
+    if len(label_stack) and (label_stack != 0).sum(axis=0).max() <= 1:
+        # Binaries do not overlap, so all regions can be
+        # extracted from a single label image
+        label_images = [label_stack.max(axis=0)]
+    else:
+        label_images = label_stack
 
     regions = []
 
-    for binary in stack:
-        labels = measure.label(binary.astype(np.int))
+    for label_image in label_images:
         regions += [
             region
             for region in regionprops(
-                labels, intensity_image=intensity_image)
+                label_image, intensity_image=intensity_image)
             if region_check(region, min_size, min_frac)
         ]
 
@@ -101,10 +143,8 @@ def regions_to_binary(regions, shape):
     binary_image = np.zeros(shape, dtype=int)
 
     for region in regions:
-        indices = bbox_indices(region)
-        binary_image[indices] += region.image
-
-    binary_image = np.where(binary_image, 1, 0)
+        window = binary_image[region.slice]
+        window[region.image] = 1
 
     return binary_image
 
@@ -113,6 +153,7 @@ def binary_to_regions(binary, intensity_image=None,
                       min_size=0, min_frac=0.0):
     """Convert a binary mask image to a set of scikit-image
     segment objects"""
+    from skimage import measure
 
     if binary.ndim > 2:
         binary = binary.sum(axis=0)
@@ -121,7 +162,7 @@ def binary_to_regions(binary, intensity_image=None,
 
     regions = [
         region
-        for region in regionprops(
+        for region in measure.regionprops(
             labels, intensity_image=intensity_image)
         if region_check(region, min_size, min_frac)
     ]
@@ -131,20 +172,53 @@ def binary_to_regions(binary, intensity_image=None,
     return regions
 
 
-def networks_to_binary(networks, shape, area_threshold=200,
-                       iterations=9, sigma=None):
-    """Return a global binary representing areas of an image
-     containing networks"""
+def network_window(networks, shape, area_threshold=200,
+                   iterations=9, sigma=None):
+    """Return slices of a window around a list of networks, outside
+    of which networks_to_binary is guaranteed to return background.
+    The window is padded so that background connected to any of its
+    edges is never filled in as a small hole"""
 
-    binary = np.zeros(shape, dtype=int)
+    node_coord = np.concatenate([
+        get_node_coord_array(network) for network in networks
+    ]).astype(int)
+
+    # Dilation extends the skeleton by up to iterations pixels
+    # along each axis, and Gaussian smoothing by the kernel radius
+    extent = max(iterations, 0)
+    if sigma is not None:
+        extent += int(4 * sigma + 0.5)
+
+    lower = np.maximum(node_coord.min(axis=0) - extent, 0)
+    upper = np.minimum(node_coord.max(axis=0) + extent + 1, shape)
+
+    # Ensure background strips along each edge of the window are
+    # larger than area_threshold
+    pad = area_threshold // (upper - lower)[::-1] + 1
+    lower = np.maximum(lower - pad, 0)
+    upper = np.minimum(upper + pad, shape)
+
+    return tuple(
+        slice(int(start), int(stop))
+        for start, stop in zip(lower, upper))
+
+
+def _window_binary(networks, window, area_threshold=200,
+                   iterations=9, sigma=None):
+    """Return a binary representing areas of an image containing
+    networks, covering only the region of the image within window"""
+    from pyfibre.model.tools.figures import network_line_coords
+
+    binary = np.zeros(
+        tuple(item.stop - item.start for item in window), dtype=int)
 
     # Create skeleton image based on connected components in network
-    for index, network in enumerate(networks):
-        draw_network(network, binary, index=1)
+    rows, cols = network_line_coords(networks)
+    binary[rows - window[0].start, cols - window[1].start] = 1
 
     # Dilate skeleton image
     if iterations > 0:
-        binary = binary_dilation(binary, iterations=iterations)
+        binary = distance_dilation(binary, iterations=iterations)
 
     # Smooth dilated image
     if sigma is not None:
@@ -155,16 +229,56 @@ def networks_to_binary(networks, shape, area_threshold=200,
         binary = np.where(smoothed, 1, 0)
 
     # Remove smooth holes with area less than threshold
-    binary = remove_small_holes(
-        binary.astype(bool), area_threshold=area_threshold)
+    binary = clean_binary(binary, hole_size=area_threshold)
 
     return binary.astype(int)
 
 
+def networks_to_binary(networks, shape, area_threshold=200,
+                       iterations=9, sigma=None):
+    """Return a global binary representing areas of an image
+    containing networks"""
+
+    window = tuple(slice(0, size) for size in shape)
+
+    return _window_binary(
+        networks, window, area_threshold=area_threshold,
+        iterations=iterations, sigma=sigma)
+
+
+def networks_to_local_binary(networks, shape, area_threshold=200,
+                             iterations=9, sigma=None):
+    """Return a binary representing areas of an image containing
+    networks, processed only within a window around the networks.
+    Outside of this window, networks_to_binary would return
+    background
+
+    Returns
+    -------
+    binary: array-like of int
+        Binary covering the region of the image within window
+    window: tuple of slice
+        Position of binary in an image with shape
+    """
+
+    window = network_window(
+        networks, shape, area_threshold=area_threshold,
+        iterations=iterations, sigma=sigma)
+
+    binary = _window_binary(
+        networks, window, area_threshold=area_threshold,
+        iterations=iterations, sigma=sigma)
+
+    return binary, window
+
+
 def networks_to_regions(networks, image=None, shape=None,
                         area_threshold=200, iterations=9,
-                        sigma=None):
-    """Transform fibre networks into a set of scikit-image segments"""
+                        sigma=None, local=False):
+    """Transform fibre networks into a set of scikit-image segments.
+    If local is True, the networks are only labelled within a window
+    around them, although regions are still positioned within the
+    full image"""
 
     # If no intensity image is provided, make sure binary
     # shape is provided
@@ -173,13 +287,24 @@ def networks_to_regions(networks, image=None, shape=None,
     else:
         shape = image.shape
 
-    binary = networks_to_binary(networks, shape,
-                                area_threshold=area_threshold,
-                                iterations=iterations,
-                                sigma=sigma)
+    if not local:
+        binary = networks_to_binary(networks, shape,
+                                    area_threshold=area_threshold,
+                                    iterations=iterations,
+                                    sigma=sigma)
+
+        return binary_to_regions(binary, intensity_image=image)
 
-    regions = binary_to_regions(binary,
-                                intensity_image=image)
+    from pyfibre.model.tools.regions import WindowRegionProperties
+
+    binary, window = networks_to_local_binary(
+        networks, shape, area_threshold=area_threshold,
+        iterations=iterations, sigma=sigma)
+
+    regions = [
+        WindowRegionProperties(region, window, intensity_image=image)
+        for region in binary_to_regions(binary)
+    ]
 
     return regions
 
@@ -206,9 +331,6 @@ def binary_to_segments(binary, segment_klass,
 def segments_to_binary(segments, shape):
     """Transform list of BaseSegment instances into a binary array"""
 
-    stack = [
-        segment.to_array(shape=shape) for segment in segments
-    ]
-    binary = stack_to_binary(stack)
+    regions = [segment.region for segment in segments]
 
-    return binary
+    return regions_to_binary(regions, shape)
@@ -9,18 +9,62 @@ Last Modified: 18/02/2019
 """
 
 from collections import defaultdict
+from functools import lru_cache
 
 import numpy as np
 
+from scipy.ndimage import find_objects
 from skimage.feature.texture import check_nD
 
+#: Default number of grey levels used to quantise images for GLCM
+GLCM_LEVELS = 256
+
+#: Default pixel pair distances used to build GLCMs
+GLCM_DISTANCES = (1, 2)
+
+#: Default pixel pair angles used to build GLCMs
+GLCM_ANGLES = (0, np.pi/4, np.pi/2, np.pi*3/4)
+
+
+@lru_cache(maxsize=8)
+def glcm_weights(num_level):
+    """Return a dictionary of read-only (num_level, num_level) weight
+    tables used to calculate GLCM properties. Tables are cached so that
+    they are shared between every GLCM with the same number of levels"""
+
+    i, j = np.ogrid[: num_level, : num_level]
+    i = np.broadcast_to(i, (num_level, num_level)).astype(float)
+    j = np.broadcast_to(j, (num_level, num_level)).astype(float)
+
+    # Create weights for each property
+    diff = i - j
+    square = diff ** 2
+    absolute = np.abs(diff)
+
+    weights = {
+        'i': i, 'j': j,
+        'i2': i ** 2, 'j2': j ** 2,
+        'ij': i * j,
+        'square': square,
+        'absolute': absolute,
+        'inv_square': 1. / (1. + square),
+        'inv_absolute': 1. / (1. + absolute)
+    }
+
+    for table in weights.values():
+        table.setflags(write=False)
+
+    return weights
+
 
 def calculate_metric(P, weights):
+    """Sum the product of GLCM P and weights over the
+    first two (grey level) axes"""
 
-    results = np.apply_over_axes(
-        np.sum, (P * weights), axes=(0, 1))[0, 0]
+    if weights.ndim == 2:
+        return np.tensordot(weights, P, axes=([0, 1], [0, 1]))
 
-    return results
+    return np.sum(P * weights, axis=(0, 1))
 
 
 def glcm_product_props(P):
@@ -36,8 +80,8 @@ def glcm_log_props(P):
     """Calculate properties with weights involving
     logarithmic terms"""
 
-    nat_log = np.log(P)
-    nat_log[P < 1e-15] = 0
+    nonzero = P >= 1e-15
+    nat_log = np.log(np.where(nonzero, P, 1))
     entropy = calculate_metric(P, -nat_log)
 
     return entropy
@@ -47,59 +91,63 @@ def glcm_difference_props(p_matrix):
     """Calculate properties with weights involving
     difference terms"""
 
-    num_level = p_matrix.shape[0]
-    i, j = np.ogrid[: num_level, : num_level]
-
-    # Create weights for specified property
-    diff = i - j
-    square = (diff ** 2).reshape((num_level, num_level, 1, 1))
-    absolute = (np.abs(diff)).reshape((num_level, num_level, 1, 1))
+    weights = glcm_weights(p_matrix.shape[0])
 
-    contrast = calculate_metric(p_matrix, square)
-    dissimilarity = calculate_metric(p_matrix, absolute)
-    homogeneity = calculate_metric(p_matrix, 1. / (1. + square))
-    similarity = calculate_metric(p_matrix, 1. / (1. + absolute))
+    contrast = calculate_metric(p_matrix, weights['square'])
+    dissimilarity = calculate_metric(p_matrix, weights['absolute'])
+    homogeneity = calculate_metric(p_matrix, weights['inv_square'])
+    similarity = calculate_metric(p_matrix, weights['inv_absolute'])
 
     return contrast, dissimilarity, homogeneity, similarity
 
 
 def glcm_props(p_matrix):
-    # Calculate properties related to correlation
+    """Calculate properties related to correlation, returning the
+    mean and standard deviation of each grey level axis, as well as
+    their covariance"""
 
-    num_level = p_matrix.shape[0]
+    weights = glcm_weights(p_matrix.shape[0])
 
-    i = np.arange(num_level).reshape((num_level, 1, 1, 1))
-    j = np.arange(num_level).reshape((1, num_level, 1, 1))
+    total = p_matrix.sum(axis=(0, 1))
+    sum_i = calculate_metric(p_matrix, weights['i'])
+    sum_j = calculate_metric(p_matrix, weights['j'])
 
-    mean_i = calculate_metric(p_matrix, i * p_matrix)
-    mean_j = calculate_metric(p_matrix, j * p_matrix)
+    mean_i = calculate_metric(p_matrix ** 2, weights['i'])
+    mean_j = calculate_metric(p_matrix ** 2, weights['j'])
 
-    diff_i = i - mean_i
-    diff_j = j - mean_j
+    # Expand central moments in terms of raw moments so that no
+    # (num_level, num_level, ...) difference arrays are created
+    var_i = (calculate_metric(p_matrix, weights['i2'])
+             - 2 * mean_i * sum_i + mean_i ** 2 * total)
+    var_j = (calculate_metric(p_matrix, weights['j2'])
+             - 2 * mean_j * sum_j + mean_j ** 2 * total)
 
-    std_i = np.sqrt(calculate_metric(p_matrix, diff_i ** 2))
-    std_j = np.sqrt(calculate_metric(p_matrix, diff_j ** 2))
+    std_i = np.sqrt(np.maximum(var_i, 0))
+    std_j = np.sqrt(np.maximum(var_j, 0))
 
-    return mean_i, mean_j, diff_i, diff_j, std_i, std_j
+    covariance = (calculate_metric(p_matrix, weights['ij'])
+                  - mean_j * sum_i - mean_i * sum_j
+                  + mean_i * mean_j * total)
 
+    return mean_i, mean_j, std_i, std_j, covariance, total
 
-def greycoprops_edit(P):
-    """Edited version of the scikit-image greycoprops function,
-    including additional properties"""
 
-    check_nD(P, 4, 'P')
+def glcm_metrics(P):
+    """Calculate all GLCM properties for an array of normalised
+    grey level co-occurrence matrices.
 
-    (num_level, num_level2, num_dist, num_angle) = P.shape
-    if num_level != num_level2:
-        raise ValueError('num_level and num_level2 must be equal.')
-    if num_dist <= 0:
-        raise ValueError('num_dist must be positive.')
-    if num_angle <= 0:
-        raise ValueError('num_angle must be positive.')
+    Parameters
+    ----------
+    P: array_like, shape=(num_level, num_level, ...)
+        GLCMs, where the first two axes represent grey levels
 
-    metrics = defaultdict(np.ndarray)
+    Returns
+    -------
+    metrics: dict
+        Properties of each GLCM, with shape P.shape[2:]
+    """
 
-    # Compute property for each GLCM
+    metrics = defaultdict(np.ndarray)
 
     # Compute sum of all squared probabilities
     metrics['ASM'], metrics['energy'] = glcm_product_props(P)
@@ -112,28 +160,178 @@ def greycoprops_edit(P):
      metrics['homogeneity'], metrics['similarity']) = glcm_difference_props(P)
 
     # Calculate properties related to correlation
-    i = np.arange(num_level).reshape((num_level, 1, 1, 1))
-    j = np.arange(num_level).reshape((1, num_level, 1, 1))
-
-    mean_i, mean_j, diff_i, diff_j, std_i, std_j = glcm_props(P)
+    (mean_i, mean_j, std_i, std_j,
+     covariance, total) = glcm_props(P)
 
-    metrics['autocorrelation'] = calculate_metric(P, i * j)
+    metrics['autocorrelation'] = calculate_metric(
+        P, glcm_weights(P.shape[0])['ij'])
     metrics['mean'] = 0.5 * (mean_i + mean_j)
-    metrics['covariance'] = calculate_metric(P, diff_i * diff_j)
-    metrics['clustering'] = calculate_metric(P, i + j - diff_i - diff_j)
+    metrics['covariance'] = covariance
+    metrics['clustering'] = (mean_i + mean_j) * total
 
-    # Calculate correlation
-    correlation = np.zeros((num_dist, num_angle), dtype=np.float64)
+    # Calculate correlation, handling the special case of standard
+    # deviations near zero
     mask_0 = std_i < 1e-15
-    mask_1 = ~mask_0
-
-    # handle the standard case
-    correlation[mask_1] = (
-        metrics['covariance'][mask_1] / (std_i[mask_1] * std_j[mask_1]))
-
-    # handle the special case of standard deviations near zero
-    correlation[mask_0] = 1
+    correlation = np.ones(std_i.shape, dtype=np.float64)
+    correlation[~mask_0] = (
+        covariance[~mask_0] / (std_i[~mask_0] * std_j[~mask_0]))
 
     metrics['correlation'] = correlation
 
     return metrics
+
+
+def greycoprops_edit(P):
+    """Edited version of the scikit-image greycoprops function,
+    including additional properties"""
+
+    check_nD(P, 4, 'P')
+
+    (num_level, num_level2, num_dist, num_angle) = P.shape
+    if num_level != num_level2:
+        raise ValueError('num_level and num_level2 must be equal.')
+    if num_dist <= 0:
+        raise ValueError('num_dist must be positive.')
+    if num_angle <= 0:
+        raise ValueError('num_angle must be positive.')
+
+    return glcm_metrics(P)
+
+
+def quantise_image(image, levels=GLCM_LEVELS):
+    """Quantise a normalised image with intensities between 0 and 1
+    into integer grey levels between 0 and levels - 1"""
+
+    quantised = np.asarray(image, dtype=float) * (levels - 1E-3)
+    np.clip(quantised, 0, levels - 1, out=quantised)
+
+    return quantised.astype(np.intp)
+
+
+def glcm_offsets(distances=GLCM_DISTANCES, angles=GLCM_ANGLES):
+    """Return (row, column) pixel offsets for each distance and
+    angle, following the scikit-image greycomatrix convention"""
+
+    return [
+        [(int(round(np.sin(angle) * distance)),
+          int(round(np.cos(angle) * distance)))
+         for angle in angles]
+        for distance in distances
+    ]
+
+
+def _label_pair_counts(label_image, quantised, n_labels,
+                       offset, levels):
+    """Count co-occurring grey levels of pixel pairs separated by
+    offset for every label in label_image in a single pass. Pairs
+    are only counted when both pixels share the same label and have
+    a non-zero grey level"""
+
+    d_row, d_col = offset
+    n_row, n_col = label_image.shape
+
+    src = (slice(max(0, -d_row), n_row - max(0, d_row)),
+           slice(max(0, -d_col), n_col - max(0, d_col)))
+    dst = (slice(src[0].start + d_row, src[0].stop + d_row),
+           slice(src[1].start + d_col, src[1].stop + d_col))
+
+    labels = label_image[src]
+    values_i = quantised[src]
+    values_j = quantised[dst]
+
+    mask = labels == label_image[dst]
+    mask &= labels > 0
+    mask &= values_i > 0
+    mask &= values_j > 0
+
+    index = (labels[mask] - 1) * levels
+    index += values_i[mask]
+    index *= levels
+    index += values_j[mask]
+
+    counts = np.bincount(index, minlength=n_labels * levels ** 2)
+
+    return counts.reshape((n_labels, levels, levels)).astype(float)
+
+
+def label_greycoprops(label_image, image, n_labels=None, bboxes=None,
+                      distances=GLCM_DISTANCES, angles=GLCM_ANGLES,
+                      levels=GLCM_LEVELS, symmetric=True):
+    """Calculate GLCM properties for every labelled segment in an
+    image at once, using the same conventions as calling
+    greycoprops_edit on a normalised, symmetric scikit-image
+    greycomatrix of each segment bounding box (with pixels outside
+    the segment and grey level 0 excluded).
+
+    Parameters
+    ----------
+    label_image: array_like of int, shape=(N, M)
+        Labelled segments, with background represented by 0. Labels
+        are expected to run from 1 to n_labels
+    image: array_like of float, shape=(N, M)
+        Intensity image, normalised between 0 and 1
+    n_labels: int, optional
+        Number of labels in label_image. Calculated if not provided
+    bboxes: array_like of int, shape=(n_labels, 4), optional
+        Bounding box (min_row, min_col, max_row, max_col) of each
+        label, used to normalise each GLCM. Calculated if not
+        provided
+    distances: list of int, optional
+        Pixel pair distance offsets
+    angles: list of float, optional
+        Pixel pair angles in radians
+    levels: int, optional
+        Number of grey levels to quantise image into
+    symmetric: bool, optional
+        Whether to include pixel pairs in both directions
+
+    Returns
+    -------
+    metrics: dict
+        GLCM properties, each an array with shape
+        (n_labels, len(distances), len(angles))
+    """
+
+    label_image = np.asarray(label_image, dtype=np.intp)
+    if n_labels is None:
+        n_labels = int(label_image.max())
+
+    if bboxes is None:
+        bboxes = np.zeros((n_labels, 4), dtype=int)
+        for index, slices in enumerate(
+                find_objects(label_image, max_label=n_labels)):
+            if slices is not None:
+                bboxes[index] = [slices[0].start, slices[1].start,
+                                 slices[0].stop, slices[1].stop]
+    bboxes = np.asarray(bboxes)
+    heights = bboxes[:, 2] - bboxes[:, 0]
+    widths = bboxes[:, 3] - bboxes[:, 1]
+
+    quantised = quantise_image(image, levels)
+    offsets = glcm_offsets(distances, angles)
+
+    metrics = defaultdict(
+        lambda: np.zeros((n_labels, len(distances), len(angles))))
+
+    for d_index, row in enumerate(offsets):
+        for a_index, offset in enumerate(row):
+
+            counts = _label_pair_counts(
+                label_image, quantised, n_labels, offset, levels)
+            if symmetric:
+                counts += counts.transpose((0, 2, 1))
+
+            # Normalise by all pixel pairs in each bounding box
+            totals = (
+                np.maximum(heights - abs(offset[0]), 0)
+                * np.maximum(widths - abs(offset[1]), 0))
+            if symmetric:
+                totals *= 2
+            totals = np.where(totals == 0, 1, totals)
+            counts /= totals.reshape((n_labels, 1, 1))
+
+            glcm_values = glcm_metrics(counts.transpose((1, 2, 0)))
+            for key, value in glcm_values.items():
+                metrics[key][:, d_index, a_index] = value
+
+    return dict(metrics)
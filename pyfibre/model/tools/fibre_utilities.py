@@ -2,8 +2,6 @@ import numpy as np
 import networkx as nx
 from scipy.spatial.distance import cdist
 
-from skimage.morphology import local_maxima
-
 
 def get_node_coord_array(graph):
     """Return a numpy array containing xy attributes of all nodes
@@ -146,6 +144,7 @@ def reduce_coord(coord, weights=None, thresh=1):
 def new_branches(image, coord, ring_filter, max_thresh=0.2):
     """Find local maxima in image within max_thresh of coord,
     excluding pixels in ring filter"""
+    from skimage.morphology import local_maxima
 
     filtered = image * ring_filter
     branch_coord = np.argwhere(
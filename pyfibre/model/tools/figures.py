@@ -15,9 +15,12 @@ from skimage.transform import rotate
 from skimage.color import label2rgb, grey2rgb, rgb2hsv, hsv2rgb
 
 from pyfibre.model.tools.fibre_utilities import get_node_coord_array
-from pyfibre.model.tools.filters import form_structure_tensor
-from pyfibre.model.tools.utilities import bbox_indices
-from pyfibre.model.tools.analysis import tensor_analysis
+from pyfibre.model.tools.filters import structure_tensor_components
+from pyfibre.model.tools.analysis import tensor_component_analysis
+
+#: Gaussian smoothing standard deviation of structure tensors
+#: used in tensor images
+TENSOR_IMAGE_SIGMA = 1.0
 
 
 BASE_COLOURS = {
@@ -86,8 +89,10 @@ def create_angle_reference(size, min_n=50, max_n=120):
     image_cos = np.cos(4 * np.pi * image_radius / size)
     image_rings = image_sine * image_cos
 
-    j_tensor = form_structure_tensor(image_rings, sigma=1.0)
-    pix_j_anis, pix_j_angle, pix_j_energy = tensor_analysis(j_tensor)
+    j_tensor = structure_tensor_components(
+        image_rings, sigma=TENSOR_IMAGE_SIGMA)
+    pix_j_anis, pix_j_angle, pix_j_energy = tensor_component_analysis(
+        *j_tensor)
 
     pix_j_angle = rotate(pix_j_angle, 90)[: size // 2]
     pix_j_anis = pix_j_anis[: size // 2]
@@ -97,13 +102,29 @@ def create_angle_reference(size, min_n=50, max_n=120):
     return pix_j_angle, pix_j_anis, pix_j_energy
 
 
-def create_tensor_image(image, min_N=50):
+def create_tensor_image(image, min_N=50, structure_tensor=None):
+    """Create a HSB image representing the local structure tensor
+    of each pixel in image
+
+    Parameters
+    ----------
+    image:  array_like (float); shape=(n_x, n_y)
+        Image under analysis
+    min_N: int, optional
+        Minimum size of angle reference to overlay on image
+    structure_tensor: array_like (float); shape=(3, n_x, n_y), optional
+        Pre-calculated structure tensor components of image, as
+        returned by structure_tensor_components
+    """
 
-    # Form nematic and structure tensors for each pixel
-    j_tensor = form_structure_tensor(image, sigma=1.0)
+    # Form structure tensors for each pixel
+    if structure_tensor is None:
+        structure_tensor = structure_tensor_components(
+            image, sigma=TENSOR_IMAGE_SIGMA)
 
     # Perform anisotropy analysis on each pixel
-    pix_j_anis, pix_j_angle, pix_j_energy = tensor_analysis(j_tensor)
+    pix_j_anis, pix_j_angle, pix_j_energy = tensor_component_analysis(
+        *structure_tensor)
 
     hue = (pix_j_angle + 90) / 180
     saturation = pix_j_anis / pix_j_anis.max()
@@ -140,14 +161,12 @@ def create_region_image(image, regions):
     """
 
     image /= image.max()
-    label_image = np.zeros(image.shape, dtype=int)
-    label = 1
-
-    for region in regions:
-        indices = bbox_indices(region)
+    label_image = np.zeros(image.shape, dtype=np.int32)
 
-        label_image[indices] += region.image * label
-        label += 1
+    # Paint each region only within its bounding box
+    for label, region in enumerate(regions, 1):
+        window = label_image[region.slice]
+        window[region.image] = label
 
     image_label_overlay = label2rgb(
         label_image, image=image, bg_label=0,
@@ -190,15 +209,60 @@ def create_network_image(image, networks, c_mode=0):
     return rgb_image
 
 
-def draw_network(network, label_image, index=1):
+def network_line_coords(networks):
+    """Return the row and column indices of every node and edge
+    pixel in a list of networks. All edges are rasterised at once,
+    giving the same pixels as calling skimage.draw.line for each
+    edge in turn"""
+
+    starts, ends, nodes = [], [], []
+    for network in networks:
+        node_index = {node: index for index, node in enumerate(network)}
+        node_coord = get_node_coord_array(network).astype(int)
+        edges = np.array(
+            [[node_index[node] for node in edge]
+             for edge in network.edges], dtype=int).reshape(-1, 2)
+
+        nodes.append(node_coord)
+        starts.append(node_coord[edges[:, 1]])
+        ends.append(node_coord[edges[:, 0]])
 
-    nodes_coord = get_node_coord_array(network)
-    label_image[nodes_coord[:, 0], nodes_coord[:, 1]] = index
+    if not nodes:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
 
-    for edge in list(network.edges):
-        start = list(network.nodes[edge[1]]['xy'])
-        end = list(network.nodes[edge[0]]['xy'])
-        line = draw.line(*(start + end))
-        label_image[line] = index
+    nodes = np.concatenate(nodes)
+    starts = np.concatenate(starts)
+    delta = np.concatenate(ends) - starts
+
+    # Each edge is sampled once along its major axis, with minor
+    # axis offsets rounded half away from the start point
+    length = np.abs(delta).max(axis=1)
+    repeats = length + 1
+    edge_index = np.repeat(np.arange(length.size), repeats)
+    steps = np.arange(repeats.sum()) - np.repeat(
+        np.cumsum(repeats) - repeats, repeats)
+
+    length = np.maximum(length, 1)[edge_index, None]
+    delta = delta[edge_index]
+    offsets = (
+        (2 * np.abs(delta) * steps[:, None] + length) // (2 * length)
+    )
+    coords = starts[edge_index] + np.sign(delta) * offsets
+
+    return (np.concatenate([nodes[:, 0], coords[:, 0]]),
+            np.concatenate([nodes[:, 1], coords[:, 1]]))
+
+
+def draw_networks(networks, label_image, index=1):
+    """Draw all nodes and edges of a list of networks onto
+    label_image with value index"""
+
+    rows, cols = network_line_coords(networks)
+    label_image[rows, cols] = index
 
     return label_image
+
+
+def draw_network(network, label_image, index=1):
+
+    return draw_networks([network], label_image, index=index)
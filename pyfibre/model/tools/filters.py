@@ -2,11 +2,6 @@ import numpy as np
 
 from scipy.ndimage.filters import gaussian_filter
 
-from skimage.feature import structure_tensor
-from skimage.filters import (
-    threshold_li, threshold_isodata, threshold_mean,
-    apply_hysteresis_threshold, sato)
-
 
 def gaussian(image, sigma=None):
     """Perform gaussian smoothing on image using sigma
@@ -19,6 +14,7 @@ def gaussian(image, sigma=None):
 
 def tubeness(image, sigma_max=3):
     """Wrapper around the scikit-image sato tubeness filter"""
+    from skimage.filters import sato
 
     tube = sato(
         image,
@@ -32,6 +28,9 @@ def tubeness(image, sigma_max=3):
 def hysteresis(image, alpha=1.0):
     """Hystersis thresholding with low and high clipped values
     determined by the mean, li and isodata threshold"""
+    from skimage.filters import (
+        threshold_li, threshold_isodata, threshold_mean,
+        apply_hysteresis_threshold)
 
     low = np.min([
         alpha * threshold_mean(image), threshold_li(image)])
@@ -84,6 +83,62 @@ def derivatives(image, rank=1):
     return derivative
 
 
+def nematic_tensor_components(image, sigma=0.0001, dtype=np.float64):
+    """
+    Create the independent components of the local nematic tensor
+    for each pixel in image, stored compactly as three planes.
+    Gradients and normalisation are calculated one frame at a time
+    directly into the returned array, which is then smoothed in
+    place for all frames at once.
+
+    Parameters
+    ----------
+    image:  array_like (float); shape(n_y, n_x) or (nframe, n_y, n_x)
+        Image or image stack to analyse
+    sigma: float, optional
+        Gaussian smoothing standard deviation
+    dtype: numpy.dtype, optional
+        Data type of returned array
+
+    Returns
+    -------
+    n_components:  array_like; shape=(3,) + image.shape
+        n_xx, n_xy and n_yy nematic tensor components for each
+        pixel in image
+    """
+
+    stack = image.reshape((-1,) + image.shape[-2:])
+    n_components = np.empty((3,) + stack.shape, dtype=dtype)
+    n_xx, n_xy, n_yy = n_components
+    r_xy_2 = np.empty(stack.shape[1:], dtype=dtype)
+
+    for frame, frame_image in enumerate(stack):
+        dx_shg = np.gradient(frame_image, edge_order=1, axis=-2)
+        dy_shg = np.gradient(frame_image, edge_order=1, axis=-1)
+        np.nan_to_num(dx_shg, copy=False)
+        np.nan_to_num(dy_shg, copy=False)
+
+        np.multiply(dy_shg, dy_shg, out=n_xx[frame])
+        np.multiply(dx_shg, dx_shg, out=n_yy[frame])
+        np.multiply(dx_shg, dy_shg, out=n_xy[frame])
+        np.negative(n_xy[frame], out=n_xy[frame])
+
+        # Normalise by squared gradient magnitude, where non-zero
+        np.add(n_xx[frame], n_yy[frame], out=r_xy_2)
+        indices = r_xy_2 > 0
+        for component in n_components:
+            np.divide(component[frame], r_xy_2,
+                      out=component[frame], where=indices)
+            component[frame][~indices] = 0
+
+    # Smooth each component over image axes only, for all frames
+    gaussian_filter(
+        n_components, sigma=(0, 0, sigma, sigma),
+        output=n_components)
+
+    return n_components.reshape((3,) + image.shape)
+
+
 def form_nematic_tensor(image, sigma=0.0001):
     """
     form_nematic_tensor(dx_shg, dy_shg)
@@ -105,34 +160,45 @@ def form_nematic_tensor(image, sigma=0.0001):
 
     """
 
-    if image.ndim == 2:
-        image = image.reshape((1,) + image.shape)
-    nframe = image.shape[0]
+    nxx, nxy, nyy = nematic_tensor_components(image, sigma=sigma)
 
-    dx_shg, dy_shg = derivatives(image)
-    r_xy_2 = (dx_shg**2 + dy_shg**2)
-    indicies = np.where(r_xy_2 > 0)
+    n_tensor = np.stack((nxx, nxy, nxy, nyy), -1).reshape(
+        nxx.shape + (2, 2))
 
-    nxx = np.zeros(dx_shg.shape)
-    nyy = np.zeros(dx_shg.shape)
-    nxy = np.zeros(dx_shg.shape)
+    return n_tensor
 
-    nxx[indicies] += dy_shg[indicies]**2 / r_xy_2[indicies]
-    nyy[indicies] += dx_shg[indicies]**2 / r_xy_2[indicies]
-    nxy[indicies] -= dx_shg[indicies] * dy_shg[indicies] / r_xy_2[indicies]
 
-    for frame in range(nframe):
-        nxx[frame] = gaussian_filter(nxx[frame], sigma=sigma)
-        nyy[frame] = gaussian_filter(nyy[frame], sigma=sigma)
-        nxy[frame] = gaussian_filter(nxy[frame], sigma=sigma)
+def structure_tensor_components(image, sigma=0.0001, dtype=np.float32):
+    """
+    Create the independent components of the local structure tensor
+    for each pixel in image, stored compactly as three planes
 
-    n_tensor = np.stack((nxx, nxy, nxy, nyy), -1).reshape(
-        nxx.shape + (2, 2))
+    Parameters
+    ----------
+    image:  array_like (float); shape(n_y, n_x) or (nframe, n_y, n_x)
+        Image or image stack to analyse
+    sigma: float, optional
+        Gaussian smoothing standard deviation
+    dtype: numpy.dtype, optional
+        Data type of returned array
 
-    if nframe == 1:
-        n_tensor = n_tensor.reshape(n_tensor.shape[1:])
+    Returns
+    -------
+    j_components:  array_like; shape=(3,) + image.shape
+        j_xx, j_xy and j_yy structure tensor components for each
+        pixel in image
+    """
+    from skimage.feature import structure_tensor
 
-    return n_tensor
+    stack = image.reshape((-1,) + image.shape[-2:])
+    j_components = np.empty((3,) + stack.shape, dtype=dtype)
+
+    for frame, frame_image in enumerate(stack):
+        for index, component in enumerate(
+                structure_tensor(frame_image, sigma=sigma)):
+            j_components[index, frame] = component
+
+    return j_components.reshape((3,) + image.shape)
 
 
 def form_structure_tensor(image, sigma=0.0001):
@@ -155,22 +221,10 @@ def form_structure_tensor(image, sigma=0.0001):
 
     """
 
-    if image.ndim == 2:
-        image = image.reshape((1,) + image.shape)
-    nframe = image.shape[0]
-
-    jxx = np.zeros(image.shape)
-    jxy = np.zeros(image.shape)
-    jyy = np.zeros(image.shape)
-
-    for frame in range(nframe):
-        jxx[frame], jxy[frame], jyy[frame] = structure_tensor(
-            image[frame], sigma=sigma)
+    jxx, jxy, jyy = structure_tensor_components(
+        image, sigma=sigma, dtype=float)
 
     j_tensor = np.stack((jxx, jxy, jxy, jyy), -1).reshape(
         jxx.shape + (2, 2))
 
-    if nframe == 1:
-        j_tensor = j_tensor.reshape(j_tensor.shape[1:])
-
     return j_tensor
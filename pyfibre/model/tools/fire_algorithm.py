@@ -5,8 +5,7 @@ import copy
 import networkx as nx
 import numpy as np
 
-from skimage.morphology import local_maxima
-
+from pyfibre.profiling import profile_stage
 from pyfibre.utilities import ring, numpy_remove
 
 from .fibre_utilities import (
@@ -79,6 +78,7 @@ class FIREAlgorithm:
 
     def _get_nucleation_points(self, image):
         """Set distance and angle thresholds for fibre iterator"""
+        from skimage.morphology import local_maxima
 
         # Get global maxima for smoothed distance matrix
         maxima = local_maxima(
@@ -253,14 +253,15 @@ class FIREAlgorithm:
         while len(fibre_grow) > 0:
             start = time.time()
 
-            tot_node_coord = [self._graph.nodes[node]['xy']
-                              for node in self._graph]
-            tot_node_coord = np.stack(tot_node_coord)
+            with profile_stage('iteration'):
+                tot_node_coord = [self._graph.nodes[node]['xy']
+                                  for node in self._graph]
+                tot_node_coord = np.stack(tot_node_coord)
 
-            for fibre in fibre_grow:
-                self.grow_lmp(
-                    fibre, image, tot_node_coord
-                )
+                for fibre in fibre_grow:
+                    self.grow_lmp(
+                        fibre, image, tot_node_coord
+                    )
 
             n_node = self._graph.number_of_nodes()
             fibre_grow[:] = self.grow_list
@@ -3,13 +3,13 @@ import logging
 import networkx as nx
 import numpy as np
 import pandas as pd
-from skimage.feature import greycomatrix
+from scipy.sparse.linalg import eigsh
 from skimage.measure import shannon_entropy
 
 from pyfibre.model.tools.analysis import (
-    tensor_analysis, angle_analysis)
-from pyfibre.model.tools.feature import greycoprops_edit
-from pyfibre.model.tools.filters import form_structure_tensor
+    tensor_component_analysis, angle_analysis)
+from pyfibre.model.tools.feature import label_greycoprops, GLCM_LEVELS
+from pyfibre.model.tools.filters import structure_tensor_components
 from pyfibre.model.tools.utilities import bbox_sample
 
 logger = logging.getLogger(__name__)
@@ -20,6 +20,13 @@ TEXTURE_METRICS = ['Mean', 'STD', 'Entropy']
 FIBRE_METRICS = ['Waviness', 'Length']
 NETWORK_METRICS = ['Degree', 'Eigenvalue', 'Connectivity',
                    'Cross-Link Density']
+GLCM_METRICS = ["Contrast", "Homogeneity", "Energy",
+                "Entropy", "Autocorrelation", "Clustering",
+                "Mean", "Covariance", "Correlation"]
+
+#: Number of nodes in a graph above which spectral network metrics
+#: are calculated using sparse eigensolvers
+SPARSE_THRESHOLD = 500
 
 
 def _region_sample(region, metric):
@@ -42,29 +49,39 @@ def _region_sample(region, metric):
     return metric[indices]
 
 
-def structure_tensor_metrics(structure_tensor, tag=''):
-    """Nematic tensor analysis for a scikit-image region"""
+def structure_component_metrics(t_xx, t_xy, t_yy, tag=''):
+    """Nematic tensor analysis for a set of structure tensor
+    components"""
 
     database = pd.Series(dtype=object)
 
     (segment_anis_map,
      segment_angle_map,
-     segment_angle_map) = tensor_analysis(structure_tensor)
+     segment_angle_map) = tensor_component_analysis(t_xx, t_xy, t_yy)
 
     # Calculate mean structure tensor elements
-    axis = tuple(range(structure_tensor.ndim - 2))
-    mean_tensor = np.mean(structure_tensor, axis=axis)
-
-    segment_anis, _, _ = tensor_analysis(mean_tensor)
+    segment_anis, _, _ = tensor_component_analysis(
+        *[np.mean(component, dtype=np.float64)
+          for component in (t_xx, t_xy, t_yy)])
 
     database[f"{tag} Angle SDI"], _ = angle_analysis(
         segment_angle_map, segment_anis_map)
-    database[f"{tag} Anisotropy"] = segment_anis[0]
+    database[f"{tag} Anisotropy"] = float(segment_anis)
     database[f"{tag} Local Anisotropy"] = np.mean(segment_anis_map)
 
     return database
 
 
+def structure_tensor_metrics(structure_tensor, tag=''):
+    """Nematic tensor analysis for a scikit-image region"""
+
+    return structure_component_metrics(
+        structure_tensor[..., 0, 0],
+        structure_tensor[..., 1, 0],
+        structure_tensor[..., 1, 1],
+        tag=tag)
+
+
 def region_shape_metrics(region, tag=''):
     """Shape analysis for a scikit-image region"""
 
@@ -86,7 +103,21 @@ def region_shape_metrics(region, tag=''):
     return database
 
 
-def region_texture_metrics(region, image=None, tag='', glcm=False):
+def _glcm_database(greycoprops, index=0, tag=''):
+    """Average GLCM properties over all distances and angles for
+    segment with index in greycoprops"""
+
+    database = pd.Series(dtype=object)
+
+    for metric in GLCM_METRICS:
+        value = greycoprops[metric.lower()][index].mean()
+        database[f"{tag} GLCM {metric}"] = value
+
+    return database
+
+
+def region_texture_metrics(region, image=None, tag='', glcm=False,
+                           glcm_levels=GLCM_LEVELS):
     """Texture analysis for a of scikit-image region"""
 
     database = pd.Series(dtype=object)
@@ -110,28 +141,170 @@ def region_texture_metrics(region, image=None, tag='', glcm=False):
     database[f"{tag} Entropy"] = shannon_entropy(intensity_sample)
 
     if glcm:
+        greycoprops = label_greycoprops(
+            region.image.astype(int), region_image,
+            n_labels=1, levels=glcm_levels)
+        database = database.append(
+            _glcm_database(greycoprops, tag=tag))
+
+    return database
+
+
+def _segment_tag(segment, image_tag=None):
+    """Return tag used to label image metrics of a `BaseSegment`"""
+    if image_tag is not None:
+        return ' '.join([segment.tag, 'Segment', image_tag])
+    return ' '.join([segment.tag, 'Segment'])
+
+
+def _disjoint_segment_groups(segments, shape):
+    """Sort segments into groups that do not overlap each other,
+    returning a label image and the indices of the segments in
+    each group. Segments are labelled in the order they appear,
+    starting from 1"""
+
+    groups = []
+
+    for index, segment in enumerate(segments):
+        minr, minc, maxr, maxc = segment.region.bbox
+        mask = segment.region.image
+
+        # Add segment to the first group where none of its pixels
+        # have already been labelled
+        for label_image, indices in groups:
+            window = label_image[minr:maxr, minc:maxc]
+            if not window[mask].any():
+                break
+        else:
+            label_image = np.zeros(shape, dtype=np.intp)
+            indices = []
+            groups.append((label_image, indices))
+            window = label_image[minr:maxr, minc:maxc]
 
-        glcm = greycomatrix(
-            (region_image * region.image * 255.999).astype('uint8'),
-            [1, 2], [0, np.pi/4, np.pi/2, np.pi*3/4], 256,
-            symmetric=True, normed=True)
-        glcm[0, :, :, :] = 0
-        glcm[:, 0, :, :] = 0
+        indices.append(index)
+        window[mask] = len(indices)
 
-        greycoprops = greycoprops_edit(glcm)
+    return groups
 
-        metrics = ["Contrast", "Homogeneity", "Energy",
-                   "Entropy", "Autocorrelation", "Clustering",
-                   "Mean", "Covariance", "Correlation"]
 
-        for metric in metrics:
-            value = greycoprops[metric.lower()].mean()
-            database[f"{tag} GLCM {metric}"] = value
+def segment_glcm_metrics(segments, image, image_tag=None,
+                         glcm_levels=GLCM_LEVELS):
+    """GLCM texture analysis of a list of `BaseSegment` objects.
+    Segments that do not overlap are calculated in a single pass
+    over image, with overlapping segments analysed in separate
+    passes
+
+    Parameters
+    ----------
+    segments : list of `<class: BaseSegment>`
+        List of segments to analyse
+    image: array-like
+        Full image to analyse
+    image_tag: str, optional
+        Tag referring to image in metric names
+    glcm_levels: int, optional
+        Number of grey levels to quantise image into
+
+    Returns
+    -------
+    database : DataFrame
+        GLCM metrics for each segment
+    """
+
+    databases = [None] * len(segments)
+
+    for label_image, indices in _disjoint_segment_groups(
+            segments, image.shape):
+
+        bboxes = np.array(
+            [segments[index].region.bbox for index in indices],
+            dtype=int)
+
+        greycoprops = label_greycoprops(
+            label_image, image, n_labels=len(indices),
+            bboxes=bboxes, levels=glcm_levels)
+
+        for label, index in enumerate(indices):
+            databases[index] = _glcm_database(
+                greycoprops, label,
+                _segment_tag(segments[index], image_tag))
+
+    database = pd.DataFrame(databases)
 
     return database
 
 
-def network_metrics(network, network_red, n_fibres, tag=''):
+def adjacency_eigenvalue(graph, weight='weight',
+                         sparse_threshold=SPARSE_THRESHOLD):
+    """Return the largest eigenvalue of the adjacency matrix of an
+    undirected networkx Graph
+
+    Parameters
+    ----------
+    graph: networkx.Graph
+        Graph to analyse
+    weight: str, optional
+        Edge attribute to use as weights in adjacency matrix
+    sparse_threshold: int, optional
+        Number of nodes above which only the leading eigenvalue
+        is calculated using the Lanczos (ARPACK) method, rather
+        than the full dense spectrum
+
+    Returns
+    -------
+    eigenvalue: float
+        Largest eigenvalue of adjacency matrix
+    """
+
+    if graph.number_of_nodes() <= sparse_threshold:
+        return np.real(nx.adjacency_spectrum(graph, weight=weight).max())
+
+    adjacency = nx.adjacency_matrix(graph, weight=weight).astype(float)
+    eigenvalue = eigsh(
+        adjacency, k=1, which='LA', return_eigenvectors=False)
+
+    return eigenvalue[0]
+
+
+def algebraic_connectivity(graph, weight='r',
+                           sparse_threshold=SPARSE_THRESHOLD):
+    """Return the algebraic connectivity (Fiedler value) of an
+    undirected networkx Graph
+
+    Parameters
+    ----------
+    graph: networkx.Graph
+        Graph to analyse
+    weight: str, optional
+        Edge attribute to use as weights in Laplacian matrix
+    sparse_threshold: int, optional
+        Number of nodes above which the Fiedler value is calculated
+        using the Lanczos (ARPACK) method, rather than the full
+        dense Laplacian spectrum
+
+    Returns
+    -------
+    connectivity: float
+        Second smallest eigenvalue of the Laplacian matrix
+    """
+
+    if graph.number_of_nodes() < 2:
+        raise nx.NetworkXError('graph has less than two nodes.')
+
+    if not nx.is_connected(graph):
+        return 0.
+
+    if graph.number_of_nodes() <= sparse_threshold:
+        laplacian = nx.laplacian_matrix(graph, weight=weight)
+        eigenvalues = np.linalg.eigvalsh(laplacian.toarray())
+        return eigenvalues[1]
+
+    return nx.algebraic_connectivity(
+        graph, weight=weight, method='lanczos')
+
+
+def network_metrics(network, network_red, n_fibres, tag='',
+                    sparse_threshold=SPARSE_THRESHOLD):
     """Analyse networkx Graph object"""
 
     database = pd.Series(dtype=object)
@@ -152,13 +325,16 @@ def network_metrics(network, network_red, n_fibres, tag=''):
     database[f"{tag} Network Degree"] = value
 
     try:
-        value = np.real(nx.adjacency_spectrum(network_red).max())
+        value = adjacency_eigenvalue(
+            network_red, sparse_threshold=sparse_threshold)
     except Exception:
         value = None
     database[f"{tag} Network Eigenvalue"] = value
 
     try:
-        value = nx.algebraic_connectivity(network_red, weight='r')
+        value = algebraic_connectivity(
+            network_red, weight='r',
+            sparse_threshold=sparse_threshold)
     except Exception:
         value = None
     database[f"{tag} Network Connectivity"] = value
@@ -224,7 +400,9 @@ def fibre_network_metrics(fibre_networks):
     return database
 
 
-def segment_metrics(segments, image, image_tag=None, sigma=0.0001):
+def segment_metrics(segments, image, image_tag=None, sigma=0.0001,
+                    glcm=False, glcm_levels=GLCM_LEVELS,
+                    structure_tensor=None):
     """Analysis of a list of `BaseSegment` objects
 
     Parameters
@@ -233,6 +411,13 @@ def segment_metrics(segments, image, image_tag=None, sigma=0.0001):
         List of cells to analyse
     image: array-like
         Full image to analyse
+    glcm: bool, optional
+        Whether to include GLCM texture metrics
+    glcm_levels: int, optional
+        Number of grey levels to quantise image into for GLCM metrics
+    structure_tensor: array-like, shape=(3,) + image.shape, optional
+        Pre-calculated structure tensor components of image, as
+        returned by structure_tensor_components
 
     Returns
     -------
@@ -242,27 +427,32 @@ def segment_metrics(segments, image, image_tag=None, sigma=0.0001):
     """
     database = pd.DataFrame()
 
-    structure_tensor = form_structure_tensor(image, sigma)
+    if structure_tensor is None:
+        structure_tensor = structure_tensor_components(image, sigma)
 
     for index, segment in enumerate(segments):
 
         segment_series = segment.generate_database(
             image_tag=image_tag)
 
-        if image_tag is not None:
-            tensor_tag = ' '.join([segment.tag, 'Segment', image_tag])
-        else:
-            tensor_tag = ' '.join([segment.tag, 'Segment'])
+        tensor_tag = _segment_tag(segment, image_tag)
 
         # Only use pixel tensors in segment
-        segment_tensor = _region_sample(
-            segment.region, structure_tensor)
+        segment_tensor = [
+            _region_sample(segment.region, component)
+            for component in structure_tensor]
 
-        nematic_metrics = structure_tensor_metrics(
-            segment_tensor, tensor_tag)
+        nematic_metrics = structure_component_metrics(
+            *segment_tensor, tag=tensor_tag)
 
         segment_series = pd.concat((segment_series, nematic_metrics))
 
         database = database.append(segment_series, ignore_index=True)
 
+    if glcm and segments:
+        glcm_database = segment_glcm_metrics(
+            segments, image, image_tag=image_tag,
+            glcm_levels=glcm_levels)
+        database = pd.concat((database, glcm_database), axis=1)
+
     return database
@@ -11,6 +11,7 @@ from skimage.transform import rescale
 
 from pyfibre.model.objects.fibre_network import FibreNetwork
 from pyfibre.model.tools.filters import tubeness, hysteresis
+from pyfibre.profiling import profile_stage
 from pyfibre.utilities import clear_border
 
 from .fire_algorithm import FIREAlgorithm
@@ -63,12 +64,16 @@ def build_network(image, scale=1, alpha=0.5, sigma=0.5, nuc_thresh=2,
     sigma *= scale
 
     # Apply tubeness transform to enhance image fibres"
-    image_TB = tubeness(image_scale)
-    threshold = hysteresis(image_TB, alpha=alpha)
-    cleaned = remove_small_objects(threshold, min_size=int(64*scale**2))
-    distance = distance_transform_edt(cleaned)
-    smoothed = gaussian_filter(distance, sigma=sigma)
-    cleared = clear_border(smoothed)
+    with profile_stage('tubeness'):
+        image_TB = tubeness(image_scale)
+
+    with profile_stage('distance'):
+        threshold = hysteresis(image_TB, alpha=alpha)
+        cleaned = remove_small_objects(
+            threshold, min_size=int(64*scale**2))
+        distance = distance_transform_edt(cleaned)
+        smoothed = gaussian_filter(distance, sigma=sigma)
+        cleared = clear_border(smoothed)
 
     # Set distance thresholds for fibre iterator based on scale factor"
     nuc_thresh = np.min(
@@ -96,7 +101,8 @@ def build_network(image, scale=1, alpha=0.5, sigma=0.5, nuc_thresh=2,
         nuc_thresh=nuc_thresh, lmp_thresh=lmp_thresh,
         angle_thresh=angle_thresh,
         r_thresh=r_thresh, nuc_radius=nuc_radius)
-    network = fibre_network.create_network(cleared)
+    with profile_stage('fire'):
+        network = fibre_network.create_network(cleared)
 
     # Rescale all node coordinates and edge radii
     for node in network.nodes():
@@ -8,11 +8,127 @@ Created on: 18/02/2019
 import logging
 import numpy as np
 
-from skimage.restoration import denoise_nl_means, estimate_sigma
-from skimage.exposure import rescale_intensity
-
 logger = logging.getLogger(__name__)
 
+#: Number of histogram bins used to locate percentiles of
+#: floating point images
+PERCENTILE_BINS = 4096
+
+#: Largest range of integer values histogrammed at unit resolution
+#: when calculating percentiles
+MAX_INTEGER_RANGE = 2 ** 24
+
+
+def _order_statistics(values, ranks, bins, n_bins):
+    """Return the values at each rank in the sorted array of values,
+    given the (monotonically increasing) histogram bin of each value.
+    Only values in bins containing a requested rank are sorted"""
+
+    cumulative = np.cumsum(np.bincount(bins, minlength=n_bins))
+    rank_bins = np.searchsorted(cumulative, ranks, side='right')
+
+    statistics = np.empty(len(ranks), dtype=values.dtype)
+    for rank_bin in np.unique(rank_bins):
+        indices = np.flatnonzero(rank_bins == rank_bin)
+        start = cumulative[rank_bin - 1] if rank_bin > 0 else 0
+        bin_values = np.sort(values[bins == rank_bin])
+        statistics[indices] = bin_values[ranks[indices] - start]
+
+    return statistics
+
+
+def histogram_percentiles(image, percentiles, n_bins=PERCENTILE_BINS):
+    """Calculate percentiles of image intensities from a histogram,
+    giving the same results as np.percentile with linear
+    interpolation.
+
+    Integer images are histogrammed at unit resolution, so that each
+    percentile is read directly from the cumulative counts. For
+    floating point images the histogram locates the bins containing
+    each required order statistic, so that only the few values inside
+    them need to be sorted.
+
+    Parameters
+    ----------
+    image: array_like
+        Image to calculate percentiles of
+    percentiles: array_like of float
+        Percentiles to calculate, between 0 and 100
+    n_bins: int, optional
+        Number of histogram bins used for floating point images
+
+    Returns
+    -------
+    values: array_like of float
+        Image intensity at each percentile
+    """
+
+    values = np.ravel(image)
+    percentiles = np.asarray(percentiles, dtype=float)
+    n_values = values.size
+
+    low, high = values.min(), values.max()
+    is_integer = np.issubdtype(values.dtype, np.integer)
+
+    if is_integer:
+        n_bins = int(high) - int(low) + 1
+        if n_bins > MAX_INTEGER_RANGE:
+            return np.percentile(values, percentiles)
+    elif not (np.isfinite(low) and np.isfinite(high)):
+        return np.percentile(values, percentiles)
+
+    # Follow the conventions of np.percentile for locating and
+    # interpolating between order statistics
+    positions = percentiles / 100 * (n_values - 1)
+    ranks_below = np.floor(positions).astype(np.intp)
+    ranks_above = np.minimum(ranks_below + 1, n_values - 1)
+    weights_above = positions - ranks_below
+
+    ranks = np.concatenate([ranks_below, ranks_above])
+
+    if low == high:
+        statistics = np.full(ranks.shape, low, dtype=float)
+    elif is_integer:
+        # Offsets are calculated at full precision, since they
+        # can overflow the source dtype for signed integers
+        offsets = values.astype(np.intp) - int(low)
+        counts = np.bincount(offsets, minlength=n_bins)
+        statistics = int(low) + np.searchsorted(
+            np.cumsum(counts), ranks, side='right').astype(float)
+    else:
+        bins = values - low
+        bins *= n_bins / (high - low)
+        bins = bins.astype(np.intp)
+        np.minimum(bins, n_bins - 1, out=bins)
+        statistics = _order_statistics(
+            values, ranks, bins, n_bins).astype(float)
+
+    below, above = np.split(statistics, 2)
+
+    return below * (1 - weights_above) + above * weights_above
+
+
+def rescale_clipped(image, in_range):
+    """Clip image intensities to in_range and rescale them between
+    0 and 1, equivalent to skimage.exposure.rescale_intensity with
+    out_range=(0, 1). A single floating point array is allocated
+    for the output, which is then transformed in place"""
+
+    low, high = in_range
+
+    dtype = image.dtype
+    if not np.issubdtype(dtype, np.floating):
+        dtype = np.float64
+
+    clipped = np.empty(image.shape, dtype=dtype)
+    np.clip(image, low, high, out=clipped)
+
+    if low != high:
+        clipped -= low
+        clipped /= float(high - low)
+
+    return clipped
+
 
 def clip_intensities(image, p_intensity=(1, 98)):
     """
@@ -36,9 +152,8 @@ def clip_intensities(image, p_intensity=(1, 98)):
     logger.debug(
         f"Preprocessing images using clipped "
         f"intensity percentages {p_intensity}")
-    low, high = np.percentile(image, p_intensity)
-    image = rescale_intensity(
-        image, in_range=(low, high), out_range=(0.0, 1.0))
+    low, high = histogram_percentiles(image, p_intensity)
+    image = rescale_clipped(image, in_range=(low, high))
 
     return image
 
@@ -61,6 +176,7 @@ def nl_means(image, p_denoise=(5, 35)):
     image:  array_like (float); shape=(n_y, n_x)
         Pre-processed image
     """
+    from skimage.restoration import denoise_nl_means, estimate_sigma
 
     sigma = estimate_sigma(image)
     image = denoise_nl_means(
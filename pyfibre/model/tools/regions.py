@@ -0,0 +1,41 @@
+"""
+PyFibre
+Region properties of segments labelled within a window
+of a larger image
+"""
+
+from skimage.measure._regionprops import RegionProperties
+
+
+class WindowRegionProperties(RegionProperties):
+    """Scikit-image region of a segment that was labelled within
+    a window of a larger image. Coordinates such as bbox and coords
+    are reported in the frame of the full image, so that only the
+    window needs to be labelled.
+
+    Parameters
+    ----------
+    region: skimage.RegionProperties
+        Region labelled within window
+    window: tuple of slice
+        Position of window in the full image
+    intensity_image: array-like, optional
+        Intensity image covering the full image
+    """
+
+    def __init__(self, region, window, intensity_image=None):
+
+        offset_slice = tuple(
+            slice(item.start + offset.start, item.stop + offset.start)
+            for item, offset in zip(region.slice, window))
+        mask = region.image
+
+        super(WindowRegionProperties, self).__init__(
+            offset_slice, region.label, mask, None, True)
+
+        self._mask = mask
+        self._intensity_image = intensity_image
+
+    @property
+    def image(self):
+        return self._mask
@@ -12,11 +12,12 @@ import logging
 
 import numpy as np
 from scipy.ndimage import (
-    gaussian_filter)
+    gaussian_filter, binary_dilation)
 from skimage.transform import rescale, resize
 
-from .convertors import (
-    regions_to_binary, networks_to_regions)
+from pyfibre.profiling import profile_stage
+
+from .convertors import networks_to_binary
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +49,49 @@ def normalise_stack(image_stack):
     return image_stack
 
 
-def rgb_segmentation(image_stack, bd_filter, scale=1.0):
+def refine_mask_boundaries(mask_image, image_stack, bd_filter, width=2):
+    """Refine an upsampled mask at full resolution, only near
+    boundaries between masked and unmasked regions.
+
+    Pixels with intermediate values in mask_image (and those within
+    width pixels of them) are reassigned by the classifier of
+    bd_filter, using the cluster centroids fitted when the mask was
+    created. All other pixels keep their assignment.
+
+    Parameters
+    ----------
+    mask_image: array-like of float, shape=(I, J)
+        Mask interpolated from a lower resolution, with values
+        between 0 (unmasked) and 1 (masked)
+    image_stack: array-like, shape=(I, J, N)
+        Full resolution stack of N images
+    bd_filter: BaseKmeansFilter
+        Filter used to create the mask at lower resolution
+    width: int, optional
+        Number of pixels to extend the boundary band by
+
+    Returns
+    -------
+    mask: array-like of bool, shape=(I, J)
+        Refined binary mask
+    """
+
+    mask = mask_image > 0
+    boundary = mask & (mask_image < 1)
+
+    if not boundary.any():
+        return mask
+
+    if width > 0:
+        boundary = binary_dilation(boundary, iterations=width)
+
+    mask[boundary] = bd_filter.classify_pixels(image_stack, boundary)
+
+    return mask
+
+
+def rgb_segmentation(image_stack, bd_filter, scale=1.0,
+                     refine=False, refine_width=2):
     """Return binary filter for cellular identification
 
     Parameters
@@ -58,7 +101,14 @@ def rgb_segmentation(image_stack, bd_filter, scale=1.0):
     bd_filter: BaseBDFilter
         Instance of filtering algorithm to be used
     scale: float, optional
-        Ratio to rescale size of image to
+        Ratio to rescale size of image to. Values below 1 cluster
+        a downsampled image, which is faster for large images
+    refine: bool, optional
+        Whether to refine the rescaled mask at full resolution
+        near region boundaries, rather than keeping every pixel
+        touched by the interpolated mask
+    refine_width: int, optional
+        Width in pixels of boundary band to refine
 
     Returns
     -------
@@ -75,16 +125,19 @@ def rgb_segmentation(image_stack, bd_filter, scale=1.0):
     # Normalise the intensity values of each channel
     image_stack = normalise_stack(image_stack)
 
-    # Up-scale image to improve accuracy of clustering
+    # Re-scale image to either improve accuracy (scale > 1) or
+    # speed (scale < 1) of clustering
     logger.debug(f"Rescaling by {scale}")
-    image_stack = rescale(
+    scaled_stack = rescale(
         image_stack, scale, multichannel=True,
         mode='constant', anti_aliasing=None
     )
 
     # Form mask using Kmeans Background filter
     logger.debug("Performing BD Filter")
-    mask_image = bd_filter.filter_image(image_stack)
+    with profile_stage('kmeans'):
+        mask_image = bd_filter.filter_image(scaled_stack)
+    del scaled_stack
 
     # Reducing image to original size
     logger.debug(f"Rescaling image back to {shape}")
@@ -93,6 +146,12 @@ def rgb_segmentation(image_stack, bd_filter, scale=1.0):
         anti_aliasing=True
     )
 
+    if refine:
+        logger.debug("Refining mask boundaries")
+        with profile_stage('refine'):
+            mask_image = refine_mask_boundaries(
+                mask_image, image_stack, bd_filter, width=refine_width)
+
     # Create cell and fibre global image masks
     cell_mask = np.array(mask_image, dtype=bool)
     fibre_mask = np.where(mask_image, False, True)
@@ -111,17 +170,15 @@ def create_fibre_filter(fibre_networks, shape,
         for fibre_network in fibre_networks
     ]
 
-    regions = networks_to_regions(
-        graphs, shape=shape,
-        area_threshold=area_threshold,
-        iterations=iterations, sigma=sigma)
-
     # Create a filter for the image that corresponds
     # to the regions that have not been identified as fibrous
-    # segments
-    fibre_binary = regions_to_binary(
-        regions, shape
-    )
+    # segments. Since every labelled region is retained, the
+    # network binary can be used directly without an intermediate
+    # conversion to regions
+    fibre_binary = networks_to_binary(
+        graphs, shape,
+        area_threshold=area_threshold,
+        iterations=iterations, sigma=sigma)
 
     # Dilate the binary in order to enhance network
     # regions
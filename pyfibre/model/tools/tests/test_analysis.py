@@ -1,7 +1,7 @@
 import numpy as np
 
 from pyfibre.model.tools.analysis import (
-    tensor_analysis, angle_analysis
+    tensor_analysis, tensor_component_analysis, angle_analysis
 )
 from pyfibre.tests.pyfibre_test_case import PyFibreTestCase
 
@@ -78,6 +78,47 @@ class TestAnalysis(PyFibreTestCase):
         self.assertArrayAlmostEqual(np.array([[45, 0], [90, 90]]), tot_angle)
         self.assertArrayAlmostEqual(np.array([[0, 1], [2, 1]]), tot_energy)
 
+    def test_eigh_comparison(self):
+        components = np.random.RandomState(0).random_sample((3, 6, 7))
+        tensor = np.stack(
+            (components[0], components[1],
+             components[1], components[2]), -1).reshape((6, 7, 2, 2))
+
+        eig_val, _ = np.linalg.eigh(tensor)
+        anis = (eig_val[..., 1] - eig_val[..., 0]) / eig_val.sum(axis=-1)
+
+        tot_anis, tot_angle, tot_energy = tensor_analysis(tensor)
+        self.assertArrayAlmostEqual(anis, tot_anis)
+        self.assertArrayAlmostEqual(
+            0.5 * np.arctan2(2 * components[1],
+                             components[2] - components[0])
+            / np.pi * 180, tot_angle)
+        self.assertArrayAlmostEqual(
+            components[0] + components[2], tot_energy)
+
+    def test_tensor_component_analysis(self):
+        t_xx = np.array([[1, 0], [0, 1]], dtype=np.float32)
+        t_xy = np.array([[0, 1], [0, 0]], dtype=np.float32)
+        t_yy = np.array([[0, 0], [1, 1]], dtype=np.float32)
+
+        out = tuple(np.empty((2, 2), dtype=np.float32) for _ in range(3))
+        results = tensor_component_analysis(t_xx, t_xy, t_yy, out=out)
+
+        for array, result in zip(out, results):
+            self.assertIs(array, result)
+
+        self.assertArrayAlmostEqual(
+            np.array([[1, 0], [1, 0]]), out[0], thresh=1E-6)
+        self.assertArrayAlmostEqual(
+            np.array([[90, 45], [0, 0]]), out[1], thresh=1E-5)
+        self.assertArrayAlmostEqual(
+            np.array([[1, 0], [1, 2]]), out[2], thresh=1E-6)
+
+        results = tensor_component_analysis(t_xx, t_xy, t_yy)
+        for array, result in zip(out, results):
+            self.assertEqual(np.float32, result.dtype)
+            self.assertArrayAlmostEqual(array, result)
+
     def test_angle_analysis(self):
         angles = np.array([45, 90, 100,
                            180, 45, 45,
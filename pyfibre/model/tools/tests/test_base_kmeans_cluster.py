@@ -1,5 +1,11 @@
+from unittest import mock
+
 import numpy as np
+from sklearn.cluster import MiniBatchKMeans
 
+from pyfibre.model.tools.base_kmeans_filter import (
+    stratified_sample, nearest_centroid, image_tiles,
+    double_median_filter)
 from pyfibre.tests.probe_classes.utilities import (
     generate_image, generate_probe_graph
 )
@@ -31,6 +37,109 @@ class TestKmeansFilter(PyFibreTestCase):
         )
         self.assertEqual((2, 3), centres.shape)
 
+    def test_stratified_sample(self):
+        indices = stratified_sample(100, 10, random_state=1)
+
+        self.assertEqual((10,), indices.shape)
+        self.assertArrayAlmostEqual(
+            np.arange(10), indices // 10)
+
+        self.assertArrayAlmostEqual(
+            np.arange(5), stratified_sample(5, 10))
+        self.assertArrayAlmostEqual(
+            np.arange(5), stratified_sample(5, None))
+
+    def test_nearest_centroid(self):
+        values = np.array([[0, 0], [1, 1], [4, 5], [0.5, 3]])
+        centres = np.array([[0, 0], [5, 5], [0, 3]])
+
+        self.assertArrayAlmostEqual(
+            np.array([0, 0, 1, 2]), nearest_centroid(values, centres))
+
+    def test_cluster_colours_sample(self):
+        self.bd_filter.n_samples = 50
+        self.bd_filter.init_size = 50
+        labels, centres = self.bd_filter._kmeans_cluster_colours(
+            self.image, random_state=0)
+
+        self.assertEqual((10, 10), labels.shape)
+        self.assertEqual((2, 3), centres.shape)
+
+        values = self.image.reshape((-1, 3))
+        self.assertArrayAlmostEqual(
+            nearest_centroid(values, centres), labels.ravel())
+
+    def test_cluster_colours_shared_values(self):
+        values = self.bd_filter._pixel_values(self.image)
+
+        with mock.patch.object(
+                MiniBatchKMeans, 'fit', autospec=True,
+                side_effect=MiniBatchKMeans.fit) as mock_fit:
+            self.bd_filter._kmeans_cluster_colours(
+                self.image, values=values)
+
+        # Pixel values are not copied when fitting every pixel
+        self.assertIs(values, mock_fit.call_args[0][1])
+
+    def test_classify_pixels(self):
+        mask = np.zeros((10, 10), dtype=bool)
+        mask[2:5] = True
+
+        with self.assertRaises(ValueError):
+            self.bd_filter.classify_pixels(self.image, mask)
+
+        binary_mask = self.bd_filter._minimise_mask(
+            self.bd_filter._scale_image(self.image))
+        self.assertEqual((2, 3), self.bd_filter.centres.shape)
+        self.assertEqual((2,), self.bd_filter.label_mask.shape)
+
+        cellular = self.bd_filter.classify_pixels(self.image, mask)
+        self.assertEqual((30,), cellular.shape)
+        self.assertArrayAlmostEqual(binary_mask[mask], cellular)
+
+    def test_parallel_runs(self):
+        self.bd_filter.n_jobs = 2
+        self.bd_filter.random_state = 0
+
+        parallel_runs = list(self.bd_filter._kmeans_runs(self.image))
+        self.assertEqual(2, len(parallel_runs))
+
+        self.bd_filter.n_jobs = 1
+        serial_runs = list(self.bd_filter._kmeans_runs(self.image))
+
+        for parallel, serial in zip(parallel_runs, serial_runs):
+            self.assertArrayAlmostEqual(parallel[0], serial[0])
+            self.assertArrayAlmostEqual(parallel[1], serial[1])
+
+    def test_image_tiles(self):
+        tiles = list(image_tiles((10, 7), tile_size=4))
+
+        self.assertEqual(6, len(tiles))
+        self.assertEqual((slice(0, 4), slice(0, 4)), tiles[0])
+        self.assertEqual((slice(8, 10), slice(4, 7)), tiles[-1])
+
+    def test_double_median_filter(self):
+        image = np.zeros((10, 10))
+        image[4:7, 4:7] = 1
+        image[1, 1] = 1
+
+        smoothed = double_median_filter(image, 3)
+        self.assertEqual(0, smoothed[1, 1])
+        self.assertEqual(1, smoothed[5, 5])
+
+        smoothed = double_median_filter(image, 3, separable=True)
+        self.assertEqual(0, smoothed[1, 1])
+        self.assertEqual(1, smoothed[5, 5])
+
+    def test_scaled_image_tiles(self):
+        image = np.random.RandomState(0).random_sample((30, 25, 3))
+        image_scaled = self.bd_filter._scale_image(image)
+
+        self.bd_filter.tile_size = 8
+        self.bd_filter.n_jobs = 2
+        self.assertArrayAlmostEqual(
+            image_scaled, self.bd_filter._scale_image(image))
+
     def test_create_scaled_image(self):
         image_scaled = self.bd_filter._scale_image(self.image)
 
@@ -50,6 +159,16 @@ class TestKmeansFilter(PyFibreTestCase):
 
         self.assertEqual(2, n_runs)
 
+    def test__cluster_generator_mask(self):
+        self.bd_filter.random_state = 0
+        label_image, _ = self.bd_filter._kmeans_runs(self.image)[0]
+
+        self.bd_filter.cellular_classifier = (
+            lambda labels, centres: ([False, True], 1.0))
+        mask, _ = next(self.bd_filter._cluster_generator(self.image))
+
+        self.assertArrayAlmostEqual(label_image == 1, mask)
+
     def test_BD_filter(self):
         mask_image = self.bd_filter.filter_image(self.image)
 
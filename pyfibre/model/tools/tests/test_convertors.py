@@ -2,8 +2,10 @@ import numpy as np
 
 from pyfibre.model.tools.convertors import (
     binary_to_stack, regions_to_binary, binary_to_regions,
-    networks_to_binary, stack_to_binary, stack_to_regions,
-    regions_to_stack, binary_to_segments, segments_to_binary)
+    networks_to_binary, networks_to_local_binary, networks_to_regions,
+    network_window, stack_to_binary, stack_to_regions,
+    regions_to_stack, binary_to_segments, segments_to_binary,
+    label_image_to_stack, regions_to_label_image, stack_to_label_image)
 from pyfibre.tests.pyfibre_test_case import PyFibreTestCase
 from pyfibre.tests.probe_classes.objects import ProbeSegment
 from pyfibre.tests.probe_classes.utilities import (
@@ -29,6 +31,37 @@ class TestConvertors(PyFibreTestCase):
         self.assertEqual(9, binary_stack[0].sum())
         self.assertEqual(3, binary_stack[1].sum())
 
+    def test_label_image_to_stack(self):
+
+        stack = label_image_to_stack(self.labels)
+        self.assertEqual((2, 10, 10), stack.shape)
+        self.assertArrayAlmostEqual(self.labels == 1, stack[0])
+        self.assertArrayAlmostEqual(self.labels == 2, stack[1])
+
+        # Missing labels are skipped
+        label_image = np.where(self.labels == 1, 3, self.labels)
+        stack = label_image_to_stack(label_image)
+        self.assertEqual((2, 10, 10), stack.shape)
+        self.assertArrayAlmostEqual(self.labels == 2, stack[0])
+        self.assertArrayAlmostEqual(self.labels == 1, stack[1])
+
+    def test_regions_to_label_image(self):
+
+        label_image = regions_to_label_image(self.regions, (10, 10))
+        self.assertEqual(np.int32, label_image.dtype)
+        self.assertArrayAlmostEqual(self.binary, label_image != 0)
+        for index, region in enumerate(self.regions, 1):
+            self.assertEqual(
+                region.area, np.count_nonzero(label_image == index))
+
+    def test_stack_to_label_image(self):
+
+        label_stack = stack_to_label_image(self.stack)
+        self.assertEqual((2, 10, 10), label_stack.shape)
+        self.assertArrayAlmostEqual(self.stack, label_stack != 0)
+        self.assertEqual(
+            2, np.unique(label_stack[label_stack != 0]).size)
+
     def test_stack_to_binary(self):
 
         binary = stack_to_binary(self.stack)
@@ -101,6 +134,56 @@ class TestConvertors(PyFibreTestCase):
             np.argwhere(binary)
         )
 
+    def test_network_window(self):
+
+        window = network_window(
+            [self.network], (100, 100), area_threshold=50,
+            iterations=1, sigma=None)
+        self.assertEqual((slice(0, 15), slice(0, 18)), window)
+
+        window = network_window(
+            [self.network], (10, 10), area_threshold=50,
+            iterations=1, sigma=0.5)
+        self.assertEqual((slice(0, 10), slice(0, 10)), window)
+
+    def test_networks_to_binary_local(self):
+
+        for sigma in [None, 0.5, 1.5]:
+            for area_threshold in [0, 5, 50]:
+                binary = networks_to_binary(
+                    [self.network], (40, 30), iterations=2,
+                    sigma=sigma, area_threshold=area_threshold)
+                local_binary, window = networks_to_local_binary(
+                    [self.network], (40, 30), iterations=2,
+                    sigma=sigma, area_threshold=area_threshold)
+                self.assertArrayAlmostEqual(binary[window], local_binary)
+
+                binary[window] = 0
+                self.assertFalse(binary.any())
+
+    def test_networks_to_regions_local(self):
+        image = np.random.RandomState(0).random_sample((40, 30))
+
+        regions = networks_to_regions(
+            [self.network], image=image, iterations=2, sigma=0.5,
+            area_threshold=5)
+        local_regions = networks_to_regions(
+            [self.network], image=image, iterations=2, sigma=0.5,
+            area_threshold=5, local=True)
+
+        self.assertEqual(len(regions), len(local_regions))
+        for region, local_region in zip(regions, local_regions):
+            self.assertEqual(region.bbox, local_region.bbox)
+            self.assertEqual(region.area, local_region.area)
+            self.assertArrayAlmostEqual(region.coords, local_region.coords)
+            self.assertArrayAlmostEqual(region.image, local_region.image)
+            self.assertArrayAlmostEqual(
+                region.intensity_image, local_region.intensity_image)
+            self.assertArrayAlmostEqual(
+                region.centroid, local_region.centroid)
+            self.assertArrayAlmostEqual(
+                region.weighted_centroid, local_region.weighted_centroid)
+
     def test_networks_to_segments(self):
         pass
 
@@ -114,6 +197,14 @@ class TestConvertors(PyFibreTestCase):
         self.assertEqual(9, regions[0].filled_area)
         self.assertEqual(3, regions[1].filled_area)
 
+        # Overlapping binaries are labelled separately
+        stack = np.concatenate([self.stack, self.stack[:1]])
+        regions = stack_to_regions(stack)
+        self.assertEqual(3, len(regions))
+        self.assertEqual(9, regions[0].filled_area)
+        self.assertEqual(9, regions[1].filled_area)
+        self.assertEqual(3, regions[2].filled_area)
+
     def test_segments_to_binary(self):
         binary = segments_to_binary(self.segments, (10, 10))
         self.assertEqual((10, 10), binary.shape)
@@ -0,0 +1,78 @@
+import numpy as np
+from skimage.feature import greycomatrix
+
+from pyfibre.model.tools.feature import (
+    GLCM_DISTANCES, GLCM_ANGLES,
+    glcm_weights, greycoprops_edit, glcm_offsets,
+    quantise_image, label_greycoprops)
+from pyfibre.tests.probe_classes.utilities import generate_regions
+from pyfibre.tests.pyfibre_test_case import PyFibreTestCase
+
+
+class TestFeature(PyFibreTestCase):
+
+    def setUp(self):
+        self.regions = generate_regions()
+        self.image = np.random.RandomState(0).random_sample((10, 10))
+        self.labels = np.zeros((10, 10), dtype=int)
+        self.labels[0:6, 4] = 1
+        self.labels[2, 4:8] = 1
+        self.labels[8, 1:4] = 2
+
+    def region_glcm(self, region, levels=256):
+        region_image = self.image[region.slice]
+        glcm = greycomatrix(
+            quantise_image(region_image * region.image, levels),
+            GLCM_DISTANCES, GLCM_ANGLES, levels,
+            symmetric=True, normed=True)
+        glcm[0, :, :, :] = 0
+        glcm[:, 0, :, :] = 0
+        return glcm
+
+    def test_glcm_weights(self):
+        weights = glcm_weights(4)
+
+        self.assertIs(weights, glcm_weights(4))
+        self.assertEqual((4, 4), weights['square'].shape)
+        self.assertFalse(weights['square'].flags.writeable)
+        self.assertArrayAlmostEqual(
+            np.array([0, 1, 4, 9]), weights['square'][0])
+
+    def test_quantise_image(self):
+        image = np.array([0, 0.25, 0.5, 1])
+
+        self.assertArrayAlmostEqual(
+            np.array([0, 63, 127, 255]), quantise_image(image))
+        self.assertArrayAlmostEqual(
+            np.array([0, 7, 15, 31]), quantise_image(image, 32))
+
+    def test_glcm_offsets(self):
+        self.assertListEqual(
+            [[(0, 1), (1, 1), (1, 0), (1, -1)],
+             [(0, 2), (1, 1), (2, 0), (1, -1)]],
+            glcm_offsets())
+
+    def test_label_greycoprops(self):
+
+        for levels in [256, 32]:
+            metrics = label_greycoprops(
+                self.labels, self.image, levels=levels)
+
+            for index, region in enumerate(self.regions):
+                expected = greycoprops_edit(
+                    self.region_glcm(region, levels))
+
+                for key, value in expected.items():
+                    self.assertEqual((2, 2, 4), metrics[key].shape)
+                    self.assertArrayAlmostEqual(
+                        value, metrics[key][index])
+
+    def test_label_greycoprops_bboxes(self):
+        bboxes = [region.bbox for region in self.regions]
+
+        metrics = label_greycoprops(self.labels, self.image)
+        bbox_metrics = label_greycoprops(
+            self.labels, self.image, n_labels=2, bboxes=bboxes)
+
+        for key, value in metrics.items():
+            self.assertArrayAlmostEqual(value, bbox_metrics[key])
@@ -2,7 +2,8 @@ import numpy as np
 
 from pyfibre.model.tools.filters import (
     gaussian, tubeness, hysteresis, derivatives,
-    form_structure_tensor, form_nematic_tensor
+    form_structure_tensor, form_nematic_tensor,
+    structure_tensor_components, nematic_tensor_components
 )
 from pyfibre.tests.pyfibre_test_case import PyFibreTestCase
 
@@ -116,6 +117,41 @@ class TestFilters(PyFibreTestCase):
 
         self.assertEqual((2, 5, 5, 2, 2), n_tensor.shape)
 
+    def test_nematic_tensor_components(self):
+        n_components = nematic_tensor_components(self.image)
+
+        dx, dy = derivatives(self.image)
+        r_xy_2 = dx ** 2 + dy ** 2
+        indices = r_xy_2 > 0
+
+        self.assertEqual((3, 5, 5), n_components.shape)
+        self.assertArrayAlmostEqual(
+            (dy ** 2)[indices] / r_xy_2[indices],
+            n_components[0][indices])
+        self.assertArrayAlmostEqual(
+            - (dx * dy)[indices] / r_xy_2[indices],
+            n_components[1][indices])
+        self.assertArrayAlmostEqual(
+            (dx ** 2)[indices] / r_xy_2[indices],
+            n_components[2][indices])
+        self.assertArrayAlmostEqual(
+            np.zeros(3), n_components[:, 0, 0])
+
+        n_components = nematic_tensor_components(
+            np.array([self.image, 2 * self.image]),
+            sigma=self.sigma, dtype=np.float32)
+        n_tensor = form_nematic_tensor(self.image, sigma=self.sigma)
+
+        self.assertEqual((3, 2, 5, 5), n_components.shape)
+        self.assertEqual(np.float32, n_components.dtype)
+        for frame in range(2):
+            self.assertArrayAlmostEqual(
+                n_tensor[..., 0, 0], n_components[0, frame], thresh=1E-6)
+            self.assertArrayAlmostEqual(
+                n_tensor[..., 0, 1], n_components[1, frame], thresh=1E-6)
+            self.assertArrayAlmostEqual(
+                n_tensor[..., 1, 1], n_components[2, frame], thresh=1E-6)
+
     def test_form_structure_tensor(self):
         j_tensor = form_structure_tensor(
             self.image, sigma=self.sigma)
@@ -127,3 +163,25 @@ class TestFilters(PyFibreTestCase):
             sigma=self.sigma)
 
         self.assertEqual((2, 5, 5, 2, 2), j_tensor.shape)
+
+    def test_structure_tensor_components(self):
+        j_components = structure_tensor_components(
+            self.image, sigma=self.sigma)
+        j_tensor = form_structure_tensor(
+            self.image, sigma=self.sigma)
+
+        self.assertEqual((3, 5, 5), j_components.shape)
+        self.assertEqual(np.float32, j_components.dtype)
+        self.assertArrayAlmostEqual(
+            j_tensor[..., 0, 0], j_components[0], thresh=1E-6)
+        self.assertArrayAlmostEqual(
+            j_tensor[..., 0, 1], j_components[1], thresh=1E-6)
+        self.assertArrayAlmostEqual(
+            j_tensor[..., 1, 1], j_components[2], thresh=1E-6)
+
+        j_components = structure_tensor_components(
+            np.array([self.image, self.image]),
+            sigma=self.sigma, dtype=float)
+
+        self.assertEqual((3, 2, 5, 5), j_components.shape)
+        self.assertEqual(np.float64, j_components.dtype)
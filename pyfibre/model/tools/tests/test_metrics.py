@@ -1,16 +1,19 @@
 from unittest import TestCase
 
+import networkx as nx
 import numpy as np
 import pandas as pd
+from skimage.measure import regionprops
 
 from pyfibre.model.tools.metrics import (
     SHAPE_METRICS, TEXTURE_METRICS, FIBRE_METRICS,
-    NETWORK_METRICS, STRUCTURE_METRICS,
+    NETWORK_METRICS, STRUCTURE_METRICS, GLCM_METRICS,
     fibre_metrics, fibre_network_metrics,
     _region_sample,
     structure_tensor_metrics, region_shape_metrics,
     region_texture_metrics, network_metrics,
-    segment_metrics)
+    segment_metrics, segment_glcm_metrics, adjacency_eigenvalue,
+    algebraic_connectivity)
 from pyfibre.tests.probe_classes.utilities import (
     generate_image, generate_regions)
 from pyfibre.tests.probe_classes.objects import (
@@ -109,6 +112,14 @@ class TestAnalysis(TestCase):
         self.assertIsInstance(metrics, pd.Series)
         self.assertEqual(12, len(metrics))
 
+        for metric in GLCM_METRICS:
+            self.assertIn(f'test GLCM {metric}', metrics)
+
+        metrics = region_texture_metrics(
+            self.regions[0], tag='test', glcm=True, glcm_levels=32)
+
+        self.assertEqual(12, len(metrics))
+
         metrics = region_texture_metrics(
             self.regions[0], image=np.ones((10, 10)), tag='test')
 
@@ -143,6 +154,36 @@ class TestAnalysis(TestCase):
         for metric in NETWORK_METRICS:
             self.assertIn(f'test Network {metric}', metrics)
 
+    def test_adjacency_eigenvalue(self):
+
+        graph = nx.grid_2d_graph(10, 12)
+
+        dense = adjacency_eigenvalue(graph)
+        sparse = adjacency_eigenvalue(graph, sparse_threshold=10)
+
+        self.assertAlmostEqual(
+            np.real(nx.adjacency_spectrum(graph).max()), dense)
+        self.assertAlmostEqual(dense, sparse, 6)
+
+    def test_algebraic_connectivity(self):
+
+        graph = nx.grid_2d_graph(10, 12)
+        for index, edge in enumerate(graph.edges):
+            graph.edges[edge]['r'] = 1 + (index % 3)
+
+        dense = algebraic_connectivity(graph)
+        sparse = algebraic_connectivity(graph, sparse_threshold=10)
+
+        self.assertAlmostEqual(
+            nx.algebraic_connectivity(graph, weight='r'), dense, 6)
+        self.assertAlmostEqual(dense, sparse, 6)
+
+        graph.add_node('disconnected')
+        self.assertEqual(0, algebraic_connectivity(graph))
+
+        with self.assertRaises(nx.NetworkXError):
+            algebraic_connectivity(nx.Graph([(0, 0)]))
+
     def test_fibre_network_analysis(self):
 
         self.fibre_network.fibres = self.fibres
@@ -173,3 +214,41 @@ class TestAnalysis(TestCase):
             self.segments, self.image, image_tag='Label')
         for metric in STRUCTURE_METRICS + TEXTURE_METRICS:
             self.assertIn(f'Test Segment Label {metric}', database.columns)
+
+    def test_segment_glcm_metrics(self):
+
+        database = segment_glcm_metrics(self.segments, self.image)
+        self.assertEqual((1, 9), database.shape)
+
+        region_metrics = region_texture_metrics(
+            self.segment.region, image=self.image,
+            tag='Test Segment', glcm=True)
+        for metric in GLCM_METRICS:
+            self.assertAlmostEqual(
+                region_metrics[f'Test Segment GLCM {metric}'],
+                database[f'Test Segment GLCM {metric}'][0])
+
+        database = segment_metrics(
+            self.segments, self.image, image_tag='Label', glcm=True)
+        self.assertEqual((1, 19), database.shape)
+        for metric in GLCM_METRICS:
+            self.assertIn(
+                f'Test Segment Label GLCM {metric}', database.columns)
+
+    def test_segment_glcm_metrics_overlap(self):
+        # Segment covering both regions overlaps each of them
+        labels = np.where(self.image > 0, 1, 0)
+        regions = self.regions + regionprops(labels)
+        segments = [ProbeSegment(region=region) for region in regions]
+
+        database = segment_glcm_metrics(segments, self.image)
+        self.assertEqual((3, 9), database.shape)
+
+        for index, region in enumerate(regions):
+            region_metrics = region_texture_metrics(
+                region, image=self.image,
+                tag='Test Segment', glcm=True)
+            for metric in GLCM_METRICS:
+                self.assertAlmostEqual(
+                    region_metrics[f'Test Segment GLCM {metric}'],
+                    database[f'Test Segment GLCM {metric}'][index])
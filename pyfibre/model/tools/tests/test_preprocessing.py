@@ -2,7 +2,7 @@ from unittest import TestCase
 import numpy as np
 
 from pyfibre.model.tools.preprocessing import (
-    clip_intensities, nl_means)
+    clip_intensities, histogram_percentiles, nl_means, rescale_clipped)
 
 
 class TestPreprocessing(TestCase):
@@ -24,6 +24,39 @@ class TestPreprocessing(TestCase):
         self.assertEqual(clipped_image[2, 2], 1)
         self.assertAlmostEqual(clipped_image[1, 1], 0.9523809, 6)
 
+    def test_histogram_percentiles(self):
+        random_state = np.random.RandomState(0)
+        images = [
+            self.image,
+            random_state.gamma(2, size=(20, 30)),
+            random_state.randint(0, 50, size=(20, 30)).astype(np.uint16),
+            random_state.randint(
+                -120, 120, size=(20, 30)).astype(np.int8),
+            random_state.randint(
+                -30000, 30000, size=(50, 50)).astype(np.int16),
+            np.round(random_state.random_sample((20, 30)), 2),
+            np.zeros((5, 5))]
+
+        for image in images:
+            for percentiles in [(1, 99), (0, 100), (12.5, 63.2)]:
+                self.assertTrue(np.array_equal(
+                    np.percentile(image, percentiles),
+                    histogram_percentiles(image, percentiles)))
+
+    def test_rescale_clipped(self):
+        rescaled = rescale_clipped(self.image, (1, 5))
+
+        self.assertEqual(np.float64, rescaled.dtype)
+        self.assertEqual(1, rescaled[2, 2])
+        self.assertEqual(1, rescaled[1, 1])
+        self.assertEqual(0, rescaled[0, 0])
+        self.assertEqual(10, self.image[2, 2])
+
+        rescaled = rescale_clipped(
+            self.image.astype(np.float32), (1, 1))
+        self.assertEqual(np.float32, rescaled.dtype)
+        self.assertTrue(np.all(rescaled == 1))
+
     def test_nl_means(self):
 
         denoised_image = nl_means(self.image)
@@ -1,11 +1,16 @@
+import networkx as nx
 import numpy as np
+from scipy.ndimage import binary_dilation, binary_fill_holes
+from skimage import draw
 from skimage.measure import regionprops
+from skimage.morphology import remove_small_holes, remove_small_objects
 
 from pyfibre.model.tools.utilities import (
     region_check, region_swap,
-    mean_binary, bbox_sample, bbox_indices
+    mean_binary, bbox_sample, bbox_indices, distance_dilation,
+    label_filled_areas, clean_binary
 )
-from pyfibre.model.tools.figures import draw_network
+from pyfibre.model.tools.figures import draw_network, draw_networks
 from pyfibre.tests.probe_classes.utilities import (
     generate_image, generate_probe_graph, generate_regions
 )
@@ -74,6 +79,49 @@ class TestSegmentUtilities(PyFibreTestCase):
         self.assertEqual(9, np.sum(mask_1.astype(int)))
         self.assertEqual(3, np.sum(mask_2.astype(int)))
 
+    def test_label_filled_areas(self):
+        label_image = np.zeros((10, 10), dtype=int)
+        label_image[1:6, 1:6] = 1
+        label_image[3, 3] = 0
+        label_image[7:9, 7:9] = 2
+
+        self.assertArrayAlmostEqual(
+            np.array([25, 4]), label_filled_areas(label_image)[1:])
+
+        # Labels enclosed by other labels are included in filled area
+        label_image = np.zeros((10, 10), dtype=int)
+        label_image[1:8, 1:8] = 1
+        label_image[2:7, 2:7] = 0
+        label_image[4, 4] = 2
+
+        self.assertArrayAlmostEqual(
+            [region.filled_area for region in regionprops(label_image)],
+            label_filled_areas(label_image)[1:])
+        self.assertArrayAlmostEqual(
+            np.array([49, 1]), label_filled_areas(label_image)[1:])
+
+    def test_clean_binary(self):
+        binary = np.zeros((12, 12), dtype=bool)
+        binary[1:8, 1:8] = True
+        binary[3:6, 3:6] = False
+        binary[4, 4] = True
+        binary[10, 10] = True
+        binary[0, 5] = False
+
+        self.assertArrayAlmostEqual(
+            binary, clean_binary(binary))
+        self.assertArrayAlmostEqual(
+            binary_fill_holes(binary),
+            clean_binary(binary, fill_holes=True))
+        self.assertArrayAlmostEqual(
+            remove_small_objects(
+                remove_small_holes(binary, area_threshold=5),
+                min_size=2),
+            clean_binary(binary, min_size=2, hole_size=5))
+        self.assertArrayAlmostEqual(
+            remove_small_objects(binary, min_size=2, connectivity=2),
+            clean_binary(binary, min_size=2, connectivity=2))
+
     def test_draw_network(self):
 
         label_image = np.zeros(self.image.shape, dtype=int)
@@ -85,6 +133,44 @@ class TestSegmentUtilities(PyFibreTestCase):
             np.argwhere(label_image)
         )
 
+    def test_draw_networks(self):
+
+        graph = nx.Graph()
+        graph.add_nodes_from([0, 1, 2, 3])
+        graph.add_edges_from([[0, 1], [1, 2], [3, 0]])
+        graph.nodes[0]['xy'] = np.array([9, 0])
+        graph.nodes[1]['xy'] = np.array([4, 7])
+        graph.nodes[2]['xy'] = np.array([0, 9])
+        graph.nodes[3]['xy'] = np.array([5, 5])
+
+        expected = np.zeros(self.image.shape, dtype=int)
+        for network in [self.network, graph]:
+            for edge in network.edges:
+                start = list(network.nodes[edge[1]]['xy'])
+                end = list(network.nodes[edge[0]]['xy'])
+                expected[draw.line(*(start + end))] = 2
+
+        label_image = np.zeros(self.image.shape, dtype=int)
+        draw_networks([self.network, graph], label_image, 2)
+
+        self.assertArrayAlmostEqual(expected, label_image)
+
+    def test_distance_dilation(self):
+
+        label_image = np.zeros((20, 20), dtype=int)
+        label_image[5:8, 3] = 1
+        label_image[15, 18] = 1
+
+        for iterations in [0, 1, 3, 9]:
+            self.assertArrayAlmostEqual(
+                binary_dilation(label_image, iterations=iterations)
+                if iterations else label_image.astype(bool),
+                distance_dilation(label_image, iterations)
+            )
+
+        self.assertFalse(
+            distance_dilation(np.zeros((5, 5)), 2).any())
+
     def test_mean_binary(self):
         binaries = np.array([
             self.binary, np.identity(self.binary.shape[0])])
@@ -1,10 +1,13 @@
+import numpy as np
+
 from pyfibre.model.tools.segmentation import (
-    rgb_segmentation
+    rgb_segmentation, refine_mask_boundaries, normalise_stack
 )
 from pyfibre.tests.probe_classes.utilities import (
     generate_image, generate_probe_graph)
 from pyfibre.tests.probe_classes.objects import ProbeFibreNetwork
-from pyfibre.tests.probe_classes.filters import ProbeKmeansFilter
+from pyfibre.tests.probe_classes.filters import (
+    ProbeKmeansFilter, ProbeMultiClusterFilter)
 from pyfibre.tests.pyfibre_test_case import PyFibreTestCase
 
 
@@ -29,3 +32,58 @@ class TestSegmentation(PyFibreTestCase):
 
         self.assertEqual((10, 10), fibre_mask.shape)
         self.assertEqual((10, 10), cell_mask.shape)
+
+    def test_rgb_segmentation_refine(self):
+
+        stack = (self.image,
+                 self.image,
+                 self.image)
+
+        fibre_mask, cell_mask = rgb_segmentation(
+            stack, self.bd_filter, scale=0.5, refine=True)
+
+        self.assertEqual((10, 10), fibre_mask.shape)
+        self.assertEqual((10, 10), cell_mask.shape)
+        self.assertArrayAlmostEqual(~fibre_mask, cell_mask)
+
+    def test_refine_mask_boundaries(self):
+        # Grey background, with a cellular region made up of separate
+        # blue and red clusters
+        image_stack = np.zeros((40, 40, 3))
+        image_stack[:, :10] = 1
+        image_stack[:, 10:16, 2] = 1
+        image_stack[:, 16:, 0] = 1
+
+        # Reference classification of every pixel at full resolution
+        bd_filter = ProbeMultiClusterFilter(
+            n_runs=1, n_clusters=3, random_state=0)
+        normalised = normalise_stack(image_stack.copy())
+        full_mask = bd_filter._minimise_mask(
+            bd_filter._scale_image(normalised))
+        self.assertFalse(full_mask[:, :10].any())
+        self.assertTrue(full_mask[:, 10:].all())
+
+        # Blue pixels lie closer to the mean background colour than
+        # to the mean cellular colour, so assigning boundary pixels
+        # to the nearest mean region would remove them from the mask
+        inside_mean = normalised[:, 10:].mean(axis=(0, 1))
+        outside_mean = normalised[:, :10].mean(axis=(0, 1))
+        blue = normalised[0, 12]
+        self.assertLess(
+            ((blue - outside_mean) ** 2).sum(),
+            ((blue - inside_mean) ** 2).sum())
+
+        bd_filter = ProbeMultiClusterFilter(
+            n_runs=1, n_clusters=3, random_state=0)
+        _, refined_mask = rgb_segmentation(
+            image_stack, bd_filter, scale=0.5, refine=True)
+        self.assertArrayAlmostEqual(full_mask, refined_mask)
+
+    def test_refine_mask_no_boundaries(self):
+        bd_filter = ProbeKmeansFilter()
+
+        # Masks without boundaries are unchanged, without the
+        # filter being used
+        mask = refine_mask_boundaries(
+            np.ones((10, 10)), np.zeros((10, 10, 3)), bd_filter)
+        self.assertTrue(mask.all())
@@ -11,11 +11,11 @@ Last Modified: 18/02/2019
 import logging
 import numpy as np
 
+from scipy.ndimage import (
+    find_objects, label, generate_binary_structure)
 from scipy.ndimage.filters import gaussian_filter
-from scipy.ndimage.morphology import binary_dilation
-
-from skimage import measure
-from skimage.morphology import remove_small_objects, remove_small_holes
+from scipy.ndimage.morphology import (
+    binary_dilation, binary_fill_holes, distance_transform_cdt)
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +44,86 @@ def bbox_sample(region, metric):
     return metric[indices]
 
 
+def distance_dilation(binary, iterations=1):
+    """Dilate a binary image in a single pass using a taxicab
+    distance transform. Returns the same result as
+    scipy.ndimage.binary_dilation with the default cross-shaped
+    structuring element, repeated for a number of iterations"""
+
+    binary = np.asarray(binary, dtype=bool)
+
+    if iterations < 1 or not binary.any():
+        return binary.copy()
+
+    distance = distance_transform_cdt(~binary, metric='taxicab')
+
+    return distance <= iterations
+
+
+def clean_binary(binary, min_size=0, hole_size=0, fill_holes=False,
+                 connectivity=1):
+    """Clean up a binary image in a single stage. Equivalent to
+    calling scipy binary_fill_holes (if fill_holes), then scikit-image
+    remove_small_holes with area_threshold=hole_size and
+    remove_small_objects with min_size, with the same connectivity.
+
+    Background components are only labelled once, and shared between
+    filling enclosed holes and removing small holes. Foreground
+    components are then labelled once to remove small objects.
+
+    Parameters
+    ----------
+    binary: array-like of bool
+        Binary image to clean
+    min_size: int, optional
+        Foreground components smaller than this are removed
+    hole_size: int, optional
+        Background components smaller than this are filled
+    fill_holes: bool, optional
+        Whether to fill all background components that do not
+        touch the image border
+    connectivity: int, optional
+        Maximum number of orthogonal steps between neighbouring
+        pixels in each component
+
+    Returns
+    -------
+    binary: array-like of bool
+        Cleaned binary image
+    """
+
+    binary = np.asarray(binary, dtype=bool)
+    structure = generate_binary_structure(binary.ndim, connectivity)
+
+    if fill_holes or hole_size > 0:
+        labels, n_labels = label(~binary, structure=structure)
+
+        fill = np.zeros(n_labels + 1, dtype=bool)
+        if hole_size > 0:
+            sizes = np.bincount(labels.ravel(), minlength=n_labels + 1)
+            fill |= sizes < hole_size
+        if fill_holes:
+            enclosed = np.ones(n_labels + 1, dtype=bool)
+            for axis in range(binary.ndim):
+                for index in [0, -1]:
+                    enclosed[np.take(labels, index, axis=axis)] = False
+            fill |= enclosed
+        fill[0] = False
+
+        binary = binary | fill[labels]
+
+    if min_size > 0:
+        labels, n_labels = label(binary, structure=structure)
+
+        keep = np.bincount(
+            labels.ravel(), minlength=n_labels + 1) >= min_size
+        keep[0] = False
+
+        binary = keep[labels]
+
+    return binary
+
+
 def smooth_binary(binary, sigma=None):
     """Smooths binary image based on Gaussian filter with
      sigma standard deviation"""
@@ -83,29 +163,74 @@ def region_check(region, min_size=0, min_frac=0,
     return check
 
 
+def label_filled_areas(label_image, n_labels=None):
+    """Return the filled area of each label in label_image, indexed
+    by label, with the same hole definition as the filled_area
+    property of scikit-image regionprops.
+
+    Filled areas only differ from plain areas for labels whose
+    bounding box contains a hole in the combined binary, so only
+    these labels are filled individually"""
+
+    if n_labels is None:
+        n_labels = int(label_image.max())
+
+    areas = np.bincount(label_image.ravel(), minlength=n_labels + 1)
+    filled_areas = areas.copy()
+
+    structure = np.ones((3, 3), dtype=bool)
+    binary = label_image != 0
+    holes = binary_fill_holes(binary, structure=structure)
+    holes &= ~binary
+
+    if not holes.any():
+        return filled_areas
+
+    for index, slices in enumerate(find_objects(label_image), 1):
+        if slices is not None and holes[slices].any():
+            filled = binary_fill_holes(
+                label_image[slices] == index, structure=structure)
+            filled_areas[index] = np.count_nonzero(filled)
+
+    return filled_areas
+
+
 def region_swap(masks, images, min_sizes, min_fracs):
     """Performs a region_check on each region present in masks using images as
     intensity image. If check fails, removes region from mask and performs
     another region_check using same region with other image as
-    intensity image. If this check passes, assigns region onto other mask."""
+    intensity image. If this check passes, assigns region onto other mask.
+
+    All regions in a mask are checked and swapped at once, using
+    per-label sums of the labelled mask"""
+    from skimage import measure
 
     for i, j in [[0, 1], [1, 0]]:
 
-        labels = measure.label(masks[i].astype(np.int))
+        labels = measure.label(masks[i].astype(int))
+        n_labels = int(labels.max())
+        if n_labels == 0:
+            continue
 
-        for region_1 in measure.regionprops(
-                labels, intensity_image=images[i]):
+        filled_areas = label_filled_areas(labels, n_labels)
+        label_index = labels.ravel()
 
-            if not region_check(region_1, min_sizes[i], min_fracs[i]):
-                intensity_image = bbox_sample(region_1, images[j])
-                masks[i][np.where(labels == region_1.label)] = False
+        fracs_i = np.bincount(
+            label_index, weights=images[i].ravel(),
+            minlength=n_labels + 1) / np.maximum(filled_areas, 1)
+        fracs_j = np.bincount(
+            label_index, weights=images[j].ravel(),
+            minlength=n_labels + 1) / np.maximum(filled_areas, 1)
 
-                region_2 = measure.regionprops(
-                    np.array(region_1.image, dtype=int),
-                    intensity_image=intensity_image)[0]
+        # Identify labels that fail the check with the first image,
+        # and those that pass with the second image
+        failed = ((filled_areas < min_sizes[i])
+                  | (fracs_i < min_fracs[i]))
+        failed[0] = False
+        swapped = failed & (fracs_j >= min_fracs[j])
 
-                if region_check(region_2, 0, min_fracs[j]):
-                    masks[j][np.where(labels == region_1.label)] = True
+        masks[i][failed[labels]] = False
+        masks[j][swapped[labels]] = True
 
 
 def mean_binary(binaries, image, iterations=1, min_intensity=0,
@@ -117,10 +242,9 @@ def mean_binary(binaries, image, iterations=1, min_intensity=0,
     intensity_mask = np.where(intensity_map > min_intensity, True, False)
 
     # Remove small holes and objects from masks
-    intensity_mask = remove_small_holes(
-        intensity_mask, area_threshold=area_threshold)
-    intensity_mask = remove_small_objects(
-        intensity_mask, min_size=area_threshold)
+    intensity_mask = clean_binary(
+        intensity_mask, min_size=area_threshold,
+        hole_size=area_threshold)
 
     # Dilate image
     binary = binary_dilation(intensity_mask, iterations=iterations)
@@ -0,0 +1,224 @@
+"""
+PyFibre
+Profiling Library
+
+Records elapsed time and memory usage of each analysis stage,
+so that the throughput of a batch run can be broken down by
+algorithm.
+"""
+from contextlib import contextmanager
+import csv
+import json
+import os
+import threading
+import time
+
+from traits.api import (
+    HasStrictTraits, Any, Callable, Dict, List, Str)
+
+#: Thread local storage holding the active StageProfiler
+_active = threading.local()
+
+#: Column names used in profile summaries
+SUMMARY_FIELDS = [
+    'name', 'stage', 'calls', 'time', 'memory_change',
+    'peak_memory', 'image_peak_memory']
+
+
+def current_memory():
+    """Return the current resident memory of the process in bytes,
+    or None if this cannot be measured on the platform"""
+    try:
+        with open('/proc/self/statm', 'r') as infile:
+            pages = int(infile.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+    return pages * os.sysconf('SC_PAGE_SIZE')
+
+
+def peak_memory():
+    """Return the peak resident memory of the process in bytes since
+    it was last reset by reset_peak_memory, or None if this cannot
+    be measured on the platform"""
+    try:
+        with open('/proc/self/status', 'r') as infile:
+            for line in infile:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, IndexError, ValueError):
+        pass
+
+    return None
+
+
+def reset_peak_memory():
+    """Reset the peak resident memory of the process to its current
+    value, returning whether this is supported on the platform"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as outfile:
+            outfile.write('5')
+    except OSError:
+        return False
+
+    return True
+
+
+class StageProfiler(HasStrictTraits):
+    """Records the number of calls, total elapsed time and memory
+    usage of named analysis stages. Stages can be nested, and are
+    identified by the path of stage names joined with '/'.
+
+    The peak_memory of each stage is the highest resident memory of
+    the process reached during any call of the stage, whereas
+    memory_change is the total change in resident memory between
+    entering and leaving the stage. Temporary arrays allocated and
+    released within a stage therefore only contribute to its peak.
+    The peak while the profiler is active through profile_stages is
+    also recorded as peak_memory of the profiler itself. Peak memory
+    is None on platforms where it cannot be reset between stages"""
+
+    #: Name of the profiled item, typically a multi image
+    name = Str()
+
+    #: Record of each stage, keyed by stage path
+    stages = Dict(Str, Dict)
+
+    #: Optional callable invoked with the stage path and elapsed
+    #: time in seconds whenever a stage completes
+    callback = Callable()
+
+    #: Peak resident memory in bytes while the profiler was last
+    #: active, or None if this cannot be measured
+    peak_memory = Any()
+
+    #: Names of stages currently being recorded
+    _stack = List(Str)
+
+    #: Peak resident memory reached by each scope currently being
+    #: recorded, including the profiler itself while it is active
+    _peaks = List()
+
+    def _update_peaks(self):
+        """Include the peak memory reached since the last reset in
+        every scope currently being recorded"""
+        peak = peak_memory()
+        if peak is not None:
+            self._peaks = [
+                None if scope_peak is None else max(scope_peak, peak)
+                for scope_peak in self._peaks
+            ]
+
+    def _push_peak(self):
+        """Start recording the peak memory of a new nested scope.
+        Since resetting the peak memory affects the whole process,
+        the peak reached so far is first included in all enclosing
+        scopes"""
+        self._update_peaks()
+        if reset_peak_memory():
+            self._peaks.append(peak_memory())
+        else:
+            self._peaks.append(None)
+
+    def _pop_peak(self):
+        """Stop recording the innermost scope, returning its peak
+        memory"""
+        self._update_peaks()
+        return self._peaks.pop()
+
+    @contextmanager
+    def stage(self, name):
+        """Context manager that records the enclosed block as
+        a stage called name, nested inside any active stages"""
+
+        self._stack.append(name)
+        path = '/'.join(self._stack)
+        record = self.stages.setdefault(
+            path, {'calls': 0, 'time': 0.0, 'memory_change': None,
+                   'peak_memory': None})
+        start_memory = current_memory()
+        self._push_peak()
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            record['calls'] += 1
+            record['time'] += elapsed
+
+            stage_peak = self._pop_peak()
+            if stage_peak is not None:
+                record['peak_memory'] = max(
+                    record['peak_memory'] or 0, stage_peak)
+
+            end_memory = current_memory()
+            if start_memory is not None and end_memory is not None:
+                record['memory_change'] = (
+                    (record['memory_change'] or 0)
+                    + end_memory - start_memory)
+            self._stack.pop()
+
+            if self.callback is not None:
+                self.callback(path, elapsed)
+
+    def records(self):
+        """Return a list of dictionaries containing each stage
+        record, in the order that stages were first entered"""
+        return [
+            dict(name=self.name, stage=stage,
+                 image_peak_memory=self.peak_memory, **record)
+            for stage, record in self.stages.items()
+        ]
+
+    def save_json(self, filename):
+        """Save stage records to a JSON file"""
+        with open(filename, 'w') as outfile:
+            json.dump(
+                {'name': self.name, 'peak_memory': self.peak_memory,
+                 'stages': self.stages},
+                outfile, indent=4)
+
+
+@contextmanager
+def profile_stages(profiler):
+    """Activate profiler in the current thread, so that all
+    stages entered through profile_stage are recorded by it"""
+
+    previous = getattr(_active, 'profiler', None)
+    if previous is not None:
+        previous._update_peaks()
+    _active.profiler = profiler
+    profiler._push_peak()
+
+    try:
+        yield profiler
+    finally:
+        profiler.peak_memory = profiler._pop_peak()
+        _active.profiler = previous
+
+
+@contextmanager
+def profile_stage(name):
+    """Context manager that records the enclosed block as a stage
+    of the active StageProfiler. Does nothing if no profiler is
+    active in the current thread"""
+
+    profiler = getattr(_active, 'profiler', None)
+
+    if profiler is None:
+        yield
+    else:
+        with profiler.stage(name):
+            yield
+
+
+def save_profile_summary(profilers, filename):
+    """Save stage records of a list of StageProfiler instances to
+    a single CSV file, with one row for each stage of each item"""
+
+    with open(filename, 'w', newline='') as outfile:
+        writer = csv.DictWriter(outfile, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        for profiler in profilers:
+            writer.writerows(profiler.records())
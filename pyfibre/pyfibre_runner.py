@@ -1,13 +1,32 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 import logging
+import os
+import time
+import traceback
 
 from traits.api import (
-    HasStrictTraits, Bool, Float, Tuple)
+    HasStrictTraits, Bool, Callable, Float, Instance, Int, List, Tuple)
 
 from pyfibre.core.base_multi_image_reader import WrongFileTypeError
+from pyfibre.profiling import StageProfiler, profile_stages
+from pyfibre.runner_events import (
+    ImageCompletedEvent, ImageFailedEvent, ImageStartedEvent,
+    StageCompletedEvent)
 
 logger = logging.getLogger(__name__)
 
 
+def load_multi_image(reader, file_set):
+    """Load a BaseMultiImage from a file set, returning None if
+    the image data cannot be read"""
+    try:
+        return reader.load_multi_image(file_set)
+    except (ImportError, WrongFileTypeError):
+        logger.info(f'Cannot read image data for {file_set}')
+
+
 class PyFibreRunner(HasStrictTraits):
     """ Set parameters for ImageAnalyser routines """
 
@@ -36,6 +55,95 @@ class PyFibreRunner(HasStrictTraits):
     #: Toggles creation of figures
     save_figures = Bool(False)
 
+    #: Number of upcoming file sets to load in background threads
+    #: whilst the current image is analysed. Setting to 0 loads each
+    #: file set only once the previous analysis has finished
+    n_prefetch = Int(1)
+
+    #: Toggles recording of elapsed time and peak memory for each
+    #: analysis stage. Records are saved for each image in its
+    #: analysis directory, and collected in profilers
+    profile_stages = Bool(False)
+
+    #: StageProfiler records of each image analysed during the
+    #: latest run, when profile_stages is enabled
+    profilers = List(Instance(StageProfiler))
+
+    #: Callables invoked with each RunnerEvent emitted during a run,
+    #: reporting the start, stage completion, failure and completion
+    #: of each image analysis
+    callbacks = List(Callable)
+
+    def _emit(self, event_class, **kwargs):
+        """Create an event and pass it to each callback. Errors
+        raised by callbacks are logged rather than interrupting
+        the run"""
+        if not self.callbacks:
+            return
+
+        event = event_class(**kwargs)
+        for callback in self.callbacks:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception(
+                    f'Error in runner callback {callback}')
+
+    def load_multi_images(self, file_sets, reader):
+        """Generator that loads each file set in turn, using a bounded
+        queue of background threads to read and preprocess up to
+        n_prefetch upcoming file sets ahead of the consumer
+
+        Parameters
+        ----------
+        file_sets: list of IFileSet
+            Contains file sets corresponding to each BaseMultiImage to
+            be loaded
+        reader: BaseMultiImageReader
+            Contains loading routines for a BaseMultiImage class
+
+        Yields
+        ------
+        file_set: IFileSet
+            File set that was loaded
+        multi_image: BaseMultiImage or None
+            Loaded image, or None if the image data cannot be read
+        """
+
+        if self.n_prefetch < 1:
+            for file_set in file_sets:
+                yield file_set, load_multi_image(reader, file_set)
+            return
+
+        file_sets = iter(file_sets)
+        queue = deque()
+
+        with ThreadPoolExecutor(max_workers=self.n_prefetch) as executor:
+
+            def submit(n_file_sets):
+                for file_set in islice(file_sets, n_file_sets):
+                    queue.append((
+                        file_set,
+                        executor.submit(load_multi_image, reader, file_set)
+                    ))
+
+            submit(self.n_prefetch)
+
+            try:
+                while queue:
+                    file_set, future = queue.popleft()
+                    multi_image = future.result()
+
+                    # Start loading the next file set before handing
+                    # over the current image, so that at most
+                    # n_prefetch images are held in the queue
+                    submit(1)
+
+                    yield file_set, multi_image
+            finally:
+                for _, future in queue:
+                    future.cancel()
+
     def run(self, file_sets, analyser, reader):
         """Generator that returns databases of metrics from each image
         in dictionary. Analyses input image by calculating metrics and
@@ -58,21 +166,95 @@ class PyFibreRunner(HasStrictTraits):
             Calculated metrics for further analysis
         """
 
-        for file_set in file_sets:
+        self.profilers = []
 
-            try:
-                multi_image = reader.load_multi_image(file_set)
-            except (ImportError, WrongFileTypeError):
-                logger.info(f'Cannot read image data for {file_set}')
+        # Only report progress on file sets that the reader can load,
+        # since other image types are analysed by a different reader
+        file_sets = [
+            file_set for file_set in file_sets
+            if reader.supports(file_set)
+        ]
+        n_images = len(file_sets)
+
+        for index, (file_set, multi_image) in enumerate(
+                self.load_multi_images(file_sets, reader)):
+
+            event_kwargs = dict(
+                name=file_set.prefix, index=index, n_images=n_images)
+
+            if multi_image is None:
+                self._emit(
+                    ImageFailedEvent,
+                    error='Cannot read image data',
+                    **event_kwargs)
                 continue
 
             analyser.multi_image = multi_image
 
+            self._emit(ImageStartedEvent, **event_kwargs)
+            start = time.time()
+
+            def stage_completed(stage, elapsed):
+                self._emit(
+                    StageCompletedEvent, stage=stage,
+                    elapsed=elapsed, **event_kwargs)
+
             try:
                 logger.info(f"Processing image data for {file_set}")
-                databases = analyser.image_analysis(self)
-            except Exception:
+                databases = self.analyse_image(
+                    analyser,
+                    callback=stage_completed if self.callbacks else None)
+            except Exception as error:
                 logger.info(f'Cannot analyse image data for {file_set}')
+                self._emit(
+                    ImageFailedEvent,
+                    error=repr(error),
+                    traceback=traceback.format_exc(),
+                    elapsed=time.time() - start,
+                    **event_kwargs)
                 continue
 
+            self._emit(
+                ImageCompletedEvent,
+                elapsed=time.time() - start,
+                **event_kwargs)
+
             yield databases
+
+    def analyse_image(self, analyser, callback=None):
+        """Perform analysis on the multi image currently assigned
+        to analyser, recording each analysis stage if required
+
+        Parameters
+        ----------
+        analyser: BaseAnalyser
+            Contains reference to MultiImage and analysis script
+            to be performed
+        callback: callable, optional
+            Invoked with the path and elapsed time of each analysis
+            stage as it completes
+
+        Returns
+        -------
+        databases: list of pd.DataFrame
+            Calculated metrics for further analysis
+        """
+
+        if not self.profile_stages and callback is None:
+            return analyser.image_analysis(self)
+
+        profiler = StageProfiler(
+            name=analyser.multi_image.name, callback=callback)
+
+        with profile_stages(profiler):
+            databases = analyser.image_analysis(self)
+
+        if self.profile_stages:
+            self.profilers.append(profiler)
+            analyser.make_directories()
+            profiler.save_json(
+                os.path.join(
+                    analyser.analysis_path,
+                    f'{analyser.multi_image.name}_profile.json'))
+
+        return databases
@@ -0,0 +1,105 @@
+"""
+PyFibre
+Runner Events
+
+Events emitted by PyFibreRunner during a batch run, so that
+progress and throughput can be reported to the user.
+"""
+import logging
+import time
+
+from traits.api import HasStrictTraits, Float, Int, Str
+
+logger = logging.getLogger(__name__)
+
+
+class RunnerEvent(HasStrictTraits):
+    """Base class for all events emitted by PyFibreRunner"""
+
+    #: Name of the file set or image the event refers to
+    name = Str()
+
+    #: Position of the image in the batch, starting from 0
+    index = Int()
+
+    #: Total number of images in the batch
+    n_images = Int()
+
+    #: Time the event was created, in seconds since the epoch
+    time = Float()
+
+    def _time_default(self):
+        return time.time()
+
+
+class ImageStartedEvent(RunnerEvent):
+    """Emitted when analysis of an image begins"""
+
+
+class StageCompletedEvent(RunnerEvent):
+    """Emitted when a stage of the image analysis completes"""
+
+    #: Path of the completed stage
+    stage = Str()
+
+    #: Elapsed time of the stage in seconds
+    elapsed = Float()
+
+
+class ImageCompletedEvent(RunnerEvent):
+    """Emitted when analysis of an image completes"""
+
+    #: Elapsed time of the image analysis in seconds
+    elapsed = Float()
+
+
+class ImageFailedEvent(RunnerEvent):
+    """Emitted when an image cannot be loaded or analysed"""
+
+    #: Description of the error raised
+    error = Str()
+
+    #: Formatted traceback of the error, if available
+    traceback = Str()
+
+    #: Elapsed time before the failure in seconds
+    elapsed = Float()
+
+
+#: Events that mark the end of processing for an image
+FINISHED_EVENTS = (ImageCompletedEvent, ImageFailedEvent)
+
+
+class ProgressLogger:
+    """Callback for PyFibreRunner events that logs the throughput
+    of a batch run in images per minute, alongside an estimate of
+    the time remaining"""
+
+    def __init__(self, log=None):
+        self.log = logger.info if log is None else log
+        self.n_finished = 0
+        self._start = None
+
+    def __call__(self, event):
+
+        if self._start is None:
+            self._start = event.time
+
+        if isinstance(event, ImageFailedEvent):
+            self.log(f"Image {event.name} failed: {event.error}")
+
+        if not isinstance(event, FINISHED_EVENTS):
+            return
+
+        self.n_finished += 1
+        elapsed = event.time - self._start
+        rate = 60 * self.n_finished / elapsed if elapsed > 0 else 0
+        message = (
+            f"{self.n_finished}/{event.n_images} images processed, "
+            f"{rate:.2f} images/min")
+
+        if rate > 0 and event.n_images > self.n_finished:
+            remaining = 60 * (event.n_images - self.n_finished) / rate
+            message += f", ETA {remaining:.0f} s"
+
+        self.log(message)
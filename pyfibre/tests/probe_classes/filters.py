@@ -7,3 +7,11 @@ class ProbeKmeansFilter(BaseKmeansFilter):
 
     def cellular_classifier(self, label_image, centres, **kwargs):
         return np.ones(len(centres)), 1.0
+
+
+class ProbeMultiClusterFilter(BaseKmeansFilter):
+    """Assigns every cluster except the one with the highest
+    green channel to cellular regions"""
+
+    def cellular_classifier(self, label_image, centres, **kwargs):
+        return centres[:, 1] < centres[:, 1].max(), 1.0
@@ -0,0 +1,19 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+
+class TestAPI(TestCase):
+
+    def test_deferred_imports(self):
+        # Packages only required by analysis stages should not be
+        # loaded when importing the API
+        code = (
+            "import sys; import pyfibre.api; "
+            "print([module for module in "
+            "('pandas', 'sklearn', 'skimage.feature', 'skimage.measure') "
+            "if module in sys.modules])")
+        output = subprocess.check_output(
+            [sys.executable, '-c', code], universal_newlines=True)
+
+        self.assertEqual('[]', output.strip())
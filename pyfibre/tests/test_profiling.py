@@ -0,0 +1,138 @@
+import csv
+import json
+import os
+import sys
+from tempfile import TemporaryDirectory
+from unittest import TestCase, skipUnless
+
+import numpy as np
+
+from pyfibre.profiling import (
+    StageProfiler, current_memory, peak_memory, reset_peak_memory,
+    profile_stage, profile_stages, save_profile_summary)
+from pyfibre.utilities import log_time
+
+#: Whether resident memory of the process can be measured
+LINUX = sys.platform.startswith('linux')
+
+
+class TestProfiling(TestCase):
+
+    def setUp(self):
+        self.profiler = StageProfiler(name='image')
+
+    @skipUnless(LINUX, 'Memory usage is read from /proc')
+    def test_memory(self):
+        self.assertGreater(current_memory(), 0)
+
+        array = np.ones(2 ** 24)
+        del array
+        peak = peak_memory()
+        self.assertGreater(peak, 0)
+
+        self.assertTrue(reset_peak_memory())
+        self.assertLess(peak_memory(), peak)
+
+    @skipUnless(LINUX, 'Memory usage is read from /proc')
+    def test_stage_memory(self):
+
+        with profile_stages(self.profiler):
+            with self.profiler.stage('outer'):
+                with self.profiler.stage('allocate'):
+                    array = np.ones(2 ** 24)
+                    del array
+
+                with self.profiler.stage('empty'):
+                    pass
+
+        # Arrays allocated and released within a stage count towards
+        # its peak, but not its net change in memory
+        allocate = self.profiler.stages['outer/allocate']
+        self.assertGreater(
+            allocate['peak_memory'],
+            current_memory() + allocate['memory_change'] + 2 ** 26)
+
+        # Peaks of nested stages are included in enclosing stages,
+        # but not in later stages
+        self.assertGreaterEqual(
+            self.profiler.stages['outer']['peak_memory'],
+            allocate['peak_memory'])
+        self.assertLess(
+            self.profiler.stages['outer/empty']['peak_memory'],
+            allocate['peak_memory'])
+        self.assertGreaterEqual(
+            self.profiler.peak_memory,
+            self.profiler.stages['outer']['peak_memory'])
+        self.assertEqual(
+            self.profiler.peak_memory,
+            self.profiler.records()[0]['image_peak_memory'])
+
+    def test_stage(self):
+
+        with self.profiler.stage('outer'):
+            for _ in range(3):
+                with self.profiler.stage('inner'):
+                    pass
+
+        self.assertListEqual(
+            ['outer', 'outer/inner'], list(self.profiler.stages))
+        self.assertEqual(1, self.profiler.stages['outer']['calls'])
+        self.assertEqual(3, self.profiler.stages['outer/inner']['calls'])
+        self.assertGreaterEqual(
+            self.profiler.stages['outer']['time'],
+            self.profiler.stages['outer/inner']['time'])
+
+        records = self.profiler.records()
+        self.assertEqual('image', records[0]['name'])
+        self.assertEqual('outer/inner', records[1]['stage'])
+
+    def test_callback(self):
+        completed = []
+        self.profiler.callback = (
+            lambda path, elapsed: completed.append(path))
+
+        with self.profiler.stage('outer'):
+            with self.profiler.stage('inner'):
+                pass
+
+        self.assertListEqual(['outer/inner', 'outer'], completed)
+
+    def test_profile_stage(self):
+
+        @log_time(message='TEST')
+        def function():
+            with profile_stage('sub step'):
+                pass
+
+        # No records are made without an active profiler
+        function()
+
+        with profile_stages(self.profiler):
+            function()
+
+        self.assertListEqual(
+            ['test', 'test/sub step'], list(self.profiler.stages))
+
+        function()
+        self.assertEqual(1, self.profiler.stages['test']['calls'])
+
+    def test_save(self):
+
+        with self.profiler.stage('stage'):
+            pass
+
+        with TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'profile.json')
+            self.profiler.save_json(filename)
+            with open(filename, 'r') as infile:
+                data = json.load(infile)
+            self.assertEqual('image', data['name'])
+            self.assertEqual(1, data['stages']['stage']['calls'])
+
+            filename = os.path.join(directory, 'profile.csv')
+            save_profile_summary(
+                [self.profiler, StageProfiler(name='empty')], filename)
+            with open(filename, 'r') as infile:
+                rows = list(csv.DictReader(infile))
+            self.assertEqual(1, len(rows))
+            self.assertEqual('stage', rows[0]['stage'])
@@ -1,12 +1,20 @@
-from unittest import TestCase
+from unittest import TestCase, mock
 
 from pyfibre.model.objects.segments import (
     FibreSegment, CellSegment
 )
+from pyfibre.tests.probe_classes.analyser import ProbeAnalyser
 from pyfibre.tests.probe_classes.objects import (
     ProbeFibreNetwork, generate_probe_segment)
+from pyfibre.tests.fixtures import test_image_path
+from pyfibre.tests.probe_classes.parsers import ProbeFileSet
+from pyfibre.tests.probe_classes.readers import ProbeMultiImageReader
 
+from pyfibre.profiling import StageProfiler
 from pyfibre.pyfibre_runner import PyFibreRunner
+from pyfibre.runner_events import (
+    ImageCompletedEvent, ImageFailedEvent, ImageStartedEvent,
+    StageCompletedEvent)
 
 
 LOAD_NETWORK_PATH = "networkx.read_gpickle"
@@ -19,6 +27,17 @@ LOAD_REGION_PATH = "numpy.load"
 SAVE_REGION_PATH = "numpy.save"
 
 
+class ProbePrefixReader(ProbeMultiImageReader):
+    """Reader that loads the file named by each file set prefix"""
+
+    def get_filenames(self, file_set):
+        yield file_set.prefix
+
+
+class UnsupportedFileSet(ProbeFileSet):
+    """File set type that is not supported by ProbePrefixReader"""
+
+
 def mock_load(*args, klass=None, **kwargs):
     print('mock_load called')
     return klass()
@@ -38,3 +57,143 @@ class TestPyFibreRunner(TestCase):
 
     def test_defaults(self):
         self.assertEqual((5, 35), self.runner.p_denoise)
+
+    def test_load_multi_images(self):
+        reader = ProbePrefixReader()
+        file_sets = [
+            ProbeFileSet(prefix=test_image_path),
+            ProbeFileSet(prefix='WRONG'),
+            ProbeFileSet(prefix=test_image_path)]
+
+        for n_prefetch in [0, 1, 2]:
+            self.runner.n_prefetch = n_prefetch
+            results = list(
+                self.runner.load_multi_images(file_sets, reader))
+
+            self.assertEqual(
+                file_sets, [file_set for file_set, _ in results])
+            self.assertEqual((100, 100), results[0][1].shape)
+            self.assertIsNone(results[1][1])
+            self.assertEqual((100, 100), results[2][1].shape)
+
+    def test_prefetch_bounded(self):
+        reader = ProbeMultiImageReader()
+        file_sets = [ProbeFileSet() for _ in range(5)]
+        loaded = []
+
+        def load_multi_image(file_set):
+            loaded.append(file_set)
+            return ProbeMultiImageReader.load_multi_image(
+                reader, file_set)
+
+        reader.load_multi_image = load_multi_image
+        self.runner.n_prefetch = 2
+
+        generator = self.runner.load_multi_images(file_sets, reader)
+        for index, _ in enumerate(generator):
+            self.assertLessEqual(len(loaded), index + 3)
+        self.assertEqual(5, len(loaded))
+
+    def test_run(self):
+        reader = ProbePrefixReader()
+        analyser = ProbeAnalyser()
+        file_sets = [
+            ProbeFileSet(prefix=test_image_path),
+            ProbeFileSet(prefix='WRONG')]
+
+        databases = list(self.runner.run(file_sets, analyser, reader))
+        self.assertEqual([None], databases)
+
+    def test_profile_stages(self):
+        reader = ProbePrefixReader()
+        analyser = ProbeAnalyser()
+        file_sets = [ProbeFileSet(prefix=test_image_path)]
+        self.runner.profile_stages = True
+
+        with mock.patch.object(
+                StageProfiler, 'save_json') as mock_save, \
+                mock.patch.object(ProbeAnalyser, 'make_directories'):
+            list(self.runner.run(file_sets, analyser, reader))
+
+        self.assertTrue(mock_save.called)
+        self.assertEqual(1, len(self.runner.profilers))
+        self.assertEqual(
+            analyser.multi_image.name, self.runner.profilers[0].name)
+
+    def test_callbacks(self):
+        reader = ProbePrefixReader()
+        analyser = ProbeAnalyser()
+        file_sets = [
+            ProbeFileSet(prefix=test_image_path),
+            ProbeFileSet(prefix='WRONG')]
+        events = []
+        self.runner.callbacks = [events.append]
+
+        with mock.patch.object(ProbeAnalyser, 'make_directories'):
+            list(self.runner.run(file_sets, analyser, reader))
+
+        self.assertIsInstance(events[0], ImageStartedEvent)
+        self.assertIsInstance(events[-2], ImageCompletedEvent)
+        self.assertIsInstance(events[-1], ImageFailedEvent)
+        self.assertTrue(all(
+            isinstance(event, StageCompletedEvent)
+            for event in events[1:-2]))
+
+        self.assertEqual(test_image_path, events[0].name)
+        self.assertEqual(2, events[0].n_images)
+        self.assertEqual('WRONG', events[-1].name)
+        self.assertEqual(1, events[-1].index)
+        self.assertEqual('Cannot read image data', events[-1].error)
+
+    def test_callback_errors(self):
+        reader = ProbePrefixReader()
+        analyser = ProbeAnalyser()
+        file_sets = [ProbeFileSet(prefix=test_image_path)]
+
+        def callback(event):
+            raise RuntimeError('callback failed')
+
+        self.runner.callbacks = [callback]
+
+        with mock.patch.object(ProbeAnalyser, 'make_directories'), \
+                self.assertLogs('pyfibre.pyfibre_runner', 'ERROR'):
+            databases = list(self.runner.run(file_sets, analyser, reader))
+
+        self.assertEqual([None], databases)
+
+    def test_analysis_failed_event(self):
+        reader = ProbePrefixReader()
+        analyser = ProbeAnalyser()
+        file_sets = [ProbeFileSet(prefix=test_image_path)]
+        events = []
+        self.runner.callbacks = [events.append]
+
+        with mock.patch.object(
+                ProbeAnalyser, 'image_analysis',
+                side_effect=OSError('read only')):
+            databases = list(self.runner.run(file_sets, analyser, reader))
+
+        self.assertEqual([], databases)
+        self.assertIsInstance(events[-1], ImageFailedEvent)
+        self.assertIn('read only', events[-1].error)
+        self.assertIn('OSError', events[-1].traceback)
+
+    def test_unsupported_file_sets(self):
+        reader = ProbePrefixReader()
+        analyser = ProbeAnalyser()
+        file_sets = [
+            ProbeFileSet(prefix=test_image_path),
+            UnsupportedFileSet(prefix=test_image_path),
+            ProbeFileSet(prefix=test_image_path)]
+        events = []
+        self.runner.callbacks = [events.append]
+
+        databases = list(self.runner.run(file_sets, analyser, reader))
+
+        self.assertEqual([None, None], databases)
+        self.assertFalse(any(
+            isinstance(event, ImageFailedEvent) for event in events))
+        self.assertEqual(
+            [0, 1], [event.index for event in events
+                     if isinstance(event, ImageCompletedEvent)])
+        self.assertTrue(all(event.n_images == 2 for event in events))
@@ -0,0 +1,39 @@
+from unittest import TestCase
+
+from pyfibre.runner_events import (
+    ImageCompletedEvent, ImageFailedEvent, ImageStartedEvent,
+    ProgressLogger)
+
+
+class TestProgressLogger(TestCase):
+
+    def setUp(self):
+        self.messages = []
+        self.progress_logger = ProgressLogger(log=self.messages.append)
+
+    def test_progress(self):
+
+        self.progress_logger(
+            ImageStartedEvent(name='first', n_images=2, time=0))
+        self.assertListEqual([], self.messages)
+
+        self.progress_logger(
+            ImageCompletedEvent(name='first', n_images=2, time=30))
+        self.assertEqual(1, self.progress_logger.n_finished)
+        self.assertEqual(
+            '1/2 images processed, 2.00 images/min, ETA 30 s',
+            self.messages[-1])
+
+        self.progress_logger(
+            ImageFailedEvent(
+                name='second', index=1, n_images=2, time=60,
+                error='Cannot read image data'))
+        self.assertEqual(2, self.progress_logger.n_finished)
+        self.assertListEqual(
+            ['Image second failed: Cannot read image data',
+             '2/2 images processed, 2.00 images/min'],
+            self.messages[-2:])
+
+    def test_default_time(self):
+        event = ImageStartedEvent()
+        self.assertGreater(event.time, 0)
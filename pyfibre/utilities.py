@@ -10,10 +10,11 @@ Last Modified: 12/04/2018
 from functools import wraps
 import logging
 import time
-from stevedore import ExtensionManager
 
 import numpy as np
 
+from pyfibre.profiling import profile_stage
+
 logger = logging.getLogger(__name__)
 SQRT3 = np.sqrt(3)
 SQRT2 = np.sqrt(2)
@@ -168,6 +169,7 @@ def matrix_split(matrix, nrows, ncols):
 
 def load_plugins():
     """Load PyFibre plugins via Stevedore. """
+    from stevedore import ExtensionManager
 
     mgr = ExtensionManager(
         namespace='pyfibre.plugins',
@@ -182,7 +184,8 @@ def load_plugins():
 def log_time(message):
     """Use as a decorator around a callable to automatically record
     elapsed time to the log. Can be personalised with an extra string
-    message argument
+    message argument. If a StageProfiler is active, the call is also
+    recorded as a stage named by the lower case message
 
     Example
     -------
@@ -209,7 +212,8 @@ def log_time(message):
             instructions"""
             start = time.time()
 
-            result = func(*args, **kwargs)
+            with profile_stage(message.lower()):
+                result = func(*args, **kwargs)
 
             logger.info(
                 # f"TOTAL TIME = "